@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Benchmark da partida: tempo de import de cada ponto de entrada
+
+Cada medição roda num interpretador novo (sem módulos em cache) e
+registra também quais dependências pesadas foram carregadas. Os pontos
+de entrada de varredura, monitor e replay não devem carregar o
+python-binance, o conector do MySQL nem o websockets.
+
+Uso:
+    python3 benchmarks/bench_startup.py
+    python3 benchmarks/bench_startup.py --repeat 10 --output benchmarks/results/startup.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+root_dir = Path(__file__).parent.parent
+
+RESULTS_DIR = root_dir / 'benchmarks' / 'results'
+
+# Código executado em cada ponto de entrada (import + construção sem rede)
+ENTRY_POINTS = {
+    'bot': "import bot",
+    'monitor': "import arbitrage_monitor",
+    'replay': "import market_replay",
+    'scan_only': "from arbitrage_analyzer import ArbitrageAnalyzer; ArbitrageAnalyzer('USDT')"
+}
+
+# Orçamento da mediana em ms (folga para máquinas mais lentas que a de referência)
+BUDGETS_MS = {
+    'bot': 400,
+    'monitor': 400,
+    'replay': 400,
+    'scan_only': 400
+}
+
+# Pacotes que custam centenas de ms e só valem quando são usados de fato
+HEAVY_MODULES = ('binance', 'aiohttp', 'dateparser', 'mysql', 'websockets')
+
+_CHILD = """
+import json, sys, time
+sys.path[:0] = [{root!r}, {src!r}]
+start = time.perf_counter()
+exec({code!r})
+elapsed = (time.perf_counter() - start) * 1000
+heavy = sorted(m for m in sys.modules if m.split('.')[0] in {heavy!r} and '.' not in m)
+print(json.dumps({{'elapsed_ms': elapsed, 'heavy': heavy}}))
+"""
+
+
+def measure(code, repeat=3):
+    """
+    Executa `code` em interpretadores novos
+
+    Args:
+        code (str): Código do ponto de entrada
+        repeat (int): Quantidade de interpretadores
+
+    Returns:
+        dict: Mediana/mínimo/máximo em ms e dependências pesadas carregadas
+    """
+    child = _CHILD.format(root=str(root_dir), src=str(root_dir / 'src'), code=code, heavy=HEAVY_MODULES)
+    # Chaves fictícias: os clientes são criados no primeiro uso, sem ida à rede
+    env = dict(os.environ)
+    env.setdefault('BINANCE_API_KEY', 'bench')
+    env.setdefault('BINANCE_API_SECRET', 'bench')
+    times = []
+    heavy = set()
+
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, '-c', child],
+            cwd=root_dir, env=env, capture_output=True, text=True, check=True
+        ).stdout
+        # Módulos do projeto imprimem durante o import; o resultado é a última linha
+        result = json.loads(output.strip().splitlines()[-1])
+        times.append(result['elapsed_ms'])
+        heavy.update(result['heavy'])
+
+    ordered = sorted(times)
+    return {
+        'min_ms': ordered[0],
+        'median_ms': ordered[len(ordered) // 2],
+        'max_ms': ordered[-1],
+        'runs': len(ordered),
+        'heavy_modules': sorted(heavy)
+    }
+
+
+def run_benchmarks(repeat=3, entry_points=None):
+    """
+    Mede todos os pontos de entrada
+
+    Args:
+        repeat (int): Interpretadores por ponto de entrada
+        entry_points (list): Nomes a medir (padrão: todos)
+
+    Returns:
+        dict: Resultados por ponto de entrada
+    """
+    names = entry_points or list(ENTRY_POINTS)
+    return {'benchmarks': {name: measure(ENTRY_POINTS[name], repeat) for name in names}}
+
+
+def check_budgets(report, budgets=BUDGETS_MS):
+    """
+    Confere orçamento de tempo e dependências pesadas
+
+    Args:
+        report (dict): Resultado de run_benchmarks
+        budgets (dict): Orçamento da mediana em ms por ponto de entrada
+
+    Returns:
+        list: Violações como texto (vazia se tudo dentro do orçamento)
+    """
+    violations = []
+    for name, stats in report['benchmarks'].items():
+        budget = budgets.get(name)
+        if budget is not None and stats['median_ms'] > budget:
+            violations.append(f"{name}: {stats['median_ms']:.1f} ms > {budget} ms")
+        if stats['heavy_modules']:
+            violations.append(f"{name}: carrega {', '.join(stats['heavy_modules'])}")
+    return violations
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de partida")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', help="Arquivo JSON de saída (padrão: benchmarks/results/startup-<timestamp>.json)")
+    args = parser.parse_args()
+
+    report = run_benchmarks(args.repeat)
+    report['python'] = platform.python_version()
+    report['timestamp'] = time.time()
+
+    print("\nPartida (interpretador novo):")
+    for name, stats in report['benchmarks'].items():
+        heavy = f"  carrega: {', '.join(stats['heavy_modules'])}" if stats['heavy_modules'] else ''
+        print(f"  {name:12} mediana {stats['median_ms']:8.1f} ms  (orçamento {BUDGETS_MS[name]} ms){heavy}")
+
+    output = Path(args.output) if args.output else RESULTS_DIR / f"startup-{int(report['timestamp'])}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"\nResultados salvos em {output}")
+
+    violations = check_budgets(report)
+    if violations:
+        print("\n❌ FORA DO ORÇAMENTO DE PARTIDA:")
+        for violation in violations:
+            print(f"  {violation}")
+        sys.exit(1)
+    print("✅ Partida dentro do orçamento")
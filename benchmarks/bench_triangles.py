@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Benchmark da busca e avaliação de triângulos em escala de exchange
+
+Uso:
+    python3 benchmarks/bench_triangles.py --size realistic
+    python3 benchmarks/bench_triangles.py --size stress --compare benchmarks/results/baseline.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir / 'src'))
+
+from arbitrage_analyzer import ArbitrageAnalyzer
+from market_data import MarketData
+from synthetic_market import SIZES, SyntheticClient, generate_market
+
+RESULTS_DIR = root_dir / 'benchmarks' / 'results'
+
+
+def _measure(func, repeat):
+    """Executa func `repeat` vezes e retorna (tempos em ms, último resultado)"""
+    times = []
+    result = None
+
+    for _ in range(repeat):
+        # As rotinas do projeto imprimem progresso; não entra na medição
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            result = func()
+            times.append((time.perf_counter() - start) * 1000)
+
+    return times, result
+
+
+def _stats(times):
+    ordered = sorted(times)
+    return {
+        'min_ms': ordered[0],
+        'median_ms': ordered[len(ordered) // 2],
+        'max_ms': ordered[-1],
+        'runs': len(ordered)
+    }
+
+
+def run_benchmarks(size='realistic', repeat=5, seed=0):
+    """
+    Executa o conjunto de benchmarks
+
+    Args:
+        size (str): Tamanho do mercado sintético (small, realistic, stress)
+        repeat (int): Repetições por medição
+        seed (int): Semente do mercado sintético
+
+    Returns:
+        dict: Resultados por benchmark
+    """
+    symbols, prices = generate_market(seed=seed, **SIZES[size])
+    market = MarketData(client=SyntheticClient(symbols, prices))
+    analyzer = ArbitrageAnalyzer('USDT', 0.1, market=market)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        analyzer.finder.load_market_data()
+
+    finder = analyzer.finder
+    results = {}
+
+    times, triangles = _measure(finder.find_triangles, repeat)
+    results['find_triangles'] = _stats(times)
+
+    def evaluate_all():
+        return [analyzer.calculate_with_fees(t, 100) for t in triangles]
+
+    times, evaluated = _measure(evaluate_all, repeat)
+    results['calculate_with_fees_all'] = _stats(times)
+
+    evaluated = [r for r in evaluated if r]
+
+    times, _ = _measure(lambda: analyzer._prefilter(triangles, 0), repeat)
+    results['prefilter'] = _stats(times)
+
+    def rank():
+        return sorted(evaluated, key=lambda x: x.profit, reverse=True)
+
+    times, _ = _measure(rank, repeat)
+    results['rank'] = _stats(times)
+
+    def full_scan():
+        return analyzer.find_profitable_opportunities(min_amount=100, min_profit=0)
+
+    times, opportunities = _measure(full_scan, repeat)
+    results['find_profitable_opportunities'] = _stats(times)
+
+    return {
+        'size': size,
+        'symbols': len(symbols),
+        'assets': len({s['baseAsset'] for s in symbols} | {s['quoteAsset'] for s in symbols}),
+        'triangles': len(triangles),
+        'opportunities': len(opportunities),
+        'benchmarks': results
+    }
+
+
+def _version():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=root_dir, stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except Exception:
+        return 'unknown'
+
+
+def compare(current, baseline, tolerance=0.25):
+    """
+    Compara resultados com uma execução anterior
+
+    Args:
+        current (dict): Resultados atuais
+        baseline (dict): Resultados de referência
+        tolerance (float): Piora relativa aceita na mediana (0.25 = 25%)
+
+    Returns:
+        list: Benchmarks que regrediram (nome, mediana anterior, mediana atual)
+    """
+    regressions = []
+
+    # Só faz sentido comparar medições do mesmo tamanho de mercado
+    if baseline.get('size') != current['size']:
+        raise ValueError(f"Tamanhos diferentes: {baseline.get('size')} x {current['size']}")
+
+    for name, stats in current['benchmarks'].items():
+        previous = baseline.get('benchmarks', {}).get(name)
+        if not previous:
+            continue
+        if stats['median_ms'] > previous['median_ms'] * (1 + tolerance):
+            regressions.append((name, previous['median_ms'], stats['median_ms']))
+
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de triângulos")
+    parser.add_argument('--size', choices=sorted(SIZES), default='realistic')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', help="Arquivo JSON de saída (padrão: benchmarks/results/<versão>-<tamanho>.json)")
+    parser.add_argument('--compare', help="JSON de uma execução anterior para detectar regressões")
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    args = parser.parse_args()
+
+    report = run_benchmarks(args.size, args.repeat)
+    report['version'] = _version()
+    report['python'] = platform.python_version()
+    report['timestamp'] = time.time()
+
+    print(f"\nMercado sintético '{args.size}': {report['symbols']} pares, "
+          f"{report['assets']} ativos, {report['triangles']} triângulos")
+    for name, stats in report['benchmarks'].items():
+        print(f"  {name:32} mediana {stats['median_ms']:10.2f} ms  (min {stats['min_ms']:.2f})")
+
+    output = Path(args.output) if args.output else RESULTS_DIR / f"{report['version']}-{args.size}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"\nResultados salvos em {output}")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        regressions = compare(report, baseline, args.tolerance)
+        if regressions:
+            print("\n❌ REGRESSÕES DE DESEMPENHO:")
+            for name, before, after in regressions:
+                print(f"  {name}: {before:.2f} ms → {after:.2f} ms")
+            sys.exit(1)
+        print("✅ Sem regressões em relação a", args.compare)
@@ -16,7 +16,15 @@ sys.path.insert(0, str(Path(__file__).parent / 'src'))
 
 from arbitrage_analyzer import ArbitrageAnalyzer
 from order_executor import OrderExecutor
+from execution_scheduler import ExecutionScheduler
+from cooldown import OpportunityCooldown
+from last_look import LastLook
+from universe import SymbolUniverse
+from topology_cache import TopologyCache
 from database import Database
+from fee_schedule import FeeSchedule
+from latency import tracker
+import metrics
 
 class ArbitrageBot:
     """Bot de arbitragem triangular automatizado"""
@@ -39,10 +47,149 @@ class ArbitrageBot:
         self.trade_amount = float(os.getenv('TRADE_AMOUNT_USDT', '100'))
         self.check_interval = int(os.getenv('CHECK_INTERVAL_SECONDS', '30'))
         self.simulation_mode = os.getenv('SIMULATION_MODE', 'True').lower() == 'true'
+        self.metrics_port = int(os.getenv('METRICS_PORT', '0'))
+        self.scan_workers = int(os.getenv('SCAN_WORKERS', '0'))
+        self.price_shm_name = os.getenv('PRICE_SHM_NAME', '')
+        self.max_price_age = float(os.getenv('MAX_PRICE_AGE_SECONDS', '10'))
+        self.stale_policy = os.getenv('STALE_PRICE_POLICY', 'skip')
+        self.rank_by = os.getenv('RANK_BY', 'profit')
+        self.use_fee_schedule = os.getenv('FEE_SCHEDULE', 'True').lower() == 'true'
+        self.pay_fees_with_bnb = os.getenv('PAY_FEES_WITH_BNB', 'False').lower() == 'true'
+        self.fee_refresh_hours = float(os.getenv('FEE_REFRESH_HOURS', '24'))
+        self.use_balance_stream = os.getenv('BALANCE_STREAM', 'True').lower() == 'true'
+        self.balance_reconcile_seconds = float(os.getenv('BALANCE_RECONCILE_SECONDS', '300'))
+        self.order_transport = os.getenv('ORDER_TRANSPORT', 'rest').lower()
+        self.order_type = os.getenv('ORDER_TYPE', 'market').lower()
+        self.limit_tolerance_percent = float(os.getenv('LIMIT_TOLERANCE_PERCENT', '0.05'))
+        self.max_concurrent_trades = int(os.getenv('MAX_CONCURRENT_TRADES', '1'))
+        self.capital_budget = float(os.getenv('CAPITAL_BUDGET_USDT', '0'))
+        self.cooldown_seconds = float(os.getenv('OPPORTUNITY_COOLDOWN_SECONDS', '30'))
+        self.cooldown_max_seconds = float(os.getenv('COOLDOWN_MAX_BACKOFF_SECONDS', '600'))
+        self.use_last_look = os.getenv('LAST_LOOK', 'True').lower() == 'true'
+        self.universe_min_volume = float(os.getenv('UNIVERSE_MIN_QUOTE_VOLUME', '0'))
+        self.universe_min_trades = int(os.getenv('UNIVERSE_MIN_TRADES', '0'))
+        self.universe_max_spread = float(os.getenv('UNIVERSE_MAX_SPREAD_PERCENT', '0'))
+        self.universe_refresh_hours = float(os.getenv('UNIVERSE_REFRESH_HOURS', '24'))
+        self.use_topology_cache = os.getenv('TOPOLOGY_CACHE', 'True').lower() == 'true'
+        self.topology_validate_minutes = float(os.getenv('TOPOLOGY_VALIDATE_MINUTES', '60'))
+        
+        # Preços da tabela compartilhada do feed handler (se configurada)
+        market = None
+        if self.price_shm_name:
+            from shared_prices import SharedMemoryMarketData
+            market = SharedMemoryMarketData(self.price_shm_name)
         
         # Componentes
-        self.analyzer = ArbitrageAnalyzer(self.base_currency, self.fee_percent)
-        self.executor = OrderExecutor(simulation_mode=self.simulation_mode)
+        self.executor = OrderExecutor(
+            simulation_mode=self.simulation_mode,
+            order_type=self.order_type,
+            limit_tolerance_percent=self.limit_tolerance_percent
+        )
+        
+        # Saldos pelo user data stream (só no modo real: a simulação não usa a conta)
+        self.balance_cache = None
+        if self.use_balance_stream and not self.simulation_mode:
+            from balance_cache import BalanceCache
+            self.balance_cache = BalanceCache(
+                self.executor.client,
+                reconcile_interval=self.balance_reconcile_seconds
+            ).start()
+            self.executor.balance_cache = self.balance_cache
+        
+        # Ordens pela WebSocket API (conexão aberta já na partida); REST fica de reserva
+        self.ws_api = None
+        if self.order_transport == 'ws' and not self.simulation_mode:
+            from ws_api import WebSocketAPIClient, WebSocketAPIUnavailable
+            self.ws_api = WebSocketAPIClient()
+            try:
+                self.ws_api.connect()
+            except WebSocketAPIUnavailable as e:
+                self.log(f"WebSocket API indisponível na partida: {str(e)}", "ERROR")
+            self.executor.order_transport = self.ws_api
+        
+        # Taxas reais por par (taxa zero, promoções, VIP); FEE_PERCENT vira a taxa padrão
+        fee_schedule = None
+        if self.use_fee_schedule:
+            fee_schedule = FeeSchedule(
+                client=self.executor.client,
+                default_percent=self.fee_percent,
+                refresh_interval=self.fee_refresh_hours * 3600,
+                pay_with_bnb=self.pay_fees_with_bnb
+            )
+            fee_schedule.load()
+        
+        # Pares sem liquidez ficam fora dos triângulos (estatísticas de 24h em cache diário)
+        universe = SymbolUniverse(
+            client=self.executor.client,
+            base_currency=self.base_currency,
+            refresh_interval=self.universe_refresh_hours * 3600,
+            min_quote_volume=self.universe_min_volume,
+            min_trades=self.universe_min_trades,
+            max_spread_percent=self.universe_max_spread
+        )
+        if universe.enabled:
+            universe.load()
+        
+        # Pares, filtros e triângulos da execução anterior; conferidos com a exchange em segundo plano
+        self.topology = None
+        if self.use_topology_cache:
+            self.topology = TopologyCache(
+                self.base_currency,
+                validate_interval=self.topology_validate_minutes * 60,
+                on_change=self.on_topology_change
+            )
+            if self.topology.load():
+                self.executor.symbol_info_cache.update(self.topology.filters)
+        
+        self.analyzer = ArbitrageAnalyzer(
+            self.base_currency,
+            self.fee_percent,
+            market=market,
+            scan_workers=self.scan_workers,
+            max_price_age=self.max_price_age,
+            stale_policy=self.stale_policy,
+            rank_by=self.rank_by,
+            fee_schedule=fee_schedule,
+            universe=universe,
+            topology=self.topology
+        )
+        
+        # Desfazimento de pernas presas usa as mesmas taxas e pares da varredura
+        if self.executor.recovery:
+            self.executor.recovery.fee_percent = self.fee_percent
+            self.executor.recovery.fee_schedule = fee_schedule
+            if not self.simulation_mode:
+                # Grafo de pares carregado antes: desfazer é sensível à latência
+                if self.topology is not None and self.topology.symbols:
+                    self.executor.recovery.load_symbols(self.topology.symbols)
+                else:
+                    self.executor.recovery.load_symbols()
+        
+        # Reavaliação no livro da tabela compartilhada logo antes de executar (sem REST)
+        last_look = None
+        if self.use_last_look and market is not None:
+            last_look = LastLook(
+                market.table,
+                fee_percent=self.fee_percent,
+                fee_schedule=fee_schedule,
+                min_profit_percent=self.min_profit_percent,
+                max_age=self.max_price_age
+            )
+        
+        # Vários triângulos sem moeda intermediária em comum por ciclo
+        self.scheduler = ExecutionScheduler(
+            self.executor,
+            max_concurrent=self.max_concurrent_trades,
+            capital_budget=self.capital_budget or None,
+            last_look=last_look
+        )
+        
+        # Não repete o mesmo triângulo com os mesmos preços nem logo após prejuízo
+        self.cooldown = OpportunityCooldown(
+            cooldown_seconds=self.cooldown_seconds,
+            max_backoff_seconds=self.cooldown_max_seconds
+        )
+        
         self.database = Database()
         
         # Estatísticas
@@ -56,8 +203,28 @@ class ArbitrageBot:
             'total_invested': 0
         }
         
+        self.metrics_server = None
         self.running = False
     
+    def on_topology_change(self, topology):
+        """Pares ou filtros mudaram na exchange: atualiza executor e desfazimento"""
+        self.executor.symbol_info_cache.update(topology.filters)
+        if self.executor.recovery and not self.simulation_mode:
+            self.executor.recovery.load_symbols(topology.symbols)
+    
+    def start_metrics_server(self):
+        """Inicia o endpoint /metrics em thread de fundo (se configurado)"""
+        if self.metrics_port <= 0:
+            return
+        
+        try:
+            self.metrics_server = metrics.MetricsServer(metrics.registry, port=self.metrics_port)
+            self.metrics_server.start()
+            self.log(f"Métricas disponíveis em http://127.0.0.1:{self.metrics_port}/metrics", "INFO")
+        except OSError as e:
+            self.metrics_server = None
+            self.log(f"Não foi possível iniciar o servidor de métricas: {str(e)}", "ERROR")
+    
     def log(self, message, level='INFO'):
         """Registra mensagem com timestamp"""
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -108,12 +275,48 @@ class ArbitrageBot:
             print(f"Lucro total: ${self.stats['total_profit']:.2f}")
             print(f"ROI: {roi:.2f}%")
         
+        latency_lines = tracker.report_lines()
+        if latency_lines:
+            print("\nLatência por etapa:")
+            for line in latency_lines:
+                print(f"  {line}")
+        
         print("-"*70 + "\n")
     
+    def record_result(self, result):
+        """Atualiza estatísticas e histórico com o resultado de um trade"""
+        self.stats['trades_executed'] += 1
+        
+        if result.success:
+            self.stats['trades_successful'] += 1
+            self.stats['total_invested'] += result.initial_amount
+            self.stats['total_profit'] += result.profit
+            
+            # Salva trade no banco
+            self.log("[DEBUG] Salvando trade no banco...", "INFO")
+            save_result = self.database.save_trade(result)
+            self.log(f"[DEBUG] Trade salvo: {save_result}", "INFO")
+            
+            self.log(
+                f"✅ Trade executado! Lucro: ${result.profit:.2f} ({result.profit_percent:.2f}%)",
+                "SUCCESS"
+            )
+        else:
+            self.stats['trades_failed'] += 1
+            self.log(f"❌ Trade falhou: {result.errors}", "ERROR")
+            
+            # Triângulo desfeito: a perda é realizada e entra no histórico
+            if result.unwinds:
+                self.stats['total_invested'] += result.initial_amount
+                self.stats['total_profit'] += result.profit
+                self.database.save_trade(result)
+                self.log(f"Perda realizada ao desfazer: ${result.profit:.4f}", "ERROR")
+    
     def run(self):
         """Executa o bot"""
         self.running = True
         self.print_header()
+        self.start_metrics_server()
         
         self.log("Bot iniciado", "INFO")
         self.log(f"Modo: {'SIMULAÇÃO' if self.simulation_mode else 'REAL'}", "INFO")
@@ -124,93 +327,55 @@ class ArbitrageBot:
         try:
             while self.running:
                 self.stats['cycles'] += 1
+                metrics.CYCLES.inc()
                 
                 self.log(f"Ciclo #{self.stats['cycles']} - Buscando oportunidades...", "INFO")
                 
+                cycle_start = time.perf_counter_ns()
+                
                 try:
-                    # Busca oportunidades
-                    opportunities = self.analyzer.find_profitable_opportunities(
+                    # Busca as melhores acima do lucro mínimo (pelo menos 5)
+                    profitable = self.analyzer.find_profitable_opportunities(
                         min_amount=self.trade_amount,
-                        min_profit=0
+                        min_profit=self.trade_amount * self.min_profit_percent / 100,
+                        top=max(5, self.max_concurrent_trades * 3)
                     )
-                    
-                    # Filtra por lucro mínimo
-                    profitable = [
-                        opp for opp in opportunities
-                        if opp['profit_percent'] >= self.min_profit_percent
-                    ]
+                    scan = self.analyzer.last_scan
                     
                     if profitable:
-                        self.stats['opportunities_found'] += len(profitable)
+                        self.stats['opportunities_found'] += scan['profitable']
+                        metrics.OPPORTUNITIES.inc(scan['profitable'])
                         
                         # Salva oportunidades no banco
-                        for opp in profitable[:5]:  # Salva top 5
-                            self.database.save_opportunity({
-                                'path': ' → '.join(opp['triangle']['path']),
-                                'profit_percent': opp['profit_percent'],
-                                'symbols': [
-                                    opp['triangle']['pairs'][0],
-                                    opp['triangle']['pairs'][1],
-                                    opp['triangle']['pairs'][2]
-                                ]
-                            })
+                        for opp in profitable:
+                            self.database.save_opportunity(opp)
                         
-                        # Pega a melhor
-                        best = profitable[0]
+                        # Melhores fora do cooldown, sem moeda intermediária em comum, dentro do orçamento
+                        selected = self.scheduler.select(self.cooldown.filter(profitable), self.trade_amount)
+                        for best in selected:
+                            self.log(
+                                f"🎯 Oportunidade encontrada! " +
+                                f"{best.triangle.route} " +
+                                f"({best.profit_percent:.2f}%)",
+                                "SUCCESS"
+                            )
                         
-                        self.log(
-                            f"🎯 Oportunidade encontrada! " +
-                            f"{' → '.join(best['triangle']['path'])} " +
-                            f"({best['profit_percent']:.2f}%)",
-                            "SUCCESS"
-                        )
+                        # Executa (em paralelo quando há mais de uma)
+                        self.log(f"Executando {len(selected)} arbitragem(ns)...", "INFO")
+                        results, rejected = self.scheduler.run(selected, self.trade_amount)
                         
-                        # Executa
-                        self.log("Executando arbitragem...", "INFO")
-                        result = self.executor.execute_arbitrage(best, self.trade_amount)
+                        # Recusa do last look não envia ordem: não entra em cooldown
+                        for opportunity, reason in rejected:
+                            self.log(f"⚠️  Last look recusou {opportunity.triangle.route}: {reason}", "INFO")
                         
-                        self.stats['trades_executed'] += 1
+                        sent = {tuple(result.pairs) for result in results}
+                        for best in selected:
+                            if best.triangle.pairs in sent:
+                                self.cooldown.record_attempt(best)
                         
-                        if result['success']:
-                            self.stats['trades_successful'] += 1
-                            self.stats['total_invested'] += result['initial_amount']
-                            self.stats['total_profit'] += result['profit']
-                            
-                            # Salva trade no banco
-                            orders = result['orders']
-                            self.log("[DEBUG] Salvando trade no banco...", "INFO")
-                            save_result = self.database.save_trade({
-                                'path': ' → '.join(best['triangle']['path']),
-                                'initial_amount': result['initial_amount'],
-                                'final_amount': result['final_amount'],
-                                'profit_amount': result['profit'],
-                                'profit_percent': result['profit_percent'],
-                                'step1': {
-                                    'symbol': orders[0]['symbol'],
-                                    'price': orders[0]['price'],
-                                    'amount': orders[0]['quantity_sent']
-                                },
-                                'step2': {
-                                    'symbol': orders[1]['symbol'],
-                                    'price': orders[1]['price'],
-                                    'amount': orders[1]['quantity_sent']
-                                },
-                                'step3': {
-                                    'symbol': orders[2]['symbol'],
-                                    'price': orders[2]['price'],
-                                    'amount': orders[2]['quantity_sent']
-                                },
-                                'simulation_mode': self.simulation_mode
-                            })
-                            self.log(f"[DEBUG] Trade salvo: {save_result}", "INFO")
-                            
-                            self.log(
-                                f"✅ Trade executado! Lucro: ${result['profit']:.2f} ({result['profit_percent']:.2f}%)",
-                                "SUCCESS"
-                            )
-                        else:
-                            self.stats['trades_failed'] += 1
-                            self.log(f"❌ Trade falhou: {result['errors']}", "ERROR")
+                        for result in results:
+                            self.cooldown.record_result(result)
+                            self.record_result(result)
                     
                     else:
                         self.log(
@@ -219,17 +384,19 @@ class ArbitrageBot:
                         )
                         
                         # Mostra a melhor disponível
-                        if opportunities:
-                            best = opportunities[0]
+                        best = scan.get('best')
+                        if best:
                             self.log(
-                                f"Melhor disponível: {best['profit_percent']:.2f}% - " +
-                                f"{' → '.join(best['triangle']['path'])}",
+                                f"Melhor disponível: {best.profit_percent:.2f}% - " +
+                                f"{best.triangle.route}",
                                 "INFO"
                             )
                 
                 except Exception as e:
                     self.log(f"Erro no ciclo: {str(e)}", "ERROR")
                 
+                tracker.record('bot.cycle', time.perf_counter_ns() - cycle_start)
+                
                 # Mostra estatísticas a cada 10 ciclos
                 if self.stats['cycles'] % 10 == 0:
                     self.print_stats()
@@ -250,6 +417,20 @@ class ArbitrageBot:
         finally:
             self.log("Bot finalizado", "INFO")
             self.print_stats()
+            tracker.export_json(Path(__file__).parent / 'logs' / 'latency.json')
+            
+            if self.metrics_server:
+                self.metrics_server.stop()
+            
+            if self.balance_cache:
+                self.balance_cache.stop()
+            
+            if self.ws_api:
+                self.ws_api.close()
+            
+            self.scheduler.close()
+            
+            self.analyzer.close()
 
 
 if __name__ == "__main__":
@@ -3,66 +3,120 @@
 Módulo para análise de oportunidades de arbitragem com cálculo de taxas
 """
 
+import math
 import os
 import sys
+import time
 from pathlib import Path
 from triangle_finder import TriangleFinder
+from latency import tracker
+from parallel_scanner import ParallelScanner, cycles_from_triangles
+from ranking import TopK, rank_key
+from models import Opportunity
+import metrics
+
+# Folga do pré-filtro para não descartar por arredondamento o que o cálculo completo aceitaria
+PREFILTER_EPSILON = 1e-9
 
 class ArbitrageAnalyzer:
     """Classe para analisar oportunidades de arbitragem"""
     
-    def __init__(self, base_currency='USDT', fee_percent=0.1):
+    def __init__(self, base_currency='USDT', fee_percent=0.1, market=None,
+                 scan_workers=0, parallel_top_k=50, max_price_age=10,
+                 stale_policy='skip', stale_penalty_percent=0.1, rank_by='profit',
+                 fee_schedule=None, universe=None, topology=None):
         """
         Inicializa o analisador
         
         Args:
             base_currency (str): Moeda base
             fee_percent (float): Taxa por operação em % (padrão Binance: 0.1%)
+            market (MarketData): Fonte de dados do mercado. Se None, usa a Binance
+            scan_workers (int): Processos de avaliação (0 ou 1 = no próprio processo)
+            parallel_top_k (int): Candidatos devolvidos pela varredura paralela
+            max_price_age (float): Idade máxima dos preços em segundos (0 = sem limite)
+            stale_policy (str): 'skip' descarta triângulos com preço velho; 'penalize' desconta do lucro
+            stale_penalty_percent (float): Desconto em % por múltiplo de max_price_age (modo 'penalize')
+            rank_by (str): Chave de ordenação padrão ('profit', 'profit_percent', 'size_adjusted')
+            fee_schedule (FeeSchedule): Taxas por par. Se None, usa fee_percent em todas as pernas
+            universe (SymbolUniverse): Filtro de liquidez dos pares (opcional)
+            topology (TopologyCache): Snapshot de pares e triângulos para partida rápida (opcional)
         """
         self.base_currency = base_currency
         self.fee_percent = fee_percent
-        self.finder = TriangleFinder(base_currency)
+        self.finder = TriangleFinder(base_currency, market=market, universe=universe, topology=topology)
+        self.scan_workers = scan_workers
+        self.parallel_top_k = parallel_top_k
+        self.scanner = None
+        self.scanner_triangles = {}
+        self.scanner_fee_version = None
+        self.max_price_age = max_price_age
+        self.stale_policy = stale_policy
+        self.stale_penalty_percent = stale_penalty_percent
+        self.stale_symbols = 0
+        self.stale_triangles = 0
+        self.prefilter_survivors = 0
+        self.best_candidate = None
+        self.rank_by = rank_by
+        self.last_scan = {}
+        self.fee_schedule = fee_schedule
+        self.fee_logs = None
+        self.fee_logs_key = None
         
     def calculate_with_fees(self, triangle, amount=100):
         """
         Calcula lucro considerando as taxas da exchange
         
         Args:
-            triangle (dict): Informações do triângulo
+            triangle (Triangle): Triângulo
             amount (float): Valor inicial
             
         Returns:
-            dict: Resultado com lucro líquido após taxas
+            Opportunity: Resultado com lucro líquido após taxas
         """
         try:
-            pair1, pair2, pair3 = triangle['pairs']
+            pair1, pair2, pair3 = triangle.pairs
+            prices = self.finder.prices
             
             # Verifica se temos os preços
-            if (pair1 not in self.finder.prices or 
-                pair2 not in self.finder.prices or 
-                pair3 not in self.finder.prices):
+            if (pair1 not in prices or 
+                pair2 not in prices or 
+                pair3 not in prices):
                 return None
             
-            price1 = self.finder.prices[pair1]
-            price2 = self.finder.prices[pair2]
-            price3 = self.finder.prices[pair3]
+            price1 = prices[pair1]
+            price2 = prices[pair2]
+            price3 = prices[pair3]
             
             if price1 == 0 or price2 == 0 or price3 == 0:
                 return None
             
-            # Taxa por operação (0.1% = 0.001)
-            fee_multiplier = 1 - (self.fee_percent / 100)
+            # Idade da perna mais velha: pernas de momentos diferentes não são simultâneas
+            price_age = prices.max_age(triangle.pairs)
+            stale = self.max_price_age > 0 and price_age > self.max_price_age
+            if stale:
+                self.stale_triangles += 1
+                if self.stale_policy == 'skip':
+                    return None
+            
+            # Taxa por operação (0.1% = 0.001), por par quando há tabela de taxas
+            if self.fee_schedule is not None:
+                fee_multiplier1 = self.fee_schedule.multiplier(pair1)
+                fee_multiplier2 = self.fee_schedule.multiplier(pair2)
+                fee_multiplier3 = self.fee_schedule.multiplier(pair3)
+            else:
+                fee_multiplier1 = fee_multiplier2 = fee_multiplier3 = 1 - (self.fee_percent / 100)
             
             # Operação 1: Comprar coin_a com base_currency
-            amount_after_fee1 = amount * fee_multiplier
+            amount_after_fee1 = amount * fee_multiplier1
             amount_coin_a = amount_after_fee1 / price1
             
             # Operação 2: Trocar coin_a por coin_b
-            amount_after_fee2 = amount_coin_a * fee_multiplier
+            amount_after_fee2 = amount_coin_a * fee_multiplier2
             amount_coin_b = amount_after_fee2 * price2
             
             # Operação 3: Vender coin_b por base_currency
-            amount_after_fee3 = amount_coin_b * fee_multiplier
+            amount_after_fee3 = amount_coin_b * fee_multiplier3
             final_amount = amount_after_fee3 * price3
             
             # Calcula lucro líquido
@@ -72,60 +126,269 @@ class ArbitrageAnalyzer:
             # Calcula total de taxas pagas
             total_fees = amount - final_amount - profit
             
-            return {
-                'initial': amount,
-                'final': final_amount,
-                'profit': profit,
-                'profit_percent': profit_percent,
-                'total_fees': abs(total_fees),
-                'prices': [price1, price2, price3],
-                'triangle': triangle
-            }
+            # Modo 'penalize': desconto proporcional ao atraso do preço mais velho
+            if stale:
+                profit -= amount * self.stale_penalty_percent / 100 * price_age / self.max_price_age
+                profit_percent = (profit / amount) * 100
+            
+            return Opportunity(
+                triangle=triangle,
+                initial=amount,
+                final=final_amount,
+                profit=profit,
+                profit_percent=profit_percent,
+                total_fees=abs(total_fees),
+                prices=(price1, price2, price3),
+                price_age=price_age,
+                stale=stale,
+                capacity=self.capacity(triangle, price1, price3)
+            )
             
         except Exception as e:
             return None
     
-    def find_profitable_opportunities(self, min_amount=100, min_profit=0):
+    def capacity(self, triangle, price1, price3):
+        """
+        Valor em moeda base que o topo do livro comporta nas três pernas
+        
+        Compra na quantidade do ask da primeira perna e vendas na do bid das
+        outras duas, convertidas para a moeda base pelos preços avaliados.
+        
+        Args:
+            triangle (Triangle): Triângulo
+            price1 (float): Preço da compra (moeda base por A)
+            price3 (float): Preço da última venda (moeda base por B)
+            
+        Returns:
+            float: Capacidade; None se alguma quantidade é desconhecida (livro
+                não carregado ou tabela compartilhada, que não publica quantidades)
+        """
+        pair1, pair2, pair3 = triangle.pairs
+        prices = self.finder.prices
+        index = prices.index
+        ask_qty1 = prices.ask_qtys[index[pair1]]
+        bid_qty2 = prices.bid_qtys[index[pair2]]
+        bid_qty3 = prices.bid_qtys[index[pair3]]
+        if ask_qty1 <= 0 or bid_qty2 <= 0 or bid_qty3 <= 0:
+            return None
+        
+        # Pernas 1 e 2 medidas em A, perna 3 em B
+        return min(ask_qty1 * price1, bid_qty2 * price1, bid_qty3 * price3)
+    
+    def load_books(self):
+        """
+        Carrega bid/ask e quantidades do topo do livro (base do ranking por tamanho)
+        
+        Returns:
+            int: Pares com livro carregado
+        """
+        books = self.finder.market.get_book_tickers()
+        self.finder.prices.update_books(books)
+        return len(books)
+    
+    @tracker.timed('analyzer.scan')
+    def find_profitable_opportunities(self, min_amount=100, min_profit=0, top=None, rank_by=None):
         """
         Encontra oportunidades lucrativas após descontar taxas
         
         Args:
             min_amount (float): Valor mínimo para simular
             min_profit (float): Lucro mínimo em $ (padrão: qualquer lucro > 0)
+            top (int): Mantém só as N melhores (heap limitado). Se None, devolve todas
+            rank_by (str | callable): Chave de ordenação (padrão: a do analisador)
             
         Returns:
-            list: Lista de oportunidades ordenadas por lucro
+            list: Lista de oportunidades ordenadas pela chave (maior primeiro)
         """
         print(f"\n{'='*70}")
         print(f"ANÁLISE DE OPORTUNIDADES DE ARBITRAGEM")
         print(f"{'='*70}")
         print(f"Moeda base: {self.base_currency}")
-        print(f"Taxa por operação: {self.fee_percent}%")
+        if self.fee_schedule is not None:
+            self.fee_schedule.maybe_refresh()
+            print(f"Taxa por operação: por par ({len(self.fee_schedule.fees)} pares, padrão {self.fee_percent}%)")
+        else:
+            print(f"Taxa por operação: {self.fee_percent}%")
         print(f"Valor simulado: ${min_amount}")
         print(f"Lucro mínimo: ${min_profit}")
         
-        # Carrega dados do mercado
-        self.finder.load_market_data()
+        scan_start = time.perf_counter()
+        
+        # Carrega dados do mercado; sem preços novos não há varredura
+        if not self.finder.load_market_data():
+            self.last_scan = {'triangles': 0, 'candidates': 0, 'profitable': 0, 'best': None}
+            print(f"⚠️  Varredura ignorada: preços indisponíveis")
+            return []
+        
+        # Ranking por tamanho precisa das quantidades do topo do livro
+        if (rank_by or self.rank_by) == 'size_adjusted':
+            print(f"✓ {self.load_books()} livros carregados")
         
         # Busca triângulos
         triangles = self.finder.find_triangles()
         
         print(f"\n⏳ Analisando {len(triangles)} triângulos...")
         
+        self.stale_triangles = 0
+        if self.max_price_age > 0:
+            self.stale_symbols = self.finder.prices.stale_count(self.max_price_age)
+            metrics.STALE_SYMBOLS.set(self.stale_symbols)
+            if self.stale_symbols:
+                print(f"⚠️  {self.stale_symbols} pares com preço mais velho que {self.max_price_age}s")
+        
         # Analisa cada triângulo
+        score = rank_key(rank_by or self.rank_by)
+        ranking = TopK(top, score) if top else None
         opportunities = []
+        profitable = 0
+        best = None
         
-        for triangle in triangles:
-            result = self.calculate_with_fees(triangle, min_amount)
+        with tracker.span('analyzer.evaluate'):
+            if self.scan_workers > 1:
+                candidates = self._parallel_candidates(triangles, min_profit / min_amount * 100)
+            else:
+                candidates = self._prefilter(triangles, min_profit / min_amount * 100)
+            self.prefilter_survivors = len(candidates)
+            print(f"✓ {len(candidates)} candidatos após o pré-filtro")
+            
+            for triangle in candidates:
+                result = self.calculate_with_fees(triangle, min_amount)
+                
+                if not result:
+                    continue
+                if best is None or result.profit > best.profit:
+                    best = result
+                if result.profit > min_profit:
+                    profitable += 1
+                    if ranking is not None:
+                        ranking.push(result)
+                    else:
+                        opportunities.append(result)
             
-            if result and result['profit'] > min_profit:
-                opportunities.append(result)
+            # Melhor triângulo do mercado, mesmo abaixo do mínimo (só informativo)
+            if best is None and self.best_candidate is not None:
+                best = self.calculate_with_fees(self.best_candidate, min_amount)
+        
+        if self.stale_triangles:
+            action = 'ignorados' if self.stale_policy == 'skip' else 'penalizados'
+            print(f"⚠️  {self.stale_triangles} triângulos {action} por preço velho")
         
-        # Ordena por lucro (maior primeiro)
-        opportunities.sort(key=lambda x: x['profit'], reverse=True)
+        # Ordena pela chave (maior primeiro)
+        with tracker.span('analyzer.rank'):
+            if ranking is not None:
+                opportunities = ranking.items()
+            else:
+                opportunities.sort(key=score, reverse=True)
+        
+        self.last_scan = {
+            'triangles': len(triangles),
+            'candidates': len(candidates),
+            'profitable': profitable,
+            'best': best
+        }
+        
+        metrics.SCANS.inc()
+        metrics.TRIANGLES_EVALUATED.inc(len(triangles))
+        metrics.SCANS_PER_SECOND.set(1 / max(time.perf_counter() - scan_start, 1e-9))
         
         return opportunities
     
+    def _prefilter(self, triangles, min_profit_percent):
+        """
+        Descarta triângulos abaixo do lucro mínimo só com somas de logs
+        
+        Lucro > mínimo  <=>  log(p2) + log(p3) - log(p1) + Σ log(1 - taxa) > log(1 + mínimo)
+        
+        Args:
+            triangles (list): Triângulos da varredura atual
+            min_profit_percent (float): Lucro mínimo em %
+            
+        Returns:
+            list: Triângulos que podem passar no cálculo completo
+        """
+        self.best_candidate = None
+        if min_profit_percent <= -100:
+            return triangles
+        
+        prices = self.finder.prices
+        index = prices.index
+        log_prices = prices.log_prices
+        fee_logs = self._fee_logs()
+        bound = math.log(1 + min_profit_percent / 100) - PREFILTER_EPSILON
+        if fee_logs is None:
+            bound -= 3 * math.log(1 - self.fee_percent / 100)
+        
+        candidates = []
+        best_rate = -math.inf
+        for triangle in triangles:
+            pair1, pair2, pair3 = triangle.pairs
+            i1 = index.get(pair1)
+            i2 = index.get(pair2)
+            i3 = index.get(pair3)
+            if i1 is None or i2 is None or i3 is None:
+                continue
+            rate = log_prices[i2] + log_prices[i3] - log_prices[i1]
+            if fee_logs is not None:
+                rate += fee_logs[i1] + fee_logs[i2] + fee_logs[i3]
+            if rate > bound:
+                candidates.append(triangle)
+            elif rate > best_rate:
+                # Melhor dos descartados, para informar quando nada passa
+                best_rate = rate
+                self.best_candidate = triangle
+        
+        return candidates
+    
+    def _fee_logs(self):
+        """log(1 - taxa) por posição do PriceStore (None sem tabela de taxas)"""
+        if self.fee_schedule is None:
+            return None
+        
+        symbols = self.finder.prices.symbols
+        key = (len(symbols), self.fee_schedule.version)
+        if key != self.fee_logs_key:
+            self.fee_logs = self.fee_schedule.log_multipliers(symbols)
+            self.fee_logs_key = key
+        return self.fee_logs
+    
+    def _parallel_candidates(self, triangles, min_profit_percent):
+        """
+        Seleciona candidatos com a varredura em vários processos
+        
+        Args:
+            triangles (list): Triângulos da varredura atual
+            min_profit_percent (float): Lucro mínimo em %
+            
+        Returns:
+            list: Triângulos do top-k global, para cálculo detalhado
+        """
+        cycles = cycles_from_triangles(triangles)
+        
+        fee_version = self.fee_schedule.version if self.fee_schedule is not None else None
+        
+        # Só recria os workers quando o conjunto de triângulos ou as taxas mudam
+        if (self.scanner is None or set(cycles) != set(self.scanner_triangles)
+                or fee_version != self.scanner_fee_version):
+            fees = None
+            if self.fee_schedule is not None:
+                fees = {s: self.fee_schedule.taker_percent(s) for s in self.finder.prices.symbols}
+            
+            self.close()
+            self.scanner_triangles = dict(zip(cycles, triangles))
+            self.scanner_fee_version = fee_version
+            self.scanner = ParallelScanner(cycles, self.fee_percent, self.scan_workers, fees).start()
+        
+        self.scanner.publish(self.finder.prices)
+        best = self.scanner.scan(self.parallel_top_k, min_profit_percent)
+        
+        return [self.scanner_triangles[cycle] for _, cycle in best]
+    
+    def close(self):
+        """Encerra os workers da varredura paralela (se houver)"""
+        if self.scanner is not None:
+            self.scanner.stop()
+            self.scanner = None
+    
     def display_opportunities(self, opportunities, top=10):
         """
         Exibe as melhores oportunidades
@@ -144,16 +407,16 @@ class ArbitrageAnalyzer:
         print(f"{'='*70}")
         
         for i, opp in enumerate(opportunities[:top]):
-            triangle = opp['triangle']
+            triangle = opp.triangle
             
             print(f"\n🔸 Oportunidade #{i+1}")
-            print(f"   Caminho: {' → '.join(triangle['path'])}")
-            print(f"   Pares: {', '.join(triangle['pairs'])}")
+            print(f"   Caminho: {triangle.route}")
+            print(f"   Pares: {', '.join(triangle.pairs)}")
             print(f"   ")
-            print(f"   Investimento: ${opp['initial']:.2f}")
-            print(f"   Retorno: ${opp['final']:.2f}")
-            print(f"   Taxas pagas: ${opp['total_fees']:.4f}")
-            print(f"   💰 Lucro líquido: ${opp['profit']:.4f} ({opp['profit_percent']:.4f}%)")
+            print(f"   Investimento: ${opp.initial:.2f}")
+            print(f"   Retorno: ${opp.final:.2f}")
+            print(f"   Taxas pagas: ${opp.total_fees:.4f}")
+            print(f"   💰 Lucro líquido: ${opp.profit:.4f} ({opp.profit_percent:.4f}%)")
 
 
 if __name__ == "__main__":
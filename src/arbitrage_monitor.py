@@ -14,7 +14,7 @@ class ArbitrageMonitor:
     """Monitor de oportunidades de arbitragem em tempo real"""
     
     def __init__(self, base_currency='USDT', fee_percent=0.1, 
-                 min_profit_percent=0.5, check_interval=10):
+                 min_profit_percent=0.5, check_interval=10, market=None):
         """
         Inicializa o monitor
         
@@ -23,12 +23,13 @@ class ArbitrageMonitor:
             fee_percent (float): Taxa por operação em %
             min_profit_percent (float): Lucro mínimo em % para alertar
             check_interval (int): Intervalo entre verificações em segundos
+            market (MarketData): Fonte de preços (padrão: conexão com a Binance)
         """
         self.base_currency = base_currency
         self.fee_percent = fee_percent
         self.min_profit_percent = min_profit_percent
         self.check_interval = check_interval
-        self.analyzer = ArbitrageAnalyzer(base_currency, fee_percent)
+        self.analyzer = ArbitrageAnalyzer(base_currency, fee_percent, market=market)
         self.running = False
         
     def log(self, message):
@@ -67,28 +68,24 @@ class ArbitrageMonitor:
                 self.log(f"Ciclo #{cycle} - Buscando oportunidades...")
                 
                 try:
-                    # Busca oportunidades
-                    opportunities = self.analyzer.find_profitable_opportunities(
+                    # Busca as melhores acima do lucro mínimo percentual
+                    filtered = self.analyzer.find_profitable_opportunities(
                         min_amount=amount,
-                        min_profit=0
+                        min_profit=amount * self.min_profit_percent / 100,
+                        top=top_opportunities
                     )
-                    
-                    # Filtra por lucro mínimo percentual
-                    filtered = [
-                        opp for opp in opportunities 
-                        if opp['profit_percent'] >= self.min_profit_percent
-                    ]
+                    scan = self.analyzer.last_scan
                     
                     if filtered:
-                        self.log(f"🎯 {len(filtered)} oportunidades encontradas acima de {self.min_profit_percent}%!")
+                        self.log(f"🎯 {scan['profitable']} oportunidades encontradas acima de {self.min_profit_percent}%!")
                         self.display_top_opportunities(filtered, top_opportunities)
                     else:
                         self.log(f"⚠️  Nenhuma oportunidade acima de {self.min_profit_percent}% no momento")
                         
                         # Mostra a melhor mesmo que abaixo do mínimo
-                        if opportunities:
-                            best = opportunities[0]
-                            self.log(f"   Melhor disponível: {best['profit_percent']:.4f}% - {' → '.join(best['triangle']['path'])}")
+                        best = scan.get('best')
+                        if best:
+                            self.log(f"   Melhor disponível: {best.profit_percent:.4f}% - {best.triangle.route}")
                     
                 except Exception as e:
                     self.log(f"❌ Erro na análise: {str(e)}")
@@ -114,11 +111,11 @@ class ArbitrageMonitor:
         print("-"*70)
         
         for i, opp in enumerate(opportunities[:top]):
-            triangle = opp['triangle']
+            triangle = opp.triangle
             
-            print(f"\n  #{i+1} - {' → '.join(triangle['path'])}")
-            print(f"       Pares: {', '.join(triangle['pairs'])}")
-            print(f"       💰 Lucro: ${opp['profit']:.4f} ({opp['profit_percent']:.4f}%)")
+            print(f"\n  #{i+1} - {triangle.route}")
+            print(f"       Pares: {', '.join(triangle.pairs)}")
+            print(f"       💰 Lucro: ${opp.profit:.4f} ({opp.profit_percent:.4f}%)")
         
         print("-"*70 + "\n")
 
@@ -127,12 +124,19 @@ if __name__ == "__main__":
     """Executa o monitor"""
     
     try:
+        # Lê da tabela compartilhada do feed handler, se houver
+        market = None
+        if os.getenv('PRICE_SHM_NAME'):
+            from shared_prices import SharedMemoryMarketData
+            market = SharedMemoryMarketData(os.getenv('PRICE_SHM_NAME'))
+        
         # Configurações
         monitor = ArbitrageMonitor(
             base_currency='USDT',
             fee_percent=0.1,
             min_profit_percent=0.5,  # Alerta apenas se lucro >= 0.5%
-            check_interval=30  # Verifica a cada 30 segundos
+            check_interval=30,  # Verifica a cada 30 segundos
+            market=market
         )
         
         # Inicia monitoramento
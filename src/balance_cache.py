@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Cache local de saldos alimentado pelo user data stream
+
+Os saldos chegam pelo WebSocket da conta (outboundAccountPosition,
+balanceUpdate e executionReport) e ficam em dicionários consultados em
+O(1) pelo executor, sem get_account antes de cada trade. Uma
+reconciliação periódica por REST corrige eventos perdidos (reconexão,
+atraso do stream).
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from websockets.sync.client import connect
+
+from binance_client import stream_url
+
+# A Binance expira a listen key após 60 minutos sem keepalive
+KEEPALIVE_INTERVAL = 30 * 60
+
+# Quantos executionReports recentes manter por ordem
+MAX_ORDERS = 1000
+
+
+class BalanceCache:
+    """Saldos livres/bloqueados por ativo mantidos pelo stream da conta"""
+
+    def __init__(self, client, reconcile_interval=300, url=None, keepalive_interval=KEEPALIVE_INTERVAL):
+        """
+        Inicializa o cache
+
+        Args:
+            client (Client): Cliente da Binance (listen key e get_account)
+            reconcile_interval (float): Segundos entre reconciliações por REST
+            url (str): URL base dos streams (padrão: BINANCE_STREAM_URL)
+            keepalive_interval (float): Segundos entre renovações da listen key
+        """
+        self.client = client
+        self.reconcile_interval = reconcile_interval
+        self.url = url or stream_url()
+        self.keepalive_interval = keepalive_interval
+
+        self.free_balances = {}
+        self.locked_balances = {}
+        # Último evento aplicado (ms da exchange): snapshots mais velhos são ignorados
+        self.updated_at = 0
+        self.reconciled_at = 0.0
+        self.events = 0
+
+        # {orderId: (status, executado, cotação acumulada)} dos últimos executionReports
+        self.orders = OrderedDict()
+
+        self.lock = threading.Lock()
+        self.connected = threading.Event()
+        self.listen_key = None
+        self.keepalive_at = 0.0
+        self.thread = None
+        self.running = False
+
+    # ------------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------------
+
+    def free(self, asset):
+        """Saldo livre do ativo (0 se desconhecido)"""
+        return self.free_balances.get(asset, 0.0)
+
+    def locked(self, asset):
+        """Saldo bloqueado em ordens abertas"""
+        return self.locked_balances.get(asset, 0.0)
+
+    def order_status(self, order_id):
+        """Último status recebido de uma ordem (None se não visto)"""
+        entry = self.orders.get(order_id)
+        return entry[0] if entry else None
+
+    # ------------------------------------------------------------------
+    # Atualizações
+    # ------------------------------------------------------------------
+
+    def apply_event(self, event):
+        """
+        Aplica um evento do user data stream
+
+        Args:
+            event (dict): Mensagem já decodificada
+
+        Returns:
+            bool: True se o evento foi reconhecido
+        """
+        kind = event.get('e')
+
+        with self.lock:
+            if kind == 'outboundAccountPosition':
+                # Valores absolutos: reaplicar é idempotente
+                for position in event['B']:
+                    self.free_balances[position['a']] = float(position['f'])
+                    self.locked_balances[position['a']] = float(position['l'])
+                self.updated_at = max(self.updated_at, event.get('u', event.get('E', 0)))
+
+            elif kind == 'balanceUpdate':
+                # Depósito, saque ou transferência (delta)
+                asset = event['a']
+                self.free_balances[asset] = self.free_balances.get(asset, 0.0) + float(event['d'])
+                self.updated_at = max(self.updated_at, event.get('T', event.get('E', 0)))
+
+            elif kind == 'executionReport':
+                # O saldo vem no outboundAccountPosition seguinte; aqui só o status
+                self.orders[event['i']] = (event['X'], float(event['z']), float(event['Z']))
+                self.orders.move_to_end(event['i'])
+                while len(self.orders) > MAX_ORDERS:
+                    self.orders.popitem(last=False)
+
+            else:
+                return False
+
+            self.events += 1
+        return True
+
+    def apply_fill(self, spent_asset, spent, received_asset, received, transact_time, fees=None):
+        """
+        Aplica localmente o resultado de uma ordem antes do evento do stream
+
+        Evita que a perna seguinte seja dimensionada com o saldo anterior.
+        Se o stream já entregou um evento igual ou mais novo que a ordem, o
+        saldo absoluto dele prevalece e nada é feito.
+
+        Args:
+            spent_asset (str): Ativo gasto
+            spent (float): Quantidade gasta
+            received_asset (str): Ativo recebido
+            received (float): Quantidade recebida
+            transact_time (int): transactTime da ordem (ms)
+            fees (dict): Comissões pagas em outros ativos, ex: {'BNB': 0.0001}
+
+        Returns:
+            bool: True se o cache foi alterado
+        """
+        with self.lock:
+            if self.updated_at >= transact_time:
+                return False
+            self.free_balances[spent_asset] = max(0.0, self.free_balances.get(spent_asset, 0.0) - spent)
+            self.free_balances[received_asset] = self.free_balances.get(received_asset, 0.0) + received
+            for asset, amount in (fees or {}).items():
+                self.free_balances[asset] = max(0.0, self.free_balances.get(asset, 0.0) - amount)
+            return True
+
+    def reconcile(self):
+        """
+        Substitui o cache pelos saldos de get_account
+
+        Returns:
+            dict: Diferença {ativo: cache - exchange} corrigida (None se falhou)
+        """
+        try:
+            account = self.client.get_account()
+        except Exception as e:
+            print(f"Erro ao reconciliar saldos: {str(e)}")
+            return None
+
+        free = {b['asset']: float(b['free']) for b in account['balances']}
+        locked = {b['asset']: float(b['locked']) for b in account['balances']}
+        update_time = account.get('updateTime', 0)
+
+        with self.lock:
+            self.reconciled_at = time.time()
+            if update_time and update_time < self.updated_at:
+                # O stream já está à frente do snapshot
+                return {}
+
+            drift = {
+                asset: self.free_balances.get(asset, 0.0) - amount
+                for asset, amount in free.items()
+                if abs(self.free_balances.get(asset, 0.0) - amount) > 1e-9
+            }
+            self.free_balances = free
+            self.locked_balances = locked
+            self.updated_at = max(self.updated_at, update_time)
+
+        if drift and self.events:
+            print(f"Saldos corrigidos na reconciliação: {', '.join(sorted(drift))}")
+        return drift
+
+    # ------------------------------------------------------------------
+    # Stream
+    # ------------------------------------------------------------------
+
+    def start(self):
+        """Carrega os saldos por REST e abre o stream em thread de fundo"""
+        self.reconcile()
+        self.listen_key = self.client.stream_get_listen_key()
+        self.keepalive_at = time.time()
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name='balance-cache', daemon=True)
+        self.thread.start()
+        return self
+
+    def _run(self):
+        while self.running:
+            try:
+                with connect(f"{self.url}/ws/{self.listen_key}") as ws:
+                    self.connected.set()
+                    while self.running:
+                        try:
+                            message = ws.recv(timeout=1)
+                        except TimeoutError:
+                            message = None
+                        if message:
+                            self.apply_event(json.loads(message))
+                        self._maintain()
+            except Exception as e:
+                if self.running:
+                    print(f"Stream de saldos desconectado: {str(e)}")
+                    time.sleep(1)
+            finally:
+                # Eventos podem ter se perdido: reconcilia na próxima volta
+                self.connected.clear()
+                self.reconciled_at = 0.0
+
+    def _maintain(self):
+        now = time.time()
+        if now - self.reconciled_at >= self.reconcile_interval:
+            self.reconcile()
+        if now - self.keepalive_at >= self.keepalive_interval:
+            self.keepalive_at = now
+            try:
+                self.client.stream_keepalive(self.listen_key)
+            except Exception as e:
+                print(f"Erro ao renovar listen key: {str(e)}")
+
+    def stop(self):
+        """Fecha o stream e a listen key"""
+        self.running = False
+        if self.thread:
+            self.thread.join(timeout=5)
+            self.thread = None
+        if self.listen_key:
+            try:
+                self.client.stream_close(self.listen_key)
+            except Exception:
+                pass
+            self.listen_key = None
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Criação centralizada do cliente da Binance
+"""
+
+import os
+import threading
+from pathlib import Path
+from dotenv import load_dotenv
+from rate_limiter import GovernedClient, RateLimitGovernor
+
+# Carrega configurações
+root_dir = Path(__file__).parent.parent
+config_path = root_dir / 'config' / 'config.env'
+load_dotenv(config_path)
+
+DEFAULT_STREAM_URL = 'wss://stream.binance.com:9443'
+DEFAULT_WS_API_URL = 'wss://ws-api.binance.com:443/ws-api/v3'
+
+# Governador único do processo: todos os clientes compartilham o limite de IP
+governor = RateLimitGovernor(
+    weight_limit=int(os.getenv('REST_WEIGHT_LIMIT', '6000')),
+    reserve_percent=float(os.getenv('REST_ORDER_RESERVE_PERCENT', '20'))
+)
+
+
+def _credentials(api_key=None, api_secret=None):
+    """Chaves informadas ou do config; sem chaves não há cliente"""
+    api_key = api_key or os.getenv('BINANCE_API_KEY')
+    api_secret = api_secret or os.getenv('BINANCE_API_SECRET')
+
+    if not api_key or not api_secret:
+        raise ValueError("Chaves da Binance não encontradas")
+
+    return api_key, api_secret
+
+
+def create_client(api_key=None, api_secret=None, rate_governor=None):
+    """
+    Cria o cliente REST da Binance
+
+    Se BINANCE_API_URL estiver definida (ex: http://127.0.0.1:8900), o
+    cliente aponta para esse servidor em vez da Binance — usado com a
+    exchange falsa local (src/fake_exchange.py).
+
+    Args:
+        api_key (str): Chave da API (padrão: BINANCE_API_KEY)
+        api_secret (str): Segredo da API (padrão: BINANCE_API_SECRET)
+        rate_governor (RateLimitGovernor): Governador de peso (padrão: o compartilhado)
+
+    Returns:
+        GovernedClient: Cliente da Binance com controle de peso de REST
+    """
+    api_key, api_secret = _credentials(api_key, api_secret)
+
+    # python-binance leva ~1 s para importar (aiohttp, dateparser): só quando há cliente de verdade
+    from binance.client import Client
+    client_class = Client
+
+    api_url = os.getenv('BINANCE_API_URL')
+    if api_url:
+        # As URLs precisam estar definidas antes do ping feito no construtor
+        api_url = api_url.rstrip('/')
+        client_class = type('Client', (Client,), {
+            'API_URL': api_url + '/api',
+            'MARGIN_API_URL': api_url + '/sapi'
+        })
+
+    return GovernedClient(client_class(api_key, api_secret), rate_governor or governor)
+
+
+class LazyClient:
+    """
+    Cliente criado no primeiro uso
+
+    Varreduras pela tabela compartilhada, replay e simulação sem ordens não
+    pagam o import do python-binance nem o ping do construtor. Os argumentos
+    são os de create_client; a falta de chaves é detectada já na criação.
+    """
+
+    def __init__(self, api_key=None, api_secret=None, rate_governor=None):
+        self._args = _credentials(api_key, api_secret) + (rate_governor,)
+        self._client = None
+        self._lock = threading.Lock()
+
+    @property
+    def created(self):
+        """True se o cliente já foi construído"""
+        return self._client is not None
+
+    def _get(self):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = create_client(*self._args)
+        return self._client
+
+    def __getattr__(self, name):
+        return getattr(self._get(), name)
+
+
+def stream_url():
+    """
+    URL base dos streams WebSocket
+
+    Returns:
+        str: BINANCE_STREAM_URL ou o endpoint público da Binance
+    """
+    return os.getenv('BINANCE_STREAM_URL', DEFAULT_STREAM_URL).rstrip('/')
+
+
+def ws_api_url():
+    """
+    URL da WebSocket API (envio de ordens)
+
+    Returns:
+        str: BINANCE_WS_API_URL ou o endpoint da Binance
+    """
+    return os.getenv('BINANCE_WS_API_URL', DEFAULT_WS_API_URL).rstrip('/')
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Cooldown de oportunidades já executadas
+
+Um triângulo com lucro só no preço cotado (ex: último preço velho de um
+par sem liquidez) aparece de novo a cada varredura. Depois de executado,
+ele só volta a ser aceito quando os preços mudarem ou o cooldown
+expirar. Triângulos cuja última execução falhou ou deu prejuízo esperam
+o dobro a cada resultado ruim seguido, mesmo com preços novos.
+"""
+
+import threading
+import time
+
+import metrics
+
+
+def price_signature(opportunity, digits=8):
+    """
+    Assinatura dos preços usados na avaliação
+
+    Args:
+        opportunity (Opportunity): Oportunidade
+        digits (int): Dígitos significativos comparados
+
+    Returns:
+        tuple: Preços arredondados
+    """
+    return tuple(float(f"{price:.{digits}g}") for price in opportunity.prices)
+
+
+class OpportunityCooldown:
+    """Cache com TTL por triângulo e assinatura de preços"""
+
+    def __init__(self, cooldown_seconds=30, max_backoff_seconds=600, digits=8, clock=time.monotonic):
+        """
+        Inicializa o cache
+
+        Args:
+            cooldown_seconds (float): Espera após uma execução (0 = desativado)
+            max_backoff_seconds (float): Espera máxima após resultados ruins seguidos
+            digits (int): Dígitos significativos da assinatura de preços
+            clock (callable): Relógio em segundos
+        """
+        self.cooldown_seconds = cooldown_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self.digits = digits
+        self.clock = clock
+
+        self.lock = threading.Lock()
+        # {pares: {'signature', 'until', 'losses'}}
+        self.entries = {}
+
+    def allow(self, opportunity):
+        """
+        Diz se a oportunidade pode ser executada agora
+
+        Args:
+            opportunity (Opportunity): Oportunidade
+
+        Returns:
+            bool: False se ainda estiver em cooldown
+        """
+        if self.cooldown_seconds <= 0:
+            return True
+
+        with self.lock:
+            entry = self.entries.get(opportunity.triangle.pairs)
+            if entry is None:
+                return True
+            if self.clock() >= entry['until']:
+                return True
+            # Preços novos liberam, exceto para quem vem de resultado ruim
+            if entry['losses'] == 0 and entry['signature'] != price_signature(opportunity, self.digits):
+                return True
+        return False
+
+    def filter(self, opportunities):
+        """
+        Remove as oportunidades em cooldown, mantendo a ordem
+
+        Args:
+            opportunities (list): Oportunidades ordenadas
+
+        Returns:
+            list: Oportunidades liberadas
+        """
+        allowed = [o for o in opportunities if self.allow(o)]
+        skipped = len(opportunities) - len(allowed)
+        if skipped:
+            metrics.COOLDOWN_SKIPS.inc(skipped)
+        return allowed
+
+    def record_attempt(self, opportunity):
+        """
+        Registra a execução de um triângulo (antes do resultado)
+
+        Args:
+            opportunity (Opportunity): Oportunidade executada
+        """
+        if self.cooldown_seconds <= 0:
+            return
+
+        with self.lock:
+            entry = self.entries.get(opportunity.triangle.pairs)
+            losses = entry['losses'] if entry else 0
+            self.entries[opportunity.triangle.pairs] = {
+                'signature': price_signature(opportunity, self.digits),
+                'until': self.clock() + self._duration(losses),
+                'losses': losses
+            }
+            self._purge()
+
+    def record_result(self, result):
+        """
+        Ajusta o cooldown pelo resultado
+
+        Falha ou prejuízo dobram a espera (até max_backoff_seconds); lucro zera.
+
+        Args:
+            result (OrderResult): Resultado da execução
+        """
+        if self.cooldown_seconds <= 0:
+            return
+
+        with self.lock:
+            entry = self.entries.get(tuple(result.pairs))
+            if entry is None:
+                return
+            if result.success and result.profit >= 0:
+                entry['losses'] = 0
+            else:
+                entry['losses'] += 1
+            entry['until'] = self.clock() + self._duration(entry['losses'])
+
+    def _duration(self, losses):
+        return min(self.cooldown_seconds * 2 ** losses, max(self.cooldown_seconds, self.max_backoff_seconds))
+
+    def _purge(self):
+        """Descarta entradas expiradas sem histórico de resultado ruim"""
+        now = self.clock()
+        expired = [k for k, e in self.entries.items() if e['until'] <= now and e['losses'] == 0]
+        for key in expired:
+            del self.entries[key]
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Descoberta de ciclos de arbitragem em grafos grandes de moedas
+
+Cada moeda vira uma linha de uma matriz de adjacência esparsa guardada
+como bitset (int do Python): o bit j da linha i indica que existe um par
+entre as moedas i e j. Os terceiros vértices de todos os triângulos que
+passam pela aresta (r, a) saem de uma única interseção de linhas
+(linha[a] & linha[r]), em vez de laços aninhados sobre as listas de
+pares de cada moeda — o custo deixa de ser quadrático no grau dos hubs
+(USDT, BTC) e a varredura de todas as raízes fica em milissegundos.
+"""
+
+from models import Triangle
+
+SIDE_BUY = 'BUY'
+SIDE_SELL = 'SELL'
+
+
+def _bits(mask):
+    """Índices dos bits ligados, do menor para o maior"""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class ConversionGraph:
+    """Matriz de adjacência esparsa (bitsets) das conversões negociáveis"""
+
+    def __init__(self, symbols):
+        """
+        Monta o grafo
+
+        Args:
+            symbols (list): Pares no formato do MarketData ({'symbol', 'base', 'quote'})
+        """
+        self.assets = []
+        self.index = {}
+        # sells[i]: moedas recebidas vendendo i (pares i/j); buys[i]: moedas compradas com i (pares j/i)
+        self.sells = []
+        self.buys = []
+        # {(i, j): [(símbolo, lado)]} para converter i em j
+        self.edges = {}
+
+        for s in symbols:
+            base = self._asset(s['base'])
+            quote = self._asset(s['quote'])
+            if base == quote:
+                continue
+            self.sells[base] |= 1 << quote
+            self.buys[quote] |= 1 << base
+            self.edges.setdefault((base, quote), []).append((s['symbol'], SIDE_SELL))
+            self.edges.setdefault((quote, base), []).append((s['symbol'], SIDE_BUY))
+
+        # Conversão em qualquer direção: a matriz é simétrica
+        self.links = [sells | buys for sells, buys in zip(self.sells, self.buys)]
+
+    def _asset(self, asset):
+        i = self.index.get(asset)
+        if i is None:
+            i = len(self.assets)
+            self.index[asset] = i
+            self.assets.append(asset)
+            self.sells.append(0)
+            self.buys.append(0)
+        return i
+
+    def _symbol(self, i, j, side):
+        for symbol, edge_side in self.edges[(i, j)]:
+            if edge_side == side:
+                yield symbol
+
+    def triangles(self, root):
+        """
+        Triângulos na orientação do TriangleFinder: compra, venda, venda
+
+        root → A (compra A no par A/root), A → B (venda no par A/B),
+        B → root (venda no par B/root).
+
+        Args:
+            root (str): Moeda de partida e chegada
+
+        Returns:
+            list: Triângulos (models.Triangle)
+        """
+        r = self.index.get(root)
+        if r is None:
+            return []
+
+        triangles = []
+        quoted_in_root = self.buys[r]
+        assets = self.assets
+        for a in _bits(quoted_in_root):
+            # B: moedas que A compra vendendo e que são cotadas na raiz
+            for b in _bits(self.sells[a] & quoted_in_root):
+                for pair1 in self._symbol(r, a, SIDE_BUY):
+                    for pair2 in self._symbol(a, b, SIDE_SELL):
+                        for pair3 in self._symbol(b, r, SIDE_SELL):
+                            triangles.append(Triangle(
+                                path=(root, assets[a], assets[b], root),
+                                pairs=(pair1, pair2, pair3)
+                            ))
+        return triangles
+
+    def cycles(self, roots=None, length=3):
+        """
+        Todos os ciclos de conversão de 3 ou 4 pernas, em qualquer direção
+
+        Mesmo formato compacto de parallel_scanner.enumerate_cycles.
+
+        Args:
+            roots (list): Moedas de partida/chegada (None = todas)
+            length (int): Quantidade de pernas (3 ou 4)
+
+        Returns:
+            list: Ciclos como tuplas de (símbolo, lado)
+        """
+        if length not in (3, 4):
+            raise ValueError("length deve ser 3 ou 4")
+
+        links = self.links
+        edges = self.edges
+        roots = self.assets if roots is None else roots
+        cycles = []
+
+        for root in roots:
+            r = self.index.get(root)
+            if r is None:
+                continue
+            closing = links[r]
+            for a in _bits(closing):
+                if length == 3:
+                    # Terceiro vértice: vizinho de A que volta para a raiz
+                    for b in _bits(links[a] & closing):
+                        for leg1 in edges[(r, a)]:
+                            for leg2 in edges[(a, b)]:
+                                for leg3 in edges[(b, r)]:
+                                    cycles.append((leg1, leg2, leg3))
+                    continue
+
+                for b in _bits(links[a] & ~(1 << r)):
+                    for c in _bits(links[b] & closing & ~(1 << a)):
+                        for leg1 in edges[(r, a)]:
+                            for leg2 in edges[(a, b)]:
+                                for leg3 in edges[(b, c)]:
+                                    for leg4 in edges[(c, r)]:
+                                        cycles.append((leg1, leg2, leg3, leg4))
+
+        return cycles
@@ -1,15 +1,22 @@
-import mysql.connector
-from mysql.connector import Error
 from datetime import datetime
 import os
 from dotenv import load_dotenv
+from latency import tracker
+from metrics import DB_QUEUE_DEPTH
 
 load_dotenv('config/config.env')
 
+
+def _mysql():
+    """Conector do MySQL, importado só quando o banco é usado (~100 ms de import)"""
+    import mysql.connector
+    return mysql.connector
+
+
 class Database:
     def __init__(self):
+        # Conecta no primeiro save/consulta (ensure_connection): partida sem ida à rede
         self.connection = None
-        self.connect()
     
     def connect(self):
         """Conecta ao banco de dados MySQL"""
@@ -34,7 +41,7 @@ class Database:
             host = host_port[0]
             port = int(host_port[1])
             
-            self.connection = mysql.connector.connect(
+            self.connection = _mysql().connect(
                 host=host,
                 port=port,
                 user=user,
@@ -47,7 +54,7 @@ class Database:
             if self.connection.is_connected():
                 print("[Database] ✓ Conectado ao banco de dados")
                 return True
-        except Error as e:
+        except _mysql().Error as e:
             print(f"[Database] ✗ Erro ao conectar: {e}")
             self.connection = None
             return False
@@ -58,8 +65,10 @@ class Database:
             self.connect()
         return self.connection and self.connection.is_connected()
     
+    @tracker.timed('db.save_opportunity')
+    @DB_QUEUE_DEPTH.track_inprogress()
     def save_opportunity(self, opportunity):
-        """Salva uma oportunidade encontrada"""
+        """Salva uma oportunidade encontrada (models.Opportunity)"""
         if not self.ensure_connection():
             return False
         
@@ -73,12 +82,12 @@ class Database:
             """
             
             # Concatenar símbolos em um texto
-            pairs_text = ','.join(opportunity['symbols'])
+            pairs_text = ','.join(opportunity.triangle.pairs)
             
             values = (
-                opportunity['path'],
+                opportunity.triangle.route,
                 pairs_text,
-                int(opportunity['profit_percent'] * 100),  # Converter para basis points
+                int(opportunity.profit_percent * 100),  # Converter para basis points
                 datetime.now()
             )
             
@@ -86,19 +95,21 @@ class Database:
             self.connection.commit()
             cursor.close()
             return True
-        except Error as e:
+        except _mysql().Error as e:
             print(f"[Database] Erro ao salvar oportunidade: {e}")
             return False
     
-    def save_trade(self, trade_data):
-        """Salva um trade executado"""
+    @tracker.timed('db.save_trade')
+    @DB_QUEUE_DEPTH.track_inprogress()
+    def save_trade(self, trade):
+        """Salva um trade executado ou desfeito com perda (models.OrderResult)"""
         print("[Database] Tentando salvar trade...")
         if not self.ensure_connection():
             print("[Database] Falha na conexão")
             return False
         
         try:
-            print(f"[Database] Dados do trade: {trade_data['path']}")
+            print(f"[Database] Dados do trade: {trade.route}")
             cursor = self.connection.cursor()
             
             query = """
@@ -109,18 +120,18 @@ class Database:
             """
             
             # Criar pairs text
-            pairs_text = f"{trade_data['step1']['symbol']},{trade_data['step2']['symbol']},{trade_data['step3']['symbol']}"
+            pairs_text = ','.join(order.symbol for order in trade.orders)
             
             values = (
                 1,  # userId padrão (owner)
-                trade_data['path'],
+                trade.route,
                 pairs_text,
-                int(trade_data['initial_amount'] * 100),  # Converter para centavos
-                int(trade_data['final_amount'] * 100),
-                int(trade_data['profit_amount'] * 100),
-                int(trade_data['profit_percent'] * 100),  # Converter para basis points
-                trade_data.get('simulation_mode', True),
-                True,  # success
+                int(trade.initial_amount * 100),  # Converter para centavos
+                int(trade.final_amount * 100),
+                int(trade.profit * 100),
+                int(trade.profit_percent * 100),  # Converter para basis points
+                trade.simulation_mode,
+                trade.success,
                 datetime.now()
             )
             
@@ -130,7 +141,7 @@ class Database:
             cursor.close()
             print("[Database] ✓ Trade salvo com sucesso!")
             return True
-        except Error as e:
+        except _mysql().Error as e:
             print(f"[Database] ✗ Erro ao salvar trade: {e}")
             return False
     
@@ -145,7 +156,7 @@ class Database:
             config = cursor.fetchone()
             cursor.close()
             return config
-        except Error as e:
+        except _mysql().Error as e:
             print(f"[Database] Erro ao buscar config: {e}")
             return None
     
@@ -161,7 +172,7 @@ class Database:
             self.connection.commit()
             cursor.close()
             return True
-        except Error as e:
+        except _mysql().Error as e:
             print(f"[Database] Erro ao atualizar status: {e}")
             return False
     
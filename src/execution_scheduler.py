@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Execução simultânea de vários triângulos por ciclo
+
+Do ranking da varredura, escolhe de forma gulosa (do melhor para o pior)
+os triângulos que não disputam moedas intermediárias nem capital e os
+executa em paralelo. Triângulos sem moeda intermediária em comum também
+não têm par em comum: todo par do triângulo envolve uma delas.
+
+Cada execução segura os locks das suas moedas intermediárias e reserva
+o valor do trade no orçamento global enquanto roda. Com um LastLook, o
+triângulo é reavaliado no livro atual logo antes da primeira ordem.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import metrics
+
+
+def intermediate_assets(opportunity):
+    """Moedas do meio do caminho (ex: USDT → BTC → ETH → USDT = {BTC, ETH})"""
+    return frozenset(opportunity.triangle.path[1:-1])
+
+
+class ExecutionScheduler:
+    """Seleciona triângulos sem conflito e executa em paralelo"""
+
+    def __init__(self, executor, max_concurrent=1, capital_budget=None, last_look=None):
+        """
+        Inicializa o agendador
+
+        Args:
+            executor (OrderExecutor): Executor compartilhado pelos workers
+            max_concurrent (int): Triângulos executados ao mesmo tempo
+            capital_budget (float): Capital máximo comprometido ao mesmo tempo
+                em moeda base (None = sem limite; só max_concurrent e o saldo
+                do balance cache limitam)
+            last_look (LastLook): Reavaliação antes de enviar (None = desativada)
+        """
+        if max_concurrent < 1:
+            raise ValueError("max_concurrent deve ser pelo menos 1")
+
+        self.executor = executor
+        self.max_concurrent = max_concurrent
+        self.capital_budget = capital_budget
+        self.last_look = last_look
+
+        self.pool = None
+        self.lock = threading.Lock()
+        # {moeda: Lock} criados sob demanda
+        self.asset_locks = {}
+        self.reserved = 0.0
+
+    def available_capital(self, base_currency):
+        """
+        Capital ainda livre para novos trades
+
+        Args:
+            base_currency (str): Moeda base
+
+        Returns:
+            float: Valor em moeda base (inf = sem limite)
+        """
+        with self.lock:
+            free = float('inf') if self.capital_budget is None else self.capital_budget - self.reserved
+
+        # Saldo real da conta também limita (cache do user data stream)
+        cache = getattr(self.executor, 'balance_cache', None)
+        if cache is not None:
+            free = min(free, cache.free(base_currency))
+        return free
+
+    def select(self, opportunities, amount):
+        """
+        Escolhe os triângulos a executar, na ordem do ranking
+
+        Args:
+            opportunities (list): Oportunidades ordenadas da melhor para a pior
+            amount (float): Valor por trade em moeda base
+
+        Returns:
+            list: Oportunidades sem moeda intermediária em comum, dentro do orçamento
+        """
+        if not opportunities:
+            return []
+
+        capital = self.available_capital(opportunities[0].triangle.path[0])
+        selected = []
+        used = set()
+
+        for opportunity in opportunities:
+            if len(selected) >= self.max_concurrent or capital < amount:
+                break
+            assets = intermediate_assets(opportunity)
+            if assets & used:
+                continue
+            selected.append(opportunity)
+            used |= assets
+            capital -= amount
+
+        return selected
+
+    def _asset_lock(self, asset):
+        with self.lock:
+            return self.asset_locks.setdefault(asset, threading.Lock())
+
+    def _reserve(self, amount):
+        with self.lock:
+            if self.capital_budget is not None and self.reserved + amount > self.capital_budget + 1e-9:
+                return False
+            self.reserved += amount
+            return True
+
+    def _release(self, amount):
+        with self.lock:
+            self.reserved = max(0.0, self.reserved - amount)
+
+    def execute(self, opportunity, amount):
+        """
+        Executa um triângulo com as moedas travadas e o capital reservado
+
+        Se alguma moeda já estiver em uso por outra execução, o orçamento
+        estiver esgotado ou o last look recusar, nada é enviado.
+
+        Args:
+            opportunity (Opportunity): Oportunidade
+            amount (float): Valor em moeda base
+
+        Returns:
+            tuple: (OrderResult ou None se não executou, motivo da recusa do
+                last look ou None)
+        """
+        # Ordem fixa de aquisição evita deadlock entre execuções
+        locks = [self._asset_lock(asset) for asset in sorted(intermediate_assets(opportunity))]
+        acquired = []
+        try:
+            for lock in locks:
+                if not lock.acquire(blocking=False):
+                    metrics.SCHEDULER_CONFLICTS.inc()
+                    return None, None
+                acquired.append(lock)
+
+            if not self._reserve(amount):
+                metrics.SCHEDULER_CONFLICTS.inc()
+                return None, None
+            try:
+                # O mais tarde possível: logo antes da primeira ordem
+                if self.last_look is not None:
+                    approved, profit_percent, reason = self.last_look.check(opportunity)
+                    if not approved:
+                        return None, reason
+                return self.executor.execute_arbitrage(opportunity, amount), None
+            finally:
+                self._release(amount)
+        finally:
+            for lock in reversed(acquired):
+                lock.release()
+
+    def run(self, opportunities, amount):
+        """
+        Seleciona e executa os triângulos do ciclo, esperando todos terminarem
+
+        Args:
+            opportunities (list): Oportunidades ordenadas da melhor para a pior
+            amount (float): Valor por trade em moeda base
+
+        Returns:
+            tuple: (resultados (models.OrderResult) na ordem do ranking,
+                recusas do last look como [(oportunidade, motivo)])
+        """
+        selected = self.select(opportunities, amount)
+        if not selected:
+            return [], []
+
+        metrics.SCHEDULED_TRADES.inc(len(selected))
+
+        # Um triângulo só: executa na própria thread
+        if len(selected) == 1:
+            outcomes = [self.execute(selected[0], amount)]
+        else:
+            if self.pool is None:
+                self.pool = ThreadPoolExecutor(max_workers=self.max_concurrent, thread_name_prefix='exec')
+            futures = [self.pool.submit(self.execute, opportunity, amount) for opportunity in selected]
+            outcomes = [future.result() for future in futures]
+
+        results = [result for result, _ in outcomes if result is not None]
+        rejected = [(opportunity, reason) for opportunity, (_, reason) in zip(selected, outcomes) if reason is not None]
+        return results, rejected
+
+    def close(self):
+        """Encerra os workers"""
+        if self.pool is not None:
+            self.pool.shutdown(wait=True)
+            self.pool = None
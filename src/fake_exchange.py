@@ -0,0 +1,707 @@
+#!/usr/bin/env python3
+"""
+Exchange falsa local (REST + WebSocket) para testes herméticos e de carga
+
+Implementa os endpoints da Binance usados pelo projeto, com latência,
+limite de peso de REST e processo de preços configuráveis. Para apontar
+o bot para ela, use as variáveis retornadas por FakeExchange.env():
+
+    BINANCE_API_URL=http://127.0.0.1:8900
+    BINANCE_STREAM_URL=ws://127.0.0.1:8901
+    BINANCE_WS_API_URL=ws://127.0.0.1:8901/ws-api/v3
+"""
+
+import argparse
+import hashlib
+import hmac
+import itertools
+import json
+import math
+import queue
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+from websockets.sync.server import serve as ws_serve
+from websockets.exceptions import ConnectionClosed
+
+from synthetic_market import SIZES, RandomWalk, generate_market
+
+API_KEY = 'fake-api-key'
+API_SECRET = 'fake-api-secret'
+
+# Peso dos métodos da WebSocket API
+WS_API_WEIGHTS = {
+    'ping': 1,
+    'order.place': 1
+}
+
+# Peso de cada endpoint (mesmos valores da Binance); (peso com symbol, peso sem)
+WEIGHTS = {
+    ('GET', '/api/v3/ping'): (1, 1),
+    ('GET', '/api/v3/time'): (1, 1),
+    ('GET', '/api/v3/exchangeInfo'): (20, 20),
+    ('GET', '/api/v3/ticker/price'): (2, 4),
+    ('GET', '/api/v3/ticker/bookTicker'): (2, 4),
+    ('GET', '/api/v3/ticker/24hr'): (2, 80),
+    ('GET', '/api/v3/account'): (20, 20),
+    ('POST', '/api/v3/order'): (1, 1),
+    ('GET', '/sapi/v1/asset/tradeFee'): (1, 1),
+    ('POST', '/api/v3/userDataStream'): (2, 2),
+    ('PUT', '/api/v3/userDataStream'): (2, 2),
+    ('DELETE', '/api/v3/userDataStream'): (2, 2)
+}
+
+
+class FakeExchangeError(Exception):
+    """Erro no formato da API da Binance"""
+
+    def __init__(self, code, msg, status=400):
+        super().__init__(msg)
+        self.code = code
+        self.msg = msg
+        self.status = status
+
+
+class FakeExchange:
+    """Estado e servidores da exchange falsa"""
+
+    def __init__(self, size='small', symbols=None, prices=None, latency_ms=0,
+                 weight_limit=6000, fee_percent=0.1, balances=None, spread=0.0005,
+                 volatility=0.0005, updates_per_second=0, enforce_balances=True, seed=0,
+                 symbol_fees=None, liquidity=None, halted=None, volumes=None):
+        """
+        Inicializa a exchange
+
+        Args:
+            size (str): Tamanho do mercado sintético quando symbols não é informado
+            symbols (list): Símbolos no formato do exchange info
+            prices (dict): Preços iniciais {símbolo: preço}
+            latency_ms (float): Latência adicionada a cada requisição REST
+            weight_limit (int): Peso máximo de REST por minuto (0 = sem limite)
+            fee_percent (float): Comissão por ordem em %
+            balances (dict): Saldos iniciais {ativo: quantidade}
+            spread (float): Spread relativo entre bid e ask
+            volatility (float): Volatilidade do passeio aleatório de preços
+            updates_per_second (int): Atualizações de preço por segundo (0 = estático)
+            enforce_balances (bool): Rejeita ordens sem saldo suficiente
+            seed (int): Semente do mercado e do processo de preços
+            symbol_fees (dict): Comissão em % por símbolo (ex: pares com taxa zero)
+            liquidity (dict): Quantidade máxima executada por ordem a mercado por
+                símbolo; o excedente expira (preenchimento parcial)
+            halted (iterable): Símbolos que rejeitam ordens (ex: negociação suspensa)
+            volumes (dict): Volume de 24h em moeda base do par por símbolo
+                (padrão: 1000; 0 = par parado, sem negócios)
+        """
+        if symbols is None:
+            symbols, generated = generate_market(seed=seed, **SIZES[size])
+            prices = prices or generated
+
+        self.symbols = symbols
+        self.symbol_info = {s['symbol']: s for s in symbols}
+        self.walk = RandomWalk(prices, volatility, seed)
+        self.latency = latency_ms / 1000
+        self.weight_limit = weight_limit
+        self.fee_percent = fee_percent
+        self.symbol_fees = dict(symbol_fees or {})
+        self.liquidity = dict(liquidity or {})
+        self.halted = set(halted or ())
+        self.volumes = dict(volumes or {})
+        self.spread = spread
+        self.updates_per_second = updates_per_second
+        self.enforce_balances = enforce_balances
+        self.balances = dict(balances if balances is not None else {'USDT': 100000.0})
+
+        self.lock = threading.Lock()
+        self.order_ids = itertools.count(1)
+        self.update_ids = itertools.count(1)
+        self.orders = []
+        self.listen_keys = set()
+        self.subscribers = []
+        self.weight_used = 0
+        self.weight_window = 0
+        self.requests = 0
+        self.ws_api_requests = 0
+
+        self.http_server = None
+        self.ws_server = None
+        self.threads = []
+        self.running = False
+
+    # ------------------------------------------------------------------
+    # Estado do mercado
+    # ------------------------------------------------------------------
+
+    @property
+    def prices(self):
+        return self.walk.prices
+
+    def book(self, symbol):
+        """Retorna (bid, ask) do símbolo"""
+        price = self.walk.prices[symbol]
+        half = self.spread / 2
+        return price * (1 - half), price * (1 + half)
+
+    def book_ticker(self, symbol):
+        bid, ask = self.book(symbol)
+        return {
+            'symbol': symbol,
+            'bidPrice': f"{bid:.8f}",
+            'bidQty': '1000.00000000',
+            'askPrice': f"{ask:.8f}",
+            'askQty': '1000.00000000'
+        }
+
+    def ticker_24h(self, symbol):
+        """Estatísticas de 24h do símbolo (volume sintético)"""
+        price = self.walk.prices[symbol]
+        bid, ask = self.book(symbol)
+        volume = self.volumes.get(symbol, 1000.0)
+        now = int(time.time() * 1000)
+        return {
+            'symbol': symbol,
+            'lastPrice': f"{price:.8f}",
+            'bidPrice': f"{bid:.8f}",
+            'askPrice': f"{ask:.8f}",
+            'volume': f"{volume:.8f}",
+            'quoteVolume': f"{volume * price:.8f}",
+            'openTime': now - 24 * 3600 * 1000,
+            'closeTime': now,
+            'count': int(volume * 10)
+        }
+
+    def step_prices(self, count=None):
+        """
+        Avança o processo de preços e publica bookTicker nos streams
+
+        Args:
+            count (int): Símbolos a atualizar (padrão: todos)
+        """
+        with self.lock:
+            updated = self.walk.step(count)
+
+        for symbol in updated:
+            bid, ask = self.book(symbol)
+            self._publish('bookTicker', symbol, {
+                'u': next(self.update_ids),
+                's': symbol,
+                'b': f"{bid:.8f}",
+                'B': '1000.00000000',
+                'a': f"{ask:.8f}",
+                'A': '1000.00000000'
+            })
+
+    # ------------------------------------------------------------------
+    # Limite de peso
+    # ------------------------------------------------------------------
+
+    def consume_weight(self, weight):
+        """
+        Consome peso na janela do minuto atual
+
+        Returns:
+            int: Peso usado na janela após a requisição
+        """
+        with self.lock:
+            window = int(time.time() // 60)
+            if window != self.weight_window:
+                self.weight_window = window
+                self.weight_used = 0
+
+            self.requests += 1
+            if self.weight_limit and self.weight_used + weight > self.weight_limit:
+                raise FakeExchangeError(-1003, "Too much request weight used; current limit is "
+                                        f"{self.weight_limit} request weight per 1 MINUTE.", status=429)
+            self.weight_used += weight
+            return self.weight_used
+
+    # ------------------------------------------------------------------
+    # Ordens
+    # ------------------------------------------------------------------
+
+    def _move(self, asset, amount):
+        # Saldos com 8 casas, como os valores das respostas
+        self.balances[asset] = round(self.balances.get(asset, 0.0) + amount, 8)
+
+    def fee_for(self, symbol):
+        """Comissão em % do símbolo"""
+        return self.symbol_fees.get(symbol, self.fee_percent)
+
+    def place_order(self, params):
+        """
+        Executa uma ordem contra o livro atual
+
+        Args:
+            params (dict): Parâmetros no formato da API (symbol, side, type, quantity...)
+
+        Returns:
+            dict: Resposta FULL da Binance
+        """
+        symbol = params.get('symbol')
+        info = self.symbol_info.get(symbol)
+        if info is None:
+            raise FakeExchangeError(-1121, "Invalid symbol.")
+
+        side = params.get('side')
+        order_type = params.get('type')
+        if side not in ('BUY', 'SELL'):
+            raise FakeExchangeError(-1102, "Mandatory parameter 'side' was not sent.")
+        if order_type not in ('MARKET', 'LIMIT'):
+            raise FakeExchangeError(-1116, "Invalid orderType.")
+
+        # Sem livro de ordens abertas: LIMIT só como IOC/FOK (executa agora ou expira)
+        time_in_force = params.get('timeInForce', 'GTC') if order_type == 'LIMIT' else 'GTC'
+        if order_type == 'LIMIT':
+            if time_in_force not in ('IOC', 'FOK'):
+                raise FakeExchangeError(-1000, "Exchange falsa só aceita LIMIT com timeInForce IOC ou FOK.")
+            if params.get('price') is None:
+                raise FakeExchangeError(-1102, "Mandatory parameter 'price' was not sent.")
+
+        base, quote = info['baseAsset'], info['quoteAsset']
+
+        with self.lock:
+            bid, ask = self.book(symbol)
+            price = ask if side == 'BUY' else bid
+
+            if params.get('quantity') is not None:
+                quantity = float(params['quantity'])
+            elif params.get('quoteOrderQty') is not None:
+                quantity = math.floor(float(params['quoteOrderQty']) / price * 1e8) / 1e8
+            else:
+                raise FakeExchangeError(-1102, "Mandatory parameter 'quantity' was not sent.")
+
+            if quantity <= 0:
+                raise FakeExchangeError(-1013, "Filter failure: LOT_SIZE")
+            if symbol in self.halted:
+                raise FakeExchangeError(-1013, "Market is closed.")
+
+            # Sem liquidez suficiente a ordem executa em parte e expira
+            requested = quantity
+            quantity = min(quantity, self.liquidity.get(symbol, quantity))
+
+            if order_type == 'LIMIT':
+                # Executa ao preço do livro só se ele estiver dentro do limite
+                limit = float(params['price'])
+                crosses = ask <= limit if side == 'BUY' else bid >= limit
+                if not crosses or (time_in_force == 'FOK' and quantity < requested):
+                    quantity = 0.0
+
+            status = 'FILLED' if quantity >= requested else 'EXPIRED'
+
+            quote_qty = round(quantity * price, 8)
+            fee_percent = self.fee_for(symbol)
+
+            if side == 'BUY':
+                spend_asset, spend = quote, quote_qty
+                commission_asset = base
+                commission = round(quantity * fee_percent / 100, 8)
+            else:
+                spend_asset, spend = base, quantity
+                commission_asset = quote
+                commission = round(quote_qty * fee_percent / 100, 8)
+
+            if self.enforce_balances and self.balances.get(spend_asset, 0.0) + 1e-12 < spend:
+                raise FakeExchangeError(-2010, "Account has insufficient balance for requested action.")
+
+            if side == 'BUY':
+                self._move(quote, -quote_qty)
+                self._move(base, quantity - commission)
+            else:
+                self._move(base, -quantity)
+                self._move(quote, quote_qty - commission)
+
+            order_id = next(self.order_ids)
+            now = int(time.time() * 1000)
+            fill = {
+                'price': f"{price:.8f}",
+                'qty': f"{quantity:.8f}",
+                'commission': f"{commission:.8f}",
+                'commissionAsset': commission_asset,
+                'tradeId': order_id
+            }
+            response = {
+                'symbol': symbol,
+                'orderId': order_id,
+                'clientOrderId': params.get('newClientOrderId', f"fake{order_id}"),
+                'transactTime': now,
+                'price': f"{float(params['price']):.8f}" if order_type == 'LIMIT' else '0.00000000',
+                'origQty': f"{requested:.8f}",
+                'executedQty': f"{quantity:.8f}",
+                'cummulativeQuoteQty': f"{quote_qty:.8f}",
+                'status': status,
+                'timeInForce': time_in_force,
+                'type': order_type,
+                'side': side,
+                'fills': [fill] if quantity > 0 else []
+            }
+            self.orders.append(response)
+            positions = [
+                {'a': asset, 'f': f"{self.balances.get(asset, 0.0):.8f}", 'l': '0.00000000'}
+                for asset in (base, quote)
+            ]
+
+        self._publish_user({
+            'e': 'executionReport', 'E': now, 's': symbol, 'c': response['clientOrderId'],
+            'S': side, 'o': order_type, 'f': time_in_force, 'q': response['origQty'], 'p': response['price'],
+            'x': 'TRADE' if quantity > 0 else 'EXPIRED', 'X': status, 'i': order_id, 'l': fill['qty'], 'z': fill['qty'],
+            'L': fill['price'], 'n': fill['commission'], 'N': commission_asset,
+            'Z': response['cummulativeQuoteQty'], 'T': now
+        })
+        self._publish_user({'e': 'outboundAccountPosition', 'E': now, 'u': now, 'B': positions})
+
+        return response
+
+    def account(self):
+        with self.lock:
+            balances = [
+                {'asset': asset, 'free': f"{amount:.8f}", 'locked': '0.00000000'}
+                for asset, amount in self.balances.items()
+            ]
+            update_time = int(time.time() * 1000)
+        return {'canTrade': True, 'accountType': 'SPOT', 'updateTime': update_time, 'balances': balances}
+
+    # ------------------------------------------------------------------
+    # Streams
+    # ------------------------------------------------------------------
+
+    def _publish(self, channel, key, payload):
+        for sub_channel, keys, q in list(self.subscribers):
+            if sub_channel == channel and (keys is None or key in keys):
+                q.put(payload)
+
+    def _publish_user(self, payload):
+        self._publish('user', None, payload)
+
+    def _ws_handler(self, connection):
+        """Atende /ws-api/v3, /ws/<listenKey>, /ws/!bookTicker e /ws/<símbolo>@bookTicker"""
+        path = urlsplit(connection.request.path).path
+        if path == '/ws-api/v3':
+            self._ws_api_session(connection)
+            return
+        name = path[len('/ws/'):] if path.startswith('/ws/') else ''
+
+        if name in self.listen_keys:
+            subscription = ('user', None, queue.Queue())
+        elif name == '!bookTicker':
+            subscription = ('bookTicker', None, queue.Queue())
+        elif name.endswith('@bookTicker'):
+            symbols = {s.upper() for s in name[:-len('@bookTicker')].split('/')}
+            subscription = ('bookTicker', symbols, queue.Queue())
+        else:
+            connection.close(code=1008, reason='stream desconhecido')
+            return
+
+        self.subscribers.append(subscription)
+        q = subscription[2]
+
+        try:
+            while self.running:
+                try:
+                    payload = q.get(timeout=0.5)
+                except queue.Empty:
+                    continue
+                connection.send(json.dumps(payload))
+        except ConnectionClosed:
+            pass
+        finally:
+            self.subscribers.remove(subscription)
+
+    def handle_ws_api(self, method, params):
+        """
+        Atende uma requisição da WebSocket API
+
+        Returns:
+            object: Campo 'result' da resposta
+        """
+        if method == 'ping':
+            return {}
+        if method == 'order.place':
+            self._check_signature(params)
+            order = {k: v for k, v in params.items() if k not in ('apiKey', 'timestamp', 'signature')}
+            return self.place_order(order)
+        raise FakeExchangeError(-1000, f"Método não implementado: {method}")
+
+    def _check_signature(self, params):
+        """Valida apiKey e assinatura HMAC (parâmetros em ordem alfabética)"""
+        if params.get('apiKey') != API_KEY:
+            raise FakeExchangeError(-2015, "Invalid API-key, IP, or permissions for action.", status=401)
+        payload = '&'.join(f"{k}={v}" for k, v in sorted(params.items()) if k != 'signature')
+        expected = hmac.new(API_SECRET.encode('utf-8'), payload.encode('utf-8'), hashlib.sha256).hexdigest()
+        if not hmac.compare_digest(expected, str(params.get('signature', ''))):
+            raise FakeExchangeError(-1022, "Signature for this request is not valid.")
+
+    def _ws_api_session(self, connection):
+        """Sessão da WebSocket API: requisições e respostas correlacionadas por id"""
+        try:
+            while self.running:
+                try:
+                    message = connection.recv(timeout=0.5)
+                except TimeoutError:
+                    continue
+
+                request = json.loads(message)
+                method = request.get('method')
+
+                if self.latency:
+                    time.sleep(self.latency)
+
+                try:
+                    self.ws_api_requests += 1
+                    used = self.consume_weight(WS_API_WEIGHTS.get(method, 1))
+                    response = {'id': request.get('id'), 'status': 200,
+                                'result': self.handle_ws_api(method, request.get('params') or {})}
+                except FakeExchangeError as e:
+                    used = self.weight_used
+                    response = {'id': request.get('id'), 'status': e.status,
+                                'error': {'code': e.code, 'msg': e.msg}}
+
+                response['rateLimits'] = [{'rateLimitType': 'REQUEST_WEIGHT', 'interval': 'MINUTE',
+                                           'intervalNum': 1, 'limit': self.weight_limit, 'count': used}]
+                connection.send(json.dumps(response))
+        except ConnectionClosed:
+            pass
+
+    def _price_driver(self):
+        """Gera atualizações de preço na taxa configurada"""
+        batch = max(1, self.updates_per_second // 100)
+        interval = batch / self.updates_per_second
+
+        next_tick = time.perf_counter()
+        while self.running:
+            self.step_prices(batch)
+            next_tick += interval
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+    # ------------------------------------------------------------------
+    # REST
+    # ------------------------------------------------------------------
+
+    def handle_rest(self, method, path, params):
+        """
+        Atende uma requisição REST
+
+        Returns:
+            object: Corpo da resposta (será serializado em JSON)
+        """
+        symbol = params.get('symbol')
+
+        if path in ('/api/v3/ping',):
+            return {}
+        if path == '/api/v3/time':
+            return {'serverTime': int(time.time() * 1000)}
+        if path == '/api/v3/exchangeInfo':
+            return {'timezone': 'UTC', 'serverTime': int(time.time() * 1000),
+                    'rateLimits': [], 'symbols': self.symbols}
+        if path == '/api/v3/ticker/price':
+            if symbol:
+                if symbol not in self.prices:
+                    raise FakeExchangeError(-1121, "Invalid symbol.")
+                return {'symbol': symbol, 'price': f"{self.prices[symbol]:.8f}"}
+            return [{'symbol': s, 'price': f"{p:.8f}"} for s, p in list(self.prices.items())]
+        if path == '/api/v3/ticker/bookTicker':
+            if symbol:
+                if symbol not in self.prices:
+                    raise FakeExchangeError(-1121, "Invalid symbol.")
+                return self.book_ticker(symbol)
+            return [self.book_ticker(s) for s in list(self.prices)]
+        if path == '/api/v3/ticker/24hr':
+            if symbol:
+                if symbol not in self.prices:
+                    raise FakeExchangeError(-1121, "Invalid symbol.")
+                return self.ticker_24h(symbol)
+            return [self.ticker_24h(s) for s in list(self.prices)]
+        if path == '/api/v3/account':
+            return self.account()
+        if path == '/api/v3/order' and method == 'POST':
+            return self.place_order(params)
+        if path == '/sapi/v1/asset/tradeFee':
+            symbols = [symbol] if symbol else list(self.symbol_info)
+            return [
+                {
+                    'symbol': s,
+                    'makerCommission': f"{self.fee_for(s) / 100:.8f}",
+                    'takerCommission': f"{self.fee_for(s) / 100:.8f}"
+                }
+                for s in symbols
+            ]
+        if path == '/api/v3/userDataStream':
+            if method == 'POST':
+                key = f"fakelistenkey{len(self.listen_keys) + 1:04d}"
+                self.listen_keys.add(key)
+                return {'listenKey': key}
+            if method == 'DELETE':
+                self.listen_keys.discard(params.get('listenKey'))
+            return {}
+
+        raise FakeExchangeError(-1000, f"Endpoint não implementado: {method} {path}", status=404)
+
+    def _make_http_handler(self):
+        exchange = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def _dispatch(self, method):
+                url = urlsplit(self.path)
+                params = dict(parse_qsl(url.query))
+                length = int(self.headers.get('Content-Length') or 0)
+                if length:
+                    params.update(parse_qsl(self.rfile.read(length).decode('utf-8')))
+
+                weights = WEIGHTS.get((method, url.path), (1, 1))
+                weight = weights[0] if 'symbol' in params else weights[1]
+
+                if exchange.latency:
+                    time.sleep(exchange.latency)
+
+                headers = {}
+                try:
+                    used = exchange.consume_weight(weight)
+                    headers['X-MBX-USED-WEIGHT-1M'] = str(used)
+                    status, body = 200, exchange.handle_rest(method, url.path, params)
+                except FakeExchangeError as e:
+                    headers['X-MBX-USED-WEIGHT-1M'] = str(exchange.weight_used)
+                    if e.status == 429:
+                        headers['Retry-After'] = str(60 - int(time.time()) % 60)
+                    status, body = e.status, {'code': e.code, 'msg': e.msg}
+
+                data = json.dumps(body).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                self._dispatch('GET')
+
+            def do_POST(self):
+                self._dispatch('POST')
+
+            def do_PUT(self):
+                self._dispatch('PUT')
+
+            def do_DELETE(self):
+                self._dispatch('DELETE')
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    # ------------------------------------------------------------------
+    # Ciclo de vida
+    # ------------------------------------------------------------------
+
+    def start(self, host='127.0.0.1', port=0, ws_port=0):
+        """
+        Inicia os servidores REST e WebSocket em threads de fundo
+
+        Args:
+            host (str): Endereço de escuta
+            port (int): Porta REST (0 = porta livre)
+            ws_port (int): Porta WebSocket (0 = porta livre)
+
+        Returns:
+            FakeExchange: A própria exchange (para encadear)
+        """
+        self.running = True
+        self.host = host
+
+        self.http_server = ThreadingHTTPServer((host, port), self._make_http_handler())
+        self.http_server.daemon_threads = True
+        self.port = self.http_server.server_address[1]
+
+        self.ws_server = ws_serve(self._ws_handler, host, ws_port, compression=None)
+        self.ws_port = self.ws_server.socket.getsockname()[1]
+
+        self.threads = [
+            threading.Thread(target=self.http_server.serve_forever, daemon=True),
+            threading.Thread(target=self.ws_server.serve_forever, daemon=True)
+        ]
+        if self.updates_per_second:
+            self.threads.append(threading.Thread(target=self._price_driver, daemon=True))
+
+        for thread in self.threads:
+            thread.start()
+
+        return self
+
+    def stop(self):
+        """Para os servidores"""
+        self.running = False
+        if self.http_server:
+            self.http_server.shutdown()
+            self.http_server.server_close()
+        if self.ws_server:
+            self.ws_server.shutdown()
+
+    @property
+    def api_url(self):
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def stream_url(self):
+        return f"ws://{self.host}:{self.ws_port}"
+
+    def env(self):
+        """
+        Variáveis de ambiente que apontam os clientes para esta exchange
+
+        Returns:
+            dict: BINANCE_API_URL, BINANCE_STREAM_URL, BINANCE_WS_API_URL e chaves falsas
+        """
+        return {
+            'BINANCE_API_URL': self.api_url,
+            'BINANCE_STREAM_URL': self.stream_url,
+            'BINANCE_WS_API_URL': f"{self.stream_url}/ws-api/v3",
+            'BINANCE_API_KEY': API_KEY,
+            'BINANCE_API_SECRET': API_SECRET
+        }
+
+
+if __name__ == "__main__":
+    """Executa a exchange falsa até Ctrl+C"""
+
+    parser = argparse.ArgumentParser(description="Exchange falsa da Binance")
+    parser.add_argument('--size', choices=sorted(SIZES), default='realistic')
+    parser.add_argument('--port', type=int, default=8900)
+    parser.add_argument('--ws-port', type=int, default=8901)
+    parser.add_argument('--latency-ms', type=float, default=0)
+    parser.add_argument('--weight-limit', type=int, default=6000)
+    parser.add_argument('--updates-per-second', type=int, default=1000)
+    parser.add_argument('--fee', type=float, default=0.1)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    exchange = FakeExchange(
+        size=args.size,
+        latency_ms=args.latency_ms,
+        weight_limit=args.weight_limit,
+        fee_percent=args.fee,
+        updates_per_second=args.updates_per_second,
+        seed=args.seed
+    ).start(port=args.port, ws_port=args.ws_port)
+
+    print("="*70)
+    print("EXCHANGE FALSA DA BINANCE")
+    print("="*70)
+    print(f"Pares: {len(exchange.symbols)}")
+    print(f"Atualizações de preço: {args.updates_per_second}/s")
+    print("\nPara apontar o bot para ela:")
+    for key, value in exchange.env().items():
+        print(f"  export {key}={value}")
+    print("\n(Pressione Ctrl+C para parar)")
+
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        exchange.stop()
+        sys.exit(0)
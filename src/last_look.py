@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Última verificação do triângulo antes de enviar a primeira ordem
+
+Entre a varredura e a execução passam gravações no banco, logs e, com
+vários trades por ciclo, a espera pelos locks. O LastLook reavalia o
+triângulo escolhido com o bid/ask mais recente da fonte local (tabela
+compartilhada do feed handler ou PriceStore), sem nenhuma chamada de
+REST, e recusa a execução se o lucro caiu abaixo do mínimo. São três
+leituras e três multiplicações: custo de microssegundos.
+"""
+
+import time
+
+from latency import tracker
+import metrics
+
+
+class LastLook:
+    """Reavalia uma oportunidade no livro atual"""
+
+    def __init__(self, source, fee_percent=0.1, fee_schedule=None, min_profit_percent=0.0, max_age=0):
+        """
+        Inicializa a verificação
+
+        Args:
+            source: Fonte com read_books(símbolos) -> {símbolo: (bid, ask, atualizado_em)}
+                (SharedPriceTable ou PriceStore)
+            fee_percent (float): Taxa em % por ordem quando não há tabela
+            fee_schedule (FeeSchedule): Taxas por par (opcional)
+            min_profit_percent (float): Lucro mínimo em % para executar
+            max_age (float): Idade máxima do livro em segundos (0 = sem limite)
+        """
+        self.source = source
+        self.fee_percent = fee_percent
+        self.fee_schedule = fee_schedule
+        self.min_profit_percent = min_profit_percent
+        self.max_age = max_age
+
+    def _multiplier(self, symbol):
+        if self.fee_schedule is not None:
+            return self.fee_schedule.multiplier(symbol)
+        return 1 - self.fee_percent / 100
+
+    def check(self, opportunity):
+        """
+        Reavalia a oportunidade com compra no ask e vendas no bid
+
+        Se aprovada, os preços do livro atual ficam em book_prices (base
+        dos limites do modo ioc); prices continua com os da varredura, que
+        formam a assinatura do cooldown.
+
+        Args:
+            opportunity (Opportunity): Oportunidade escolhida na varredura
+
+        Returns:
+            tuple: (aprovada, lucro % no livro atual ou None, motivo da recusa)
+        """
+        start = time.perf_counter_ns()
+        try:
+            pair1, pair2, pair3 = opportunity.triangle.pairs
+            books = self.source.read_books((pair1, pair2, pair3))
+            if len(books) < 3:
+                return self._reject(None, "Livro indisponível")
+
+            _, ask1, updated1 = books[pair1]
+            bid2, _, updated2 = books[pair2]
+            bid3, _, updated3 = books[pair3]
+            if ask1 <= 0 or bid2 <= 0 or bid3 <= 0:
+                return self._reject(None, "Livro sem bid/ask")
+
+            if self.max_age > 0:
+                age = time.time() - min(updated1, updated2, updated3)
+                if age > self.max_age:
+                    return self._reject(None, f"Livro com {age:.1f}s")
+
+            factor = (self._multiplier(pair1) / ask1) * (self._multiplier(pair2) * bid2) * (self._multiplier(pair3) * bid3)
+            profit_percent = (factor - 1) * 100
+            if profit_percent < self.min_profit_percent:
+                return self._reject(profit_percent, f"Lucro caiu para {profit_percent:.4f}%")
+
+            opportunity.book_prices = (ask1, bid2, bid3)
+            return True, profit_percent, None
+        finally:
+            tracker.record('last_look.check', time.perf_counter_ns() - start)
+
+    def _reject(self, profit_percent, reason):
+        metrics.LAST_LOOK_REJECTS.inc()
+        return False, profit_percent, reason
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Módulo de instrumentação de latência do pipeline (scan → fill)
+"""
+
+import json
+import threading
+import time
+from collections import deque
+from functools import wraps
+from pathlib import Path
+
+
+class _StageStats:
+    """Estatísticas acumuladas de uma etapa"""
+
+    __slots__ = ('count', 'total_ns', 'max_ns', 'samples')
+
+    def __init__(self, max_samples):
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        # Janela das últimas amostras para calcular percentis
+        self.samples = deque(maxlen=max_samples)
+
+    def add(self, elapsed_ns):
+        self.count += 1
+        self.total_ns += elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+        self.samples.append(elapsed_ns)
+
+
+class _Span:
+    """Context manager que mede uma etapa com perf_counter_ns"""
+
+    __slots__ = ('tracker', 'stage', 'start')
+
+    def __init__(self, tracker, stage):
+        self.tracker = tracker
+        self.stage = stage
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.tracker.record(self.stage, time.perf_counter_ns() - self.start)
+        return False
+
+
+def _percentile(sorted_samples, percent):
+    """Percentil pelo método nearest-rank"""
+    if not sorted_samples:
+        return 0
+    index = max(0, int(round(percent / 100 * len(sorted_samples))) - 1)
+    return sorted_samples[min(index, len(sorted_samples) - 1)]
+
+
+class LatencyTracker:
+    """Coleta latências por etapa do pipeline"""
+
+    def __init__(self, max_samples=4096):
+        """
+        Inicializa o coletor
+
+        Args:
+            max_samples (int): Amostras mantidas por etapa para os percentis
+        """
+        self.max_samples = max_samples
+        self.stages = {}
+        self._lock = threading.Lock()
+
+    def span(self, stage):
+        """
+        Mede um bloco de código
+
+        Args:
+            stage (str): Nome da etapa (ex: market.get_all_tickers)
+
+        Returns:
+            _Span: Context manager para usar com `with`
+        """
+        return _Span(self, stage)
+
+    def timed(self, stage):
+        """
+        Decorator que mede cada chamada da função
+
+        Args:
+            stage (str): Nome da etapa
+        """
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter_ns()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.record(stage, time.perf_counter_ns() - start)
+            return wrapper
+        return decorator
+
+    def record(self, stage, elapsed_ns):
+        """
+        Registra uma medição
+
+        Args:
+            stage (str): Nome da etapa
+            elapsed_ns (int): Duração em nanossegundos
+        """
+        stats = self.stages.get(stage)
+        if stats is None:
+            with self._lock:
+                stats = self.stages.setdefault(stage, _StageStats(self.max_samples))
+        stats.add(elapsed_ns)
+
+    def summary(self):
+        """
+        Resume as latências de cada etapa
+
+        Returns:
+            dict: {etapa: {count, mean_ms, p50_ms, p99_ms, max_ms, total_ms}}
+        """
+        result = {}
+
+        for stage, stats in list(self.stages.items()):
+            samples = sorted(stats.samples)
+            result[stage] = {
+                'count': stats.count,
+                'mean_ms': (stats.total_ns / stats.count) / 1e6 if stats.count else 0,
+                'p50_ms': _percentile(samples, 50) / 1e6,
+                'p99_ms': _percentile(samples, 99) / 1e6,
+                'max_ms': stats.max_ns / 1e6,
+                'total_ms': stats.total_ns / 1e6
+            }
+
+        return result
+
+    def report_lines(self):
+        """
+        Formata o resumo como tabela de texto
+
+        Returns:
+            list: Linhas da tabela
+        """
+        summary = self.summary()
+        if not summary:
+            return []
+
+        lines = [f"{'Etapa':32} {'N':>7} {'p50 ms':>10} {'p99 ms':>10} {'max ms':>10}"]
+        for stage in sorted(summary):
+            s = summary[stage]
+            lines.append(
+                f"{stage:32} {s['count']:>7} {s['p50_ms']:>10.3f} "
+                f"{s['p99_ms']:>10.3f} {s['max_ms']:>10.3f}"
+            )
+        return lines
+
+    def export_json(self, path):
+        """
+        Exporta o resumo em JSON
+
+        Args:
+            path (str | Path): Arquivo de destino
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        with open(path, 'w') as f:
+            json.dump({'timestamp': time.time(), 'stages': self.summary()}, f, indent=2)
+
+    def reset(self):
+        """Descarta todas as medições"""
+        with self._lock:
+            self.stages = {}
+
+
+# Coletor compartilhado por todos os componentes do bot
+tracker = LatencyTracker()
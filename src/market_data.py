@@ -6,8 +6,10 @@ Módulo para buscar dados do mercado spot da Binance
 import os
 import sys
 from pathlib import Path
-from binance.client import Client
+from binance_client import LazyClient
 from dotenv import load_dotenv
+from latency import tracker
+from metrics import update_rest_weight
 
 # Carrega configurações
 root_dir = Path(__file__).parent.parent
@@ -17,15 +19,17 @@ load_dotenv(config_path)
 class MarketData:
     """Classe para gerenciar dados do mercado"""
     
-    def __init__(self):
-        """Inicializa conexão com Binance"""
-        api_key = os.getenv('BINANCE_API_KEY')
-        api_secret = os.getenv('BINANCE_API_SECRET')
-        
-        if not api_key or not api_secret:
-            raise ValueError("Chaves da Binance não encontradas")
+    def __init__(self, client=None):
+        """
+        Inicializa conexão com Binance
         
-        self.client = Client(api_key, api_secret)
+        Args:
+            client (Client): Cliente já construído (ex: replay). Se None, usa as chaves do config
+                (criado no primeiro uso)
+        """
+        self.client = client if client is not None else LazyClient()
+        # {símbolo: entrada do exchange info com os filtros} da última busca de pares
+        self.symbol_infos = {}
     
     def get_spot_symbols(self):
         """
@@ -36,10 +40,13 @@ class MarketData:
         """
         try:
             # Busca informações de todos os pares
-            exchange_info = self.client.get_exchange_info()
+            with tracker.span('market.get_exchange_info'):
+                exchange_info = self.client.get_exchange_info()
+            update_rest_weight(self.client)
             
             # Filtra apenas pares SPOT que estão em negociação
             spot_symbols = []
+            symbol_infos = {}
             
             for symbol_info in exchange_info['symbols']:
                 # Verifica se é SPOT e está ativo
@@ -52,7 +59,9 @@ class MarketData:
                         'quote': symbol_info['quoteAsset'],    # Ex: USDT
                         'active': True
                     })
+                    symbol_infos[symbol_info['symbol']] = symbol_info
             
+            self.symbol_infos = symbol_infos
             return spot_symbols
             
         except Exception as e:
@@ -71,7 +80,9 @@ class MarketData:
         """
         try:
             # Busca todos os preços
-            all_prices = self.client.get_all_tickers()
+            with tracker.span('market.get_all_tickers'):
+                all_prices = self.client.get_all_tickers()
+            update_rest_weight(self.client)
             
             # Converte para dicionário
             prices = {item['symbol']: float(item['price']) for item in all_prices}
@@ -85,6 +96,49 @@ class MarketData:
         except Exception as e:
             print(f"Erro ao buscar preços: {str(e)}")
             return {}
+    
+    def get_book_tickers(self, symbols=None):
+        """
+        Busca melhor bid/ask do livro de ofertas
+        
+        Args:
+            symbols (list): Lista de símbolos. Se None, busca todos
+            
+        Returns:
+            dict: Dicionário {símbolo: {'bid', 'bid_qty', 'ask', 'ask_qty'}}
+        """
+        try:
+            with tracker.span('market.get_orderbook_tickers'):
+                all_books = self.client.get_orderbook_tickers()
+            update_rest_weight(self.client)
+            
+            books = {
+                item['symbol']: {
+                    'bid': float(item['bidPrice']),
+                    'bid_qty': float(item['bidQty']),
+                    'ask': float(item['askPrice']),
+                    'ask_qty': float(item['askQty'])
+                }
+                for item in all_books
+            }
+            
+            if symbols:
+                books = {s: books[s] for s in symbols if s in books}
+            
+            return books
+            
+        except Exception as e:
+            print(f"Erro ao buscar livro de ofertas: {str(e)}")
+            return {}
+    
+    def get_price_timestamps(self):
+        """
+        Horário de observação dos preços da última chamada a get_prices
+        
+        Returns:
+            dict: {símbolo: epoch}; vazio quando todos foram observados agora (REST)
+        """
+        return {}
 
 
 if __name__ == "__main__":
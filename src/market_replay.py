@@ -0,0 +1,459 @@
+#!/usr/bin/env python3
+"""
+Gravação e replay offline do mercado para backtest determinístico
+"""
+
+import argparse
+import gzip
+import json
+import sys
+import time
+from pathlib import Path
+
+from market_data import MarketData
+from arbitrage_analyzer import ArbitrageAnalyzer
+from order_executor import OrderExecutor
+
+root_dir = Path(__file__).parent.parent
+
+FORMAT_VERSION = 1
+
+# Filtros necessários para formatar ordens no replay
+KEPT_FILTERS = ('LOT_SIZE', 'PRICE_FILTER', 'MIN_NOTIONAL', 'NOTIONAL')
+
+
+class ReplayOrderError(Exception):
+    """Ordem rejeitada pela exchange simulada"""
+
+
+class MarketRecorder:
+    """Grava exchange info e snapshots de preço/bookTicker em arquivo compacto"""
+
+    def __init__(self, market, path):
+        """
+        Inicializa o gravador
+
+        Args:
+            market (MarketData): Fonte dos dados (normalmente a Binance)
+            path (str | Path): Arquivo de saída (.jsonl.gz)
+        """
+        self.market = market
+        self.path = Path(path)
+
+    def _exchange_info(self):
+        exchange_info = self.market.client.get_exchange_info()
+
+        symbols = []
+        for info in exchange_info['symbols']:
+            symbols.append({
+                'symbol': info['symbol'],
+                'status': info['status'],
+                'baseAsset': info['baseAsset'],
+                'quoteAsset': info['quoteAsset'],
+                'isSpotTradingAllowed': info.get('isSpotTradingAllowed', False),
+                'filters': [f for f in info.get('filters', []) if f['filterType'] in KEPT_FILTERS]
+            })
+
+        return symbols
+
+    def record(self, frames=60, interval=1.0):
+        """
+        Grava snapshots do mercado
+
+        Args:
+            frames (int): Quantidade de snapshots
+            interval (float): Intervalo entre snapshots em segundos
+
+        Returns:
+            int: Snapshots gravados
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        written = 0
+
+        with gzip.open(self.path, 'wt', encoding='utf-8') as f:
+            header = {'type': 'header', 'version': FORMAT_VERSION, 'symbols': self._exchange_info()}
+            f.write(json.dumps(header, separators=(',', ':')) + '\n')
+
+            order = None
+
+            for i in range(frames):
+                t = time.time()
+                prices = self.market.get_prices()
+                books = self.market.get_book_tickers()
+
+                # A ordem dos símbolos só é regravada quando muda
+                symbols = sorted(prices)
+                if symbols != order:
+                    order = symbols
+                    f.write(json.dumps({'type': 'order', 'symbols': order}, separators=(',', ':')) + '\n')
+
+                frame = {
+                    'type': 'frame',
+                    't': round(t, 3),
+                    'p': [prices[s] for s in order],
+                    'b': [books[s]['bid'] if s in books else 0 for s in order],
+                    'a': [books[s]['ask'] if s in books else 0 for s in order]
+                }
+                f.write(json.dumps(frame, separators=(',', ':')) + '\n')
+                written += 1
+
+                if i < frames - 1:
+                    time.sleep(max(0, interval - (time.time() - t)))
+
+        return written
+
+
+def load_recording(path):
+    """
+    Carrega um arquivo gravado
+
+    Args:
+        path (str | Path): Arquivo .jsonl.gz
+
+    Returns:
+        tuple: (símbolos do exchange info, lista de frames)
+    """
+    symbols = []
+    frames = []
+    order = []
+
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            item = json.loads(line)
+            kind = item['type']
+
+            if kind == 'header':
+                if item['version'] != FORMAT_VERSION:
+                    raise ValueError(f"Versão de gravação não suportada: {item['version']}")
+                symbols = item['symbols']
+            elif kind == 'order':
+                order = item['symbols']
+            elif kind == 'frame':
+                frames.append({
+                    't': item['t'],
+                    'prices': dict(zip(order, item['p'])),
+                    'bids': dict(zip(order, item['b'])),
+                    'asks': dict(zip(order, item['a']))
+                })
+
+    return symbols, frames
+
+
+class ReplayClient:
+    """
+    Exchange simulada com a mesma interface usada do binance.client.Client
+
+    Os preços avançam um frame por chamada de step(). Ordens de mercado
+    são preenchidas no bid/ask gravado, com comissão no ativo recebido.
+    """
+
+    def __init__(self, path, fee_percent=0.1, initial_balances=None):
+        """
+        Inicializa a exchange simulada
+
+        Args:
+            path (str | Path): Arquivo gravado pelo MarketRecorder
+            fee_percent (float): Comissão por ordem em %
+            initial_balances (dict): Saldos iniciais {ativo: quantidade}
+        """
+        self.symbols, self.frames = load_recording(path)
+        if not self.frames:
+            raise ValueError("Gravação sem frames")
+
+        self.symbol_info = {s['symbol']: s for s in self.symbols}
+        self.fee_percent = fee_percent
+        self.balances = dict(initial_balances or {})
+        self.index = 0
+        self.order_id = 0
+        self.fills = []
+        self.response = None
+
+    @property
+    def frame(self):
+        return self.frames[self.index]
+
+    def step(self):
+        """
+        Avança para o próximo frame
+
+        Returns:
+            bool: False quando a gravação terminou
+        """
+        if self.index + 1 >= len(self.frames):
+            return False
+        self.index += 1
+        return True
+
+    def ping(self):
+        return {}
+
+    def get_exchange_info(self):
+        return {'symbols': self.symbols}
+
+    def get_symbol_info(self, symbol):
+        return self.symbol_info.get(symbol)
+
+    def get_all_tickers(self):
+        return [{'symbol': s, 'price': str(p)} for s, p in self.frame['prices'].items()]
+
+    def get_orderbook_tickers(self, **params):
+        frame = self.frame
+        return [
+            {
+                'symbol': s,
+                'bidPrice': str(frame['bids'].get(s) or p),
+                'bidQty': '0',
+                'askPrice': str(frame['asks'].get(s) or p),
+                'askQty': '0'
+            }
+            for s, p in frame['prices'].items()
+        ]
+
+    def get_symbol_ticker(self, symbol):
+        return {'symbol': symbol, 'price': str(self.frame['prices'][symbol])}
+
+    def create_order(self, symbol, side, type, quantity=None, quoteOrderQty=None, **params):
+        """Preenche uma ordem a mercado (ou LIMIT IOC/FOK) no livro do frame atual"""
+        info = self.symbol_info.get(symbol)
+        limit_ok = type == 'LIMIT' and params.get('timeInForce') in ('IOC', 'FOK')
+        if info is None or not (type == 'MARKET' or limit_ok):
+            raise ReplayOrderError(f"Ordem não suportada: {type} {symbol}")
+
+        frame = self.frame
+        last = frame['prices'][symbol]
+        base, quote = info['baseAsset'], info['quoteAsset']
+
+        if type == 'LIMIT':
+            # Livro além do limite: a ordem expira sem execução
+            limit = float(params['price'])
+            book = (frame['asks'].get(symbol) or last) if side == 'BUY' else (frame['bids'].get(symbol) or last)
+            if (side == 'BUY' and book > limit) or (side == 'SELL' and book < limit):
+                self.order_id += 1
+                return {
+                    'symbol': symbol,
+                    'orderId': self.order_id,
+                    'status': 'EXPIRED',
+                    'side': side,
+                    'type': type,
+                    'origQty': str(quantity),
+                    'executedQty': '0',
+                    'cummulativeQuoteQty': '0',
+                    'fills': []
+                }
+
+        if side == 'BUY':
+            price = frame['asks'].get(symbol) or last
+            # quoteOrderQty: gasta exatamente esse valor em moeda de cotação
+            quantity = float(quantity) if quantity is not None else float(quoteOrderQty) / price
+            quote_qty = quantity * price
+            commission = quantity * self.fee_percent / 100
+            self._move(quote, -quote_qty)
+            self._move(base, quantity - commission)
+            commission_asset = base
+        else:
+            price = frame['bids'].get(symbol) or last
+            quantity = float(quantity)
+            quote_qty = quantity * price
+            commission = quote_qty * self.fee_percent / 100
+            self._move(base, -quantity)
+            self._move(quote, quote_qty - commission)
+            commission_asset = quote
+
+        self.order_id += 1
+        fill = {
+            'price': str(price),
+            'qty': str(quantity),
+            'commission': str(commission),
+            'commissionAsset': commission_asset
+        }
+        self.fills.append({'symbol': symbol, 'side': side, **fill})
+
+        return {
+            'symbol': symbol,
+            'orderId': self.order_id,
+            'status': 'FILLED',
+            'side': side,
+            'type': type,
+            'executedQty': str(quantity),
+            'cummulativeQuoteQty': str(quote_qty),
+            'fills': [fill]
+        }
+
+    def _move(self, asset, amount):
+        self.balances[asset] = self.balances.get(asset, 0) + amount
+
+    def value_in(self, asset, balances=None):
+        """
+        Valoriza saldos em um ativo usando os preços do frame atual
+
+        Args:
+            asset (str): Ativo de referência (ex: USDT)
+            balances (dict): Saldos a valorizar (padrão: saldos atuais)
+
+        Returns:
+            float: Valor total em `asset`
+        """
+        prices = self.frame['prices']
+        total = 0.0
+
+        for coin, amount in (balances or self.balances).items():
+            if coin == asset:
+                total += amount
+            elif prices.get(coin + asset):
+                total += amount * prices[coin + asset]
+            elif prices.get(asset + coin):
+                total += amount / prices[asset + coin]
+
+        return total
+
+
+class ReplayMarketData(MarketData):
+    """MarketData alimentado por uma gravação, sem acesso à rede"""
+
+    def __init__(self, path, fee_percent=0.1, initial_balances=None):
+        super().__init__(client=ReplayClient(path, fee_percent, initial_balances))
+
+    def step(self):
+        return self.client.step()
+
+
+class Backtester:
+    """Executa analisador e executor sobre uma gravação"""
+
+    def __init__(self, path, base_currency='USDT', fee_percent=0.1,
+                 min_profit_percent=0.5, trade_amount=100, log_file=None):
+        """
+        Inicializa o backtest
+
+        Args:
+            path (str | Path): Arquivo gravado pelo MarketRecorder
+            base_currency (str): Moeda base
+            fee_percent (float): Taxa por operação em %
+            min_profit_percent (float): Lucro mínimo em % para executar
+            trade_amount (float): Valor por trade
+            log_file (str | Path): Log das ordens (padrão: logs/backtest_trades.log)
+        """
+        self.base_currency = base_currency
+        self.min_profit_percent = min_profit_percent
+        self.trade_amount = trade_amount
+
+        self.market = ReplayMarketData(path, fee_percent, {base_currency: trade_amount})
+        self.client = self.market.client
+        self.analyzer = ArbitrageAnalyzer(base_currency, fee_percent, market=self.market)
+
+        # Ordens "reais" contra a exchange simulada, para exercitar o caminho completo
+        self.executor = OrderExecutor(
+            simulation_mode=False,
+            client=self.client,
+            log_file=log_file or root_dir / 'logs' / 'backtest_trades.log'
+        )
+
+    def run(self, speed=None):
+        """
+        Executa o backtest
+
+        Args:
+            speed (float): Aceleração em relação ao tempo gravado (None = sem espera)
+
+        Returns:
+            dict: Relatório com oportunidades, fills e PnL
+        """
+        initial_balances = dict(self.client.balances)
+        report = {
+            'frames': 0,
+            'opportunities': 0,
+            'trades': 0,
+            'trades_successful': 0,
+            'fills': 0,
+            'expected_profit': 0.0,
+            'pnl': 0.0
+        }
+
+        while True:
+            report['frames'] += 1
+
+            profitable = self.analyzer.find_profitable_opportunities(
+                min_amount=self.trade_amount,
+                min_profit=self.trade_amount * self.min_profit_percent / 100,
+                top=1
+            )
+            report['opportunities'] += self.analyzer.last_scan['profitable']
+
+            if profitable:
+                best = profitable[0]
+                report['expected_profit'] += best.profit
+
+                fills_before = len(self.client.fills)
+                result = self.executor.execute_arbitrage(best, self.trade_amount)
+                report['trades'] += 1
+                report['fills'] += len(self.client.fills) - fills_before
+                if result.success:
+                    report['trades_successful'] += 1
+
+            current_t = self.client.frame['t']
+            if not self.market.step():
+                break
+
+            if speed:
+                time.sleep(max(0, (self.client.frame['t'] - current_t) / speed))
+
+        # PnL realizado: variação de todos os saldos, valorizada no último frame
+        delta = {
+            asset: self.client.balances.get(asset, 0) - initial_balances.get(asset, 0)
+            for asset in set(self.client.balances) | set(initial_balances)
+        }
+        report['pnl'] = self.client.value_in(self.base_currency, delta)
+
+        return report
+
+
+def print_report(report, base_currency='USDT'):
+    """Imprime o relatório do backtest"""
+    print("\n" + "="*70)
+    print("RESULTADO DO BACKTEST")
+    print("="*70)
+    print(f"Frames processados: {report['frames']}")
+    print(f"Oportunidades detectadas: {report['opportunities']}")
+    print(f"Trades executados: {report['trades']} ({report['trades_successful']} completos)")
+    print(f"Fills simulados: {report['fills']}")
+    print(f"Lucro esperado (scan): {report['expected_profit']:.4f} {base_currency}")
+    print(f"PnL realizado: {report['pnl']:.4f} {base_currency}")
+    print("="*70 + "\n")
+
+
+if __name__ == "__main__":
+    """Grava ou reproduz o mercado"""
+
+    parser = argparse.ArgumentParser(description="Gravação e replay do mercado")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    rec = sub.add_parser('record', help="Grava o mercado da Binance")
+    rec.add_argument('path')
+    rec.add_argument('--frames', type=int, default=60)
+    rec.add_argument('--interval', type=float, default=1.0)
+
+    rep = sub.add_parser('replay', help="Executa o backtest sobre uma gravação")
+    rep.add_argument('path')
+    rep.add_argument('--base', default='USDT')
+    rep.add_argument('--fee', type=float, default=0.1)
+    rep.add_argument('--min-profit', type=float, default=0.5)
+    rep.add_argument('--amount', type=float, default=100)
+    rep.add_argument('--speed', type=float, default=None,
+                     help="Aceleração em relação ao tempo gravado (padrão: sem espera)")
+
+    args = parser.parse_args()
+
+    try:
+        if args.command == 'record':
+            recorder = MarketRecorder(MarketData(), args.path)
+            count = recorder.record(frames=args.frames, interval=args.interval)
+            print(f"✅ {count} snapshots gravados em {args.path}")
+        else:
+            backtester = Backtester(args.path, args.base, args.fee, args.min_profit, args.amount)
+            print_report(backtester.run(speed=args.speed), args.base)
+
+    except Exception as e:
+        print(f"\n❌ ERRO: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Módulo de métricas do bot no formato texto do Prometheus
+"""
+
+import threading
+from functools import wraps
+
+from latency import tracker
+
+
+class Counter:
+    """Contador monotônico"""
+
+    kind = 'counter'
+
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help = help_text
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        """Incrementa o contador"""
+        with self._lock:
+            self.value += amount
+
+    def samples(self):
+        return [(self.name, {}, self.value)]
+
+
+class Gauge:
+    """Valor instantâneo que pode subir e descer"""
+
+    kind = 'gauge'
+
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help = help_text
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def set(self, value):
+        """Define o valor atual"""
+        self.value = value
+
+    def inc(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount=1):
+        with self._lock:
+            self.value -= amount
+
+    def track_inprogress(self):
+        """Decorator que conta as chamadas em andamento"""
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                self.inc()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.dec()
+            return wrapper
+        return decorator
+
+    def samples(self):
+        return [(self.name, {}, self.value)]
+
+
+class Histogram:
+    """Histograma cumulativo com buckets fixos"""
+
+    kind = 'histogram'
+
+    DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self, name, help_text, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        """Registra uma observação"""
+        with self._lock:
+            self.count += 1
+            self.sum += value
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    self.counts[i] += 1
+                    break
+
+    def samples(self):
+        with self._lock:
+            counts = list(self.counts)
+            count = self.count
+            total = self.sum
+
+        result = []
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets, counts):
+            cumulative += bucket_count
+            result.append((f"{self.name}_bucket", {'le': repr(float(bound))}, cumulative))
+        result.append((f"{self.name}_bucket", {'le': '+Inf'}, count))
+        result.append((f"{self.name}_sum", {}, total))
+        result.append((f"{self.name}_count", {}, count))
+        return result
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    inner = ','.join(f'{key}="{value}"' for key, value in labels.items())
+    return '{' + inner + '}'
+
+
+class MetricsRegistry:
+    """Registro central das métricas expostas"""
+
+    def __init__(self, latency_tracker=None):
+        """
+        Inicializa o registro
+
+        Args:
+            latency_tracker (LatencyTracker): Latências por etapa a exportar (opcional)
+        """
+        self.metrics = {}
+        self.latency_tracker = latency_tracker
+
+    def _register(self, metric):
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, help_text):
+        return self._register(Counter(name, help_text))
+
+    def gauge(self, name, help_text):
+        return self._register(Gauge(name, help_text))
+
+    def histogram(self, name, help_text, buckets=Histogram.DEFAULT_BUCKETS):
+        return self._register(Histogram(name, help_text, buckets))
+
+    def render(self):
+        """
+        Gera o texto no formato de exposição do Prometheus
+
+        Returns:
+            str: Métricas prontas para o endpoint /metrics
+        """
+        lines = []
+
+        for metric in list(self.metrics.values()):
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{_format_labels(labels)} {value}")
+
+        if self.latency_tracker is not None:
+            summary = self.latency_tracker.summary()
+            if summary:
+                name = 'arb_stage_latency_seconds'
+                lines.append(f"# HELP {name} Latência por etapa do pipeline")
+                lines.append(f"# TYPE {name} summary")
+                for stage in sorted(summary):
+                    s = summary[stage]
+                    for quantile, key in (('0.5', 'p50_ms'), ('0.99', 'p99_ms')):
+                        labels = _format_labels({'stage': stage, 'quantile': quantile})
+                        lines.append(f"{name}{labels} {s[key] / 1000}")
+                    labels = _format_labels({'stage': stage})
+                    lines.append(f"{name}_sum{labels} {s['total_ms'] / 1000}")
+                    lines.append(f"{name}_count{labels} {s['count']}")
+
+        return '\n'.join(lines) + '\n'
+
+
+class MetricsServer:
+    """Servidor HTTP em thread de fundo que expõe /metrics"""
+
+    def __init__(self, registry, host='127.0.0.1', port=9108):
+        """
+        Inicializa o servidor
+
+        Args:
+            registry (MetricsRegistry): Métricas a expor
+            host (str): Endereço de escuta
+            port (int): Porta de escuta (0 = porta livre qualquer)
+        """
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self.server = None
+        self.thread = None
+
+    def start(self):
+        """Inicia o servidor sem bloquear o loop de trading"""
+        # http.server só entra quando o endpoint está ligado (METRICS_PORT)
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        registry = self.registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = registry.render().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                # Silencia o log de acesso para não poluir a saída do bot
+                pass
+
+        self.server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self.port
+
+    def stop(self):
+        """Para o servidor"""
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+
+def update_rest_weight(client):
+    """
+    Atualiza o peso de REST usado a partir do último response do cliente
+
+    Args:
+        client (Client): Cliente da Binance
+    """
+    response = getattr(client, 'response', None)
+    if response is None:
+        return
+
+    used = response.headers.get('x-mbx-used-weight-1m')
+    if used is not None:
+        REST_WEIGHT_USED.set(int(used))
+
+
+# Registro compartilhado e métricas padrão do bot
+registry = MetricsRegistry(latency_tracker=tracker)
+
+CYCLES = registry.counter('arb_cycles_total', 'Ciclos executados pelo bot')
+SCANS = registry.counter('arb_scans_total', 'Varreduras completas de triângulos')
+SCANS_PER_SECOND = registry.gauge('arb_scans_per_second', 'Vazão da última varredura (1 / duração)')
+TRIANGLES_EVALUATED = registry.counter('arb_triangles_evaluated_total', 'Triângulos avaliados')
+OPPORTUNITIES = registry.counter('arb_opportunities_total', 'Oportunidades acima do lucro mínimo')
+ORDERS_SENT = registry.counter('arb_orders_sent_total', 'Ordens enviadas (simuladas ou reais)')
+ORDER_ERRORS = registry.counter('arb_order_errors_total', 'Ordens com erro')
+IOC_NO_FILLS = registry.counter('arb_ioc_no_fills_total', 'Ordens LIMIT IOC que expiraram sem execução')
+ORDER_TRANSPORT_FALLBACKS = registry.counter('arb_order_transport_fallbacks_total', 'Ordens enviadas por REST porque a WebSocket API estava indisponível')
+UNWINDS = registry.counter('arb_unwinds_total', 'Posições intermediárias convertidas de volta à moeda base')
+UNWIND_LOSS = registry.counter('arb_unwind_loss_total', 'Perda realizada (moeda base) em triângulos desfeitos')
+COOLDOWN_SKIPS = registry.counter('arb_cooldown_skips_total', 'Oportunidades ignoradas por cooldown (mesmos preços ou prejuízo recente)')
+LAST_LOOK_REJECTS = registry.counter('arb_last_look_rejects_total', 'Triângulos recusados na reavaliação antes da execução')
+SCHEDULED_TRADES = registry.counter('arb_scheduled_trades_total', 'Triângulos selecionados pelo agendador de execução')
+SCHEDULER_CONFLICTS = registry.counter('arb_scheduler_conflicts_total', 'Execuções descartadas por moeda em uso ou orçamento esgotado')
+FILL_LATENCY = registry.histogram('arb_fill_latency_seconds', 'Latência de execução de cada perna')
+REST_DEFERRED = registry.counter('arb_rest_deferred_total', 'Chamadas de REST adiadas pelo governador de peso')
+REST_WEIGHT_USED = registry.gauge('arb_rest_weight_used', 'Peso de REST usado no último minuto (X-MBX-USED-WEIGHT-1M)')
+STALE_SYMBOLS = registry.gauge('arb_stale_symbols', 'Pares com preço mais velho que MAX_PRICE_AGE_SECONDS')
+DB_QUEUE_DEPTH = registry.gauge('arb_db_queue_depth', 'Escritas no banco pendentes')
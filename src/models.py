@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Tipos de dados do bot: triângulos, oportunidades e resultados de ordens
+
+Classes com __slots__ (sem __dict__ por instância), usadas do analisador
+ao banco de dados sem reempacotar em dicionários.
+"""
+
+from dataclasses import dataclass, field
+
+
+@dataclass(slots=True, frozen=True)
+class Triangle:
+    """Caminho base → A → B → base e os três pares usados"""
+
+    path: tuple
+    pairs: tuple
+
+    @property
+    def route(self):
+        """Caminho para exibição (ex: USDT → BTC → ETH → USDT)"""
+        return ' → '.join(self.path)
+
+    @property
+    def operations(self):
+        """Descrição de cada perna"""
+        base, coin_a, coin_b, _ = self.path
+        return (
+            f"Comprar {coin_a} com {base}",
+            f"Trocar {coin_a} por {coin_b}",
+            f"Vender {coin_b} por {base}"
+        )
+
+
+@dataclass(slots=True)
+class Opportunity:
+    """Resultado da simulação de um triângulo com taxas"""
+
+    triangle: Triangle
+    initial: float
+    final: float
+    profit: float
+    profit_percent: float
+    total_fees: float
+    prices: tuple
+    price_age: float = 0.0
+    stale: bool = False
+    # Valor em moeda base que o topo do livro comporta (None = desconhecido)
+    capacity: float = None
+    # Ask/bid/bid do livro no last look, base dos limites do modo ioc (None = usa prices)
+    book_prices: tuple = None
+
+
+@dataclass(slots=True)
+class Leg:
+    """Resultado de uma ordem (uma perna do triângulo)"""
+
+    symbol: str
+    side: str
+    success: bool = False
+    quantity_sent: float = 0.0
+    quantity_received: float = 0.0
+    price: float = 0.0
+    order_id: object = None
+    error: str = None
+    # Status da exchange (ex: FILLED, EXPIRED) e quanto do ativo gasto sobrou
+    status: str = None
+    leftover: float = 0.0
+    # Quanto do ativo gasto a exchange de fato debitou (0 = desconhecido, ex: simulação)
+    spent: float = 0.0
+    # Comissões pagas nos fills {ativo: quantidade}; quantity_received já é líquida
+    fees: dict = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class Unwind:
+    """Conversão de volta à moeda base do que ficou preso no meio do triângulo"""
+
+    asset: str
+    quantity: float
+    target: str
+    route: tuple = ()
+    expected: float = 0.0
+    recovered: float = 0.0
+    success: bool = False
+    orders: list = field(default_factory=list)
+    # Posições que não puderam ser convertidas: [(ativo, quantidade)]
+    remaining: list = field(default_factory=list)
+    error: str = None
+
+
+@dataclass(slots=True)
+class OrderResult:
+    """Resultado da execução de uma arbitragem completa"""
+
+    mode: str
+    path: tuple
+    pairs: tuple
+    initial_amount: float
+    success: bool = False
+    final_amount: float = 0.0
+    profit: float = 0.0
+    profit_percent: float = 0.0
+    orders: list = field(default_factory=list)
+    errors: list = field(default_factory=list)
+    unwinds: list = field(default_factory=list)
+
+    @property
+    def simulation_mode(self):
+        return self.mode == 'SIMULAÇÃO'
+
+    @property
+    def route(self):
+        return ' → '.join(self.path)
+
+    @property
+    def fees(self):
+        """Comissões de todas as ordens, inclusive as de desfazimento {ativo: quantidade}"""
+        total = {}
+        legs = list(self.orders)
+        for unwind in self.unwinds:
+            legs.extend(unwind.orders)
+        for leg in legs:
+            for asset, amount in leg.fees.items():
+                total[asset] = total.get(asset, 0.0) + amount
+        return total
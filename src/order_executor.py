@@ -3,42 +3,109 @@
 Módulo para execução de ordens de arbitragem triangular
 """
 
+import math
 import os
 import sys
+import time
 from pathlib import Path
 from datetime import datetime
-from binance.client import Client
-from binance.enums import *
+from binance_client import LazyClient
 from dotenv import load_dotenv
+from latency import tracker
+from models import Leg, OrderResult, Triangle, Opportunity
+from recovery import RecoveryEngine
+import metrics
+
+# Valores de binance.enums usados aqui (importar binance.enums carrega o python-binance inteiro)
+SIDE_BUY = 'BUY'
+SIDE_SELL = 'SELL'
+ORDER_TYPE_MARKET = 'MARKET'
+ORDER_TYPE_LIMIT = 'LIMIT'
+TIME_IN_FORCE_IOC = 'IOC'
+ORDER_RESP_TYPE_FULL = 'FULL'
 
 # Carrega configurações
 root_dir = Path(__file__).parent.parent
 config_path = root_dir / 'config' / 'config.env'
 load_dotenv(config_path)
 
+
+def fill_summary(order):
+    """
+    Agrega os fills de uma resposta FULL
+    
+    Respostas sem fills (ACK/RESULT) usam executedQty e cummulativeQuoteQty,
+    sem comissões.
+    
+    Args:
+        order (dict): Resposta da ordem
+        
+    Returns:
+        tuple: (quantidade executada, valor em cotação, preço médio, {ativo: comissão})
+    """
+    executed_qty = float(order.get('executedQty', 0))
+    quote_qty = float(order.get('cummulativeQuoteQty', 0))
+    fills = order.get('fills') or []
+    
+    commissions = {}
+    fill_qty = fill_quote = 0.0
+    for fill in fills:
+        qty = float(fill['qty'])
+        fill_qty += qty
+        fill_quote += qty * float(fill['price'])
+        commission = float(fill.get('commission', 0))
+        if commission:
+            asset = fill['commissionAsset']
+            commissions[asset] = commissions.get(asset, 0.0) + commission
+    
+    # executedQty/cummulativeQuoteQty valem mais; os fills cobrem respostas sem eles
+    if not executed_qty and fill_qty:
+        executed_qty, quote_qty = fill_qty, fill_quote
+    price = quote_qty / executed_qty if executed_qty else 0.0
+    
+    return executed_qty, quote_qty, price, commissions
+
+
 class OrderExecutor:
     """Executor de ordens de arbitragem"""
     
-    def __init__(self, simulation_mode=True):
+    def __init__(self, simulation_mode=True, client=None, log_file=None, balance_cache=None,
+                 auto_unwind=True, order_transport=None, order_type='market', limit_tolerance_percent=0.05):
         """
         Inicializa o executor
         
         Args:
             simulation_mode (bool): Se True, não executa ordens reais
+            client (Client): Cliente já construído (ex: replay). Se None, usa as chaves do config
+                (criado no primeiro uso)
+            log_file (str | Path): Arquivo de log das operações (padrão: logs/trades.log)
+            balance_cache (BalanceCache): Saldos do user data stream (None = sem pré-checagem)
+            auto_unwind (bool): Converte de volta à moeda base o que ficar preso
+                quando uma perna falha ou executa em parte
+            order_transport (WebSocketAPIClient): Envia as ordens pela WebSocket API
+                (None = create_order por REST)
+            order_type (str): 'market' ou 'ioc' (LIMIT IOC com preço máximo por perna)
+            limit_tolerance_percent (float): Folga em % sobre o preço avaliado no modo ioc
         """
+        if order_type not in ('market', 'ioc'):
+            raise ValueError(f"Tipo de ordem desconhecido: {order_type} (use market ou ioc)")
+        
         self.simulation_mode = simulation_mode
+        self.order_type = order_type
+        self.limit_tolerance_percent = limit_tolerance_percent
+        self.balance_cache = balance_cache
+        self.order_transport = order_transport
         
-        api_key = os.getenv('BINANCE_API_KEY')
-        api_secret = os.getenv('BINANCE_API_SECRET')
+        self.client = client if client is not None else LazyClient()
         
-        if not api_key or not api_secret:
-            raise ValueError("Chaves da Binance não encontradas")
+        self.recovery = RecoveryEngine(self) if auto_unwind else None
         
-        self.client = Client(api_key, api_secret)
+        # Filtros dos pares mudam raramente; evita peso 20 de REST por perna
+        self.symbol_info_cache = {}
         
         # Log de operações
-        self.log_file = root_dir / 'logs' / 'trades.log'
-        self.log_file.parent.mkdir(exist_ok=True)
+        self.log_file = Path(log_file) if log_file else root_dir / 'logs' / 'trades.log'
+        self.log_file.parent.mkdir(parents=True, exist_ok=True)
     
     def log(self, message):
         """Registra mensagem com timestamp"""
@@ -53,7 +120,7 @@ class OrderExecutor:
     
     def get_symbol_info(self, symbol):
         """
-        Busca informações de um par
+        Busca informações de um par (com cache local)
         
         Args:
             symbol (str): Símbolo do par (ex: BTCUSDT)
@@ -61,8 +128,14 @@ class OrderExecutor:
         Returns:
             dict: Informações do símbolo
         """
+        if symbol in self.symbol_info_cache:
+            return self.symbol_info_cache[symbol]
+        
         try:
-            info = self.client.get_symbol_info(symbol)
+            with tracker.span('executor.get_symbol_info'):
+                info = self.client.get_symbol_info(symbol)
+            if info:
+                self.symbol_info_cache[symbol] = info
             return info
         except Exception as e:
             self.log(f"Erro ao buscar info de {symbol}: {str(e)}")
@@ -105,51 +178,138 @@ class OrderExecutor:
                 elif step_size >= 0.000001:
                     precision = 6
                 
-                # Arredonda
-                return round(quantity, precision)
+                # Arredonda para baixo: nunca envia mais do que há em saldo
+                factor = 10 ** precision
+                return math.floor(quantity * factor + 1e-9) / factor
         
         return quantity
     
+    def format_price(self, symbol, price, side):
+        """
+        Arredonda o preço limite para o tickSize do par
+        
+        Compra arredonda para baixo e venda para cima, para o limite nunca
+        ficar mais frouxo que o calculado.
+        
+        Args:
+            symbol (str): Símbolo do par
+            price (float): Preço limite
+            side (str): SIDE_BUY ou SIDE_SELL
+            
+        Returns:
+            float: Preço no tick do par
+        """
+        info = self.get_symbol_info(symbol) or {}
+        for filter in info.get('filters', []):
+            if filter['filterType'] == 'PRICE_FILTER' and float(filter['tickSize']) > 0:
+                tick_text = filter['tickSize'].rstrip('0')
+                decimals = len(tick_text.split('.')[1]) if '.' in tick_text else 0
+                tick = float(filter['tickSize'])
+                
+                ticks = price / tick
+                ticks = math.floor(ticks + 1e-9) if side == SIDE_BUY else math.ceil(ticks - 1e-9)
+                return round(ticks * tick, decimals)
+        
+        return price
+    
+    def price_caps(self, opportunity):
+        """
+        Preço limite de cada perna a partir dos preços avaliados
+        
+        Args:
+            opportunity (Opportunity): Oportunidade com os preços usados na avaliação
+                (os do livro no last look, quando houver)
+            
+        Returns:
+            tuple: Limite por perna (None = ordem a mercado)
+        """
+        prices = opportunity.book_prices or opportunity.prices
+        if self.order_type != 'ioc' or len(prices) != 3:
+            return (None, None, None)
+        
+        tolerance = self.limit_tolerance_percent / 100
+        buy, sell_a, sell_b = prices
+        return (buy * (1 + tolerance), sell_a * (1 - tolerance), sell_b * (1 - tolerance))
+    
+    def format_quote(self, symbol, amount):
+        """
+        Arredonda para baixo um valor em moeda de cotação (quoteOrderQty)
+        
+        Args:
+            symbol (str): Símbolo do par
+            amount (float): Valor a gastar
+            
+        Returns:
+            float: Valor com a precisão da moeda de cotação
+        """
+        info = self.get_symbol_info(symbol) or {}
+        precision = int(info.get('quoteAssetPrecision', info.get('quotePrecision', 8)))
+        factor = 10 ** precision
+        return math.floor(amount * factor) / factor
+    
+    def available_amount(self, asset, amount):
+        """
+        Limita a quantidade ao saldo livre conhecido pelo cache
+        
+        Args:
+            asset (str): Ativo a gastar
+            amount (float): Quantidade desejada
+            
+        Returns:
+            float: Quantidade que pode ser enviada
+        """
+        if self.balance_cache is None or self.simulation_mode:
+            return amount
+        
+        free = self.balance_cache.free(asset)
+        if free < amount:
+            self.log(f"   Saldo livre de {asset} ({free:.8f}) menor que {amount:.8f}; ajustando")
+            return free
+        return amount
+    
+    @tracker.timed('executor.execute_arbitrage')
     def execute_arbitrage(self, opportunity, amount):
         """
         Executa arbitragem triangular
         
         Args:
-            opportunity (dict): Oportunidade identificada
+            opportunity (Opportunity): Oportunidade identificada
             amount (float): Valor em USDT para investir
             
         Returns:
-            dict: Resultado da execução
+            OrderResult: Resultado da execução
         """
-        triangle = opportunity['triangle']
-        pairs = triangle['pairs']
-        path = triangle['path']
+        triangle = opportunity.triangle
+        pairs = triangle.pairs
+        path = triangle.path
         
         mode = "SIMULAÇÃO" if self.simulation_mode else "REAL"
         
         self.log("\n" + "="*70)
         self.log(f"EXECUTANDO ARBITRAGEM - MODO {mode}")
         self.log("="*70)
-        self.log(f"Caminho: {' → '.join(path)}")
+        self.log(f"Caminho: {triangle.route}")
         self.log(f"Pares: {', '.join(pairs)}")
         self.log(f"Investimento: ${amount:.2f} USDT")
-        self.log(f"Lucro esperado: ${opportunity['profit']:.4f} ({opportunity['profit_percent']:.4f}%)")
-        
-        results = {
-            'success': False,
-            'mode': mode,
-            'path': path,
-            'pairs': pairs,
-            'initial_amount': amount,
-            'final_amount': 0,
-            'profit': 0,
-            'orders': [],
-            'errors': []
-        }
+        self.log(f"Lucro esperado: ${opportunity.profit:.4f} ({opportunity.profit_percent:.4f}%)")
+        
+        results = OrderResult(mode=mode, path=path, pairs=pairs, initial_amount=amount)
+        
+        # Sem saldo para a primeira perna: nem envia (evita rejeição da exchange)
+        if self.available_amount(path[0], amount) < amount:
+            error_msg = f"Saldo insuficiente: {self.balance_cache.free(path[0]):.8f} {path[0]} livre"
+            self.log(f"\n❌ {error_msg}")
+            results.errors.append(error_msg)
+            return results
+        
+        # Modo ioc: cada perna tem preço máximo (compra) ou mínimo (venda)
+        caps = self.price_caps(opportunity)
         
         try:
             current_amount = amount
             current_asset = 'USDT'
+            # Sobras de pernas parciais (ativo gasto, quantidade) a desfazer no fim
+            leftovers = []
             
             # Operação 1: USDT → Moeda A
             self.log(f"\n📍 Operação 1: Comprar {path[1]} com USDT")
@@ -157,15 +317,21 @@ class OrderExecutor:
                 symbol=pairs[0],
                 side=SIDE_BUY,
                 quantity_quote=current_amount,
-                current_asset=current_asset
+                current_asset=current_asset,
+                limit_price=caps[0]
             )
             
-            if not order1['success']:
-                results['errors'].append(f"Operação 1 falhou: {order1.get('error', 'Erro desconhecido')}")
+            if not order1.success:
+                results.errors.append(f"Operação 1 falhou: {order1.error or 'Erro desconhecido'}")
                 return results
             
-            results['orders'].append(order1)
-            current_amount = order1['quantity_received']
+            results.orders.append(order1)
+            if order1.leftover > 0:
+                leftovers.append((current_asset, order1.leftover))
+            # Investido de fato: o que a ordem debitou (a sobra parcial volta no fim)
+            if order1.spent:
+                results.initial_amount = order1.spent + order1.leftover
+            current_amount = order1.quantity_received
             current_asset = path[1]
             self.log(f"✓ Recebido: {current_amount:.8f} {current_asset}")
             
@@ -174,16 +340,20 @@ class OrderExecutor:
             order2 = self._execute_order(
                 symbol=pairs[1],
                 side=SIDE_SELL,
-                quantity_base=current_amount,
-                current_asset=current_asset
+                quantity_base=self.available_amount(current_asset, current_amount),
+                current_asset=current_asset,
+                limit_price=caps[1]
             )
             
-            if not order2['success']:
-                results['errors'].append(f"Operação 2 falhou: {order2.get('error', 'Erro desconhecido')}")
+            if not order2.success:
+                results.errors.append(f"Operação 2 falhou: {order2.error or 'Erro desconhecido'}")
+                self._abort(results, [(current_asset, current_amount)] + leftovers)
                 return results
             
-            results['orders'].append(order2)
-            current_amount = order2['quantity_received']
+            results.orders.append(order2)
+            if order2.leftover > 0:
+                leftovers.append((current_asset, order2.leftover))
+            current_amount = order2.quantity_received
             current_asset = path[2]
             self.log(f"✓ Recebido: {current_amount:.8f} {current_asset}")
             
@@ -192,39 +362,52 @@ class OrderExecutor:
             order3 = self._execute_order(
                 symbol=pairs[2],
                 side=SIDE_SELL,
-                quantity_base=current_amount,
-                current_asset=current_asset
+                quantity_base=self.available_amount(current_asset, current_amount),
+                current_asset=current_asset,
+                limit_price=caps[2]
             )
             
-            if not order3['success']:
-                results['errors'].append(f"Operação 3 falhou: {order3.get('error', 'Erro desconhecido')}")
+            if not order3.success:
+                results.errors.append(f"Operação 3 falhou: {order3.error or 'Erro desconhecido'}")
+                self._abort(results, [(current_asset, current_amount)] + leftovers)
                 return results
             
-            results['orders'].append(order3)
-            current_amount = order3['quantity_received']
+            results.orders.append(order3)
+            if order3.leftover > 0:
+                leftovers.append((current_asset, order3.leftover))
+            current_amount = order3.quantity_received
             self.log(f"✓ Recebido: {current_amount:.8f} USDT")
             
+            # Preenchimentos parciais: converte as sobras e soma ao retorno
+            if leftovers:
+                current_amount += self._unwind(results, leftovers, path[0])
+            
             # Calcula resultado final
-            results['final_amount'] = current_amount
-            results['profit'] = current_amount - amount
-            results['profit_percent'] = (results['profit'] / amount) * 100
-            results['success'] = True
+            invested = results.initial_amount
+            results.final_amount = current_amount
+            results.profit = current_amount - invested
+            results.profit_percent = (results.profit / invested) * 100
+            results.success = True
             
             self.log("\n" + "="*70)
             self.log(f"✅ ARBITRAGEM CONCLUÍDA COM SUCESSO!")
-            self.log(f"Investido: ${amount:.2f} USDT")
+            self.log(f"Investido: ${invested:.2f} USDT")
             self.log(f"Retorno: ${current_amount:.2f} USDT")
-            self.log(f"💰 Lucro: ${results['profit']:.4f} ({results['profit_percent']:.4f}%)")
+            self.log(f"💰 Lucro: ${results.profit:.4f} ({results.profit_percent:.4f}%)")
+            if results.fees:
+                self.log(f"Comissões: {', '.join(f'{q:.8f} {a}' for a, q in results.fees.items())}")
             self.log("="*70)
             
         except Exception as e:
             error_msg = f"Erro na execução: {str(e)}"
             self.log(f"\n❌ {error_msg}")
-            results['errors'].append(error_msg)
+            results.errors.append(error_msg)
         
         return results
     
-    def _execute_order(self, symbol, side, quantity_quote=None, quantity_base=None, current_asset=None):
+    @tracker.timed('executor.order_leg')
+    def _execute_order(self, symbol, side, quantity_quote=None, quantity_base=None, current_asset=None,
+                       spend_all=False, limit_price=None):
         """
         Executa uma ordem individual
         
@@ -234,81 +417,242 @@ class OrderExecutor:
             quantity_quote (float): Quantidade em moeda de cotação (para compra)
             quantity_base (float): Quantidade em moeda base (para venda)
             current_asset (str): Ativo atual
+            spend_all (bool): Compra com quoteOrderQty (gasta exatamente quantity_quote,
+                mesmo que o ask esteja acima do último preço)
+            limit_price (float): Envia LIMIT IOC com esse preço máximo/mínimo
+                (None = ordem a mercado)
             
         Returns:
-            dict: Resultado da ordem
+            Leg: Resultado da ordem
         """
-        result = {
-            'success': False,
-            'symbol': symbol,
-            'side': side,
-            'quantity_sent': 0,
-            'quantity_received': 0,
-            'price': 0,
-            'order_id': None,
-            'error': None
-        }
+        result = Leg(symbol=symbol, side=side)
+        
+        leg_start = time.perf_counter()
         
         try:
-            # Busca preço atual
-            ticker = self.client.get_symbol_ticker(symbol=symbol)
-            price = float(ticker['price'])
-            result['price'] = price
+            if limit_price is not None and not self.simulation_mode:
+                # IOC real: o limite já define o preço, dispensa o ticker por REST
+                price = limit_price
+            else:
+                # Busca preço atual
+                with tracker.span('executor.get_symbol_ticker'):
+                    ticker = self.client.get_symbol_ticker(symbol=symbol)
+                metrics.update_rest_weight(self.client)
+                price = float(ticker['price'])
+            result.price = price
             
             # Calcula quantidade
             if side == SIDE_BUY:
-                # Comprando: usa quantity_quote (quanto vai gastar)
-                quantity = quantity_quote / price
-                result['quantity_sent'] = quantity_quote
+                # Comprando: usa quantity_quote (quanto vai gastar); no IOC, pelo preço máximo
+                quantity = quantity_quote / (limit_price or price)
+                result.quantity_sent = quantity_quote
             else:
                 # Vendendo: usa quantity_base (quanto tem para vender)
                 quantity = quantity_base
-                result['quantity_sent'] = quantity_base
+                result.quantity_sent = quantity_base
             
             # Formata quantidade (arredonda conforme regras)
             quantity_formatted = self.format_quantity(symbol, quantity)
             
-            if self.simulation_mode:
+            if self.simulation_mode and limit_price is not None and (
+                    price > limit_price if side == SIDE_BUY else price < limit_price):
+                # Modo simulação: preço atual fora do limite, IOC não executaria
+                result.status = 'EXPIRED'
+                result.error = f"Sem execução: preço {price:.8f} além do limite {limit_price:.8f}"
+                metrics.IOC_NO_FILLS.inc()
+                self.log(f"   [SIMULAÇÃO] {result.error}")
+                
+            elif self.simulation_mode:
                 # Modo simulação: apenas calcula
                 self.log(f"   [SIMULAÇÃO] {side} {quantity_formatted:.8f} em {symbol} @ ${price:.8f}")
                 
                 if side == SIDE_BUY:
-                    result['quantity_received'] = quantity_formatted
+                    result.quantity_received = quantity_formatted
                 else:
-                    result['quantity_received'] = quantity_formatted * price
+                    result.quantity_received = quantity_formatted * price
                 
-                result['success'] = True
-                result['order_id'] = 'SIM_' + str(int(datetime.now().timestamp()))
+                result.success = True
+                result.order_id = 'SIM_' + str(int(datetime.now().timestamp()))
                 
             else:
-                # Modo real: executa ordem de mercado
-                self.log(f"   [REAL] Executando {side} {quantity_formatted} em {symbol}")
+                # Modo real: ordem de mercado ou LIMIT IOC
+                order_type = ORDER_TYPE_MARKET
+                if limit_price is not None:
+                    order_type = ORDER_TYPE_LIMIT
+                    size = {
+                        'quantity': quantity_formatted,
+                        'price': self.format_price(symbol, limit_price, side),
+                        'timeInForce': TIME_IN_FORCE_IOC
+                    }
+                    self.log(f"   [REAL] Executando {side} {quantity_formatted} em {symbol} (IOC @ {size['price']})")
+                elif spend_all and side == SIDE_BUY:
+                    size = {'quoteOrderQty': self.format_quote(symbol, quantity_quote)}
+                    self.log(f"   [REAL] Executando {side} {symbol} gastando {size['quoteOrderQty']} {current_asset}")
+                else:
+                    size = {'quantity': quantity_formatted}
+                    self.log(f"   [REAL] Executando {side} {quantity_formatted} em {symbol}")
                 
-                order = self.client.create_order(
-                    symbol=symbol,
-                    side=side,
-                    type=ORDER_TYPE_MARKET,
-                    quantity=quantity_formatted
-                )
+                with tracker.span('executor.create_order'):
+                    order = self._place_order(
+                        symbol=symbol,
+                        side=side,
+                        type=order_type,
+                        newOrderRespType=ORDER_RESP_TYPE_FULL,
+                        **size
+                    )
                 
-                result['order_id'] = order['orderId']
-                result['success'] = True
+                result.order_id = order['orderId']
+                result.status = order.get('status')
                 
-                # Calcula quantidade recebida
-                executed_qty = float(order['executedQty'])
+                # Quantidade recebida líquida: desconta a comissão cobrada no ativo recebido
+                # (comissão em BNB não afeta a próxima perna, só fica registrada)
+                executed_qty, cummulative_quote_qty, fill_price, result.fees = fill_summary(order)
+                if fill_price:
+                    result.price = fill_price
+                received_asset = self._received_asset(symbol, side)
                 if side == SIDE_BUY:
-                    result['quantity_received'] = executed_qty
+                    gross, result.spent = executed_qty, cummulative_quote_qty
                 else:
-                    cummulative_quote_qty = float(order['cummulativeQuoteQty'])
-                    result['quantity_received'] = cummulative_quote_qty
+                    gross, result.spent = cummulative_quote_qty, executed_qty
+                result.quantity_received = max(0.0, gross - result.fees.get(received_asset, 0.0))
+                
+                # IOC sem nada dentro do limite: nada gasto, a perna falha barato
+                result.success = executed_qty > 0
+                if not result.success:
+                    result.error = f"Sem execução dentro do limite ({result.status})"
+                    metrics.IOC_NO_FILLS.inc()
+                
+                # Ordem que expirou em parte (sem liquidez ou fora do limite): sobrou ativo gasto
+                elif result.status not in (None, 'FILLED'):
+                    if side == SIDE_BUY:
+                        result.leftover = max(0.0, quantity_quote - cummulative_quote_qty)
+                    else:
+                        result.leftover = max(0.0, quantity_base - executed_qty)
+                    self.log(f"   ⚠️ Execução parcial ({result.status}): sobrou {result.leftover:.8f} {current_asset}")
+                
+                if self.balance_cache is not None and result.success:
+                    self._apply_to_cache(symbol, side, order, result)
                 
-                self.log(f"   ✓ Ordem executada: ID {result['order_id']}")
+                if result.success:
+                    self.log(f"   ✓ Ordem executada: ID {result.order_id}")
+                else:
+                    self.log(f"   ✗ {result.error}")
+            
+            metrics.ORDERS_SENT.inc()
+            metrics.FILL_LATENCY.observe(time.perf_counter() - leg_start)
             
         except Exception as e:
-            result['error'] = str(e)
+            result.error = str(e)
+            metrics.ORDER_ERRORS.inc()
             self.log(f"   ❌ Erro: {str(e)}")
         
         return result
+    
+    def _place_order(self, **params):
+        """
+        Envia a ordem pela WebSocket API, com REST como alternativa
+        
+        Só cai para o REST quando a ordem não chegou a ser enviada pelo
+        socket; rejeições e falta de resposta são repassadas (a ordem pode
+        ter sido executada).
+        
+        Returns:
+            dict: Resposta da ordem
+        """
+        if self.order_transport is not None:
+            # Já carregado por quem criou o transporte; aqui não pesa no import do executor
+            from ws_api import WebSocketAPIUnavailable
+            try:
+                return self.order_transport.create_order(**params)
+            except WebSocketAPIUnavailable as e:
+                metrics.ORDER_TRANSPORT_FALLBACKS.inc()
+                self.log(f"   WebSocket API indisponível ({str(e)}); enviando por REST")
+        
+        order = self.client.create_order(**params)
+        metrics.update_rest_weight(self.client)
+        return order
+    
+    def _unwind(self, results, holdings, target):
+        """
+        Converte posições presas de volta à moeda base
+        
+        Args:
+            results (OrderResult): Resultado onde registrar os desfazimentos
+            holdings (list): [(ativo, quantidade)]
+            target (str): Moeda base
+            
+        Returns:
+            float: Valor recuperado em moeda base
+        """
+        recovered = 0.0
+        
+        for asset, quantity in holdings:
+            if asset == target:
+                # Sobra da primeira perna: já está na moeda base
+                recovered += quantity
+                continue
+            
+            if self.recovery is None:
+                # auto_unwind desligado: a sobra fica na conta, só registrada
+                self.log(f"\n⚠️  Sobra parcial não desfeita: {quantity:.8f} {asset}")
+                continue
+            
+            self.log(f"\n🔁 Desfazendo {quantity:.8f} {asset} → {target}")
+            unwind = self.recovery.unwind(asset, quantity, target)
+            results.unwinds.append(unwind)
+            recovered += unwind.recovered
+            
+            if unwind.success:
+                self.log(f"   ✓ Recuperado: {unwind.recovered:.8f} {target} via {', '.join(unwind.route)}")
+            else:
+                stuck = ', '.join(f"{q:.8f} {a}" for a, q in unwind.remaining)
+                results.errors.append(f"Não foi possível desfazer {stuck}: {unwind.error}")
+                self.log(f"   ❌ Posição presa: {stuck} ({unwind.error})")
+        
+        return recovered
+    
+    def _abort(self, results, holdings):
+        """Desfaz um triângulo interrompido e registra a perda realizada"""
+        if self.recovery is None:
+            return
+        
+        recovered = self._unwind(results, holdings, results.path[0])
+        amount = results.initial_amount
+        results.final_amount = recovered
+        results.profit = recovered - amount
+        results.profit_percent = (results.profit / amount) * 100
+        
+        if results.profit < 0:
+            metrics.UNWIND_LOSS.inc(-results.profit)
+        self.log(f"💸 Resultado realizado após desfazer: ${results.profit:.4f} ({results.profit_percent:.4f}%)")
+    
+    def _received_asset(self, symbol, side):
+        """Ativo recebido pela ordem (None se o par não for conhecido)"""
+        info = self.get_symbol_info(symbol)
+        if not info:
+            return None
+        return info['baseAsset'] if side == SIDE_BUY else info['quoteAsset']
+    
+    def _apply_to_cache(self, symbol, side, order, leg):
+        """Reflete a ordem no cache de saldos antes do evento do stream"""
+        info = self.get_symbol_info(symbol)
+        if not info:
+            return
+        
+        executed_qty = float(order['executedQty'])
+        quote_qty = float(order['cummulativeQuoteQty'])
+        transact_time = order.get('transactTime', int(time.time() * 1000))
+        
+        # Comissões em outro ativo (ex: BNB) também saem do saldo
+        received_asset = self._received_asset(symbol, side)
+        other_fees = {a: q for a, q in leg.fees.items() if a != received_asset}
+        
+        if side == SIDE_BUY:
+            self.balance_cache.apply_fill(info['quoteAsset'], quote_qty, info['baseAsset'], leg.quantity_received,
+                                          transact_time, other_fees)
+        else:
+            self.balance_cache.apply_fill(info['baseAsset'], executed_qty, info['quoteAsset'], leg.quantity_received,
+                                          transact_time, other_fees)
 
 
 if __name__ == "__main__":
@@ -322,23 +666,24 @@ if __name__ == "__main__":
     executor = OrderExecutor(simulation_mode=True)
     
     # Simula uma oportunidade
-    test_opportunity = {
-        'triangle': {
-            'path': ['USDT', 'BTC', 'ETH', 'USDT'],
-            'pairs': ['BTCUSDT', 'ETHBTC', 'ETHUSDT']
-        },
-        'profit': 5.0,
-        'profit_percent': 5.0
-    }
+    test_opportunity = Opportunity(
+        triangle=Triangle(path=('USDT', 'BTC', 'ETH', 'USDT'), pairs=('BTCUSDT', 'ETHBTC', 'ETHUSDT')),
+        initial=100,
+        final=105,
+        profit=5.0,
+        profit_percent=5.0,
+        total_fees=0.3,
+        prices=()
+    )
     
     # Executa
     result = executor.execute_arbitrage(test_opportunity, amount=100)
     
     print("\n" + "="*70)
-    if result['success']:
+    if result.success:
         print("✅ TESTE CONCLUÍDO COM SUCESSO!")
     else:
         print("❌ TESTE FALHOU")
-        for error in result['errors']:
+        for error in result.errors:
             print(f"   - {error}")
     print("="*70 + "\n")
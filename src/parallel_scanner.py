@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Varredura de ciclos de arbitragem em vários processos
+
+O índice de ciclos é dividido entre os workers. Os preços são publicados
+na tabela de memória compartilhada (shared_prices.SharedPriceTable),
+protegida por seqlock; cada worker devolve só o seu
+top-k local e o coordenador junta os resultados.
+"""
+
+import heapq
+import multiprocessing
+import os
+
+from shared_prices import SharedPriceTable
+
+SIDE_BUY = 'BUY'
+SIDE_SELL = 'SELL'
+
+
+def cycles_from_triangles(triangles):
+    """
+    Converte triângulos do TriangleFinder em ciclos genéricos
+
+    Args:
+        triangles (list): Triângulos (models.Triangle)
+
+    Returns:
+        list: Ciclos como tuplas de (símbolo, lado)
+    """
+    return [
+        ((t.pairs[0], SIDE_BUY), (t.pairs[1], SIDE_SELL), (t.pairs[2], SIDE_SELL))
+        for t in triangles
+    ]
+
+
+def enumerate_cycles(symbols, roots, length=3):
+    """
+    Enumera ciclos de conversão de N pernas a partir de várias raízes
+
+    Args:
+        symbols (list): Pares no formato do MarketData ({'symbol', 'base', 'quote'})
+        roots (list): Moedas de partida/chegada
+        length (int): Quantidade de pernas
+
+    Returns:
+        list: Ciclos como tuplas de (símbolo, lado)
+    """
+    # Arestas de conversão: comprar base com quote (BUY) ou vender base por quote (SELL)
+    edges = {}
+    for s in symbols:
+        edges.setdefault(s['quote'], []).append((s['base'], s['symbol'], SIDE_BUY))
+        edges.setdefault(s['base'], []).append((s['quote'], s['symbol'], SIDE_SELL))
+
+    cycles = []
+
+    def walk(root, asset, legs, visited):
+        for target, symbol, side in edges.get(asset, ()):
+            if len(legs) + 1 == length:
+                if target == root:
+                    cycles.append(tuple(legs) + ((symbol, side),))
+            elif target not in visited and target != root:
+                visited.add(target)
+                legs.append((symbol, side))
+                walk(root, target, legs, visited)
+                legs.pop()
+                visited.discard(target)
+
+    for root in roots:
+        walk(root, root, [], set())
+
+    return cycles
+
+
+def _evaluate(shard, prices, top_k, min_factor):
+    """Avalia um shard e devolve o top-k local como (fator, id do ciclo)"""
+    best = []
+    for cycle_id, legs in shard:
+        factor = 1.0
+        for index, is_buy, fee_multiplier in legs:
+            price = prices[index]
+            if price <= 0:
+                factor = 0.0
+                break
+            factor = factor * fee_multiplier / price if is_buy else factor * fee_multiplier * price
+
+        if factor > min_factor:
+            if len(best) < top_k:
+                heapq.heappush(best, (factor, cycle_id))
+            elif factor > best[0][0]:
+                heapq.heapreplace(best, (factor, cycle_id))
+
+    return best
+
+
+def _worker(conn, shm_name, shard):
+    """Loop de um worker: espera pedidos de varredura do coordenador"""
+    # Workers compartilham o resource tracker do coordenador
+    prices = SharedPriceTable.attach(shm_name, untrack=False)
+    try:
+        while True:
+            message = conn.recv()
+            if message[0] == 'stop':
+                break
+            _, top_k, min_factor = message
+            seq, values = prices.read_prices()
+            conn.send((seq, _evaluate(shard, values, top_k, min_factor)))
+    finally:
+        prices.close()
+        conn.close()
+
+
+class ParallelScanner:
+    """Coordenador da varredura em vários processos"""
+
+    def __init__(self, cycles, fee_percent=0.1, workers=None, fees=None):
+        """
+        Inicializa o scanner
+
+        Args:
+            cycles (list): Ciclos como tuplas de (símbolo, lado)
+            fee_percent (float): Taxa por operação em %
+            workers (int): Processos de avaliação (padrão: núcleos da máquina)
+            fees (dict): Taxa em % por símbolo (os ausentes usam fee_percent)
+        """
+        self.cycles = list(cycles)
+        self.fee_multiplier = 1 - fee_percent / 100
+        self.fee_multipliers = {s: 1 - p / 100 for s, p in (fees or {}).items()}
+        self.workers = workers or os.cpu_count() or 1
+
+        self.symbols = sorted({symbol for cycle in self.cycles for symbol, _ in cycle})
+        self.index = {symbol: i for i, symbol in enumerate(self.symbols)}
+
+        self.prices = None
+        self.processes = []
+        self.connections = []
+
+    def _shards(self):
+        compiled = [
+            (cycle_id, tuple(
+                (self.index[symbol], side == SIDE_BUY, self.fee_multipliers.get(symbol, self.fee_multiplier))
+                for symbol, side in cycle
+            ))
+            for cycle_id, cycle in enumerate(self.cycles)
+        ]
+        # Fatias contíguas do mesmo tamanho (custo por ciclo é uniforme)
+        size = -(-len(compiled) // self.workers) if compiled else 1
+        return [compiled[i:i + size] for i in range(0, max(len(compiled), 1), size)]
+
+    def start(self):
+        """Cria o segmento de preços e sobe os workers"""
+        self.prices = SharedPriceTable.create([{'symbol': s} for s in self.symbols])
+        context = multiprocessing.get_context('spawn')
+
+        for shard in self._shards():
+            parent, child = context.Pipe()
+            process = context.Process(
+                target=_worker,
+                args=(child, self.prices.name, shard),
+                daemon=True
+            )
+            process.start()
+            child.close()
+            self.processes.append(process)
+            self.connections.append(parent)
+
+        return self
+
+    def stop(self):
+        """Encerra os workers e libera a memória compartilhada"""
+        for conn in self.connections:
+            try:
+                conn.send(('stop',))
+                conn.close()
+            except (BrokenPipeError, OSError):
+                pass
+        for process in self.processes:
+            process.join(timeout=5)
+        self.processes = []
+        self.connections = []
+
+        if self.prices:
+            self.prices.close()
+            self.prices = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def publish(self, prices):
+        """
+        Publica preços para os workers
+
+        Args:
+            prices (dict): {símbolo: preço}; símbolos fora do índice são ignorados
+        """
+        self.prices.write(prices)
+
+    def scan(self, top_k=10, min_profit_percent=0.0):
+        """
+        Varre todos os ciclos em paralelo
+
+        Args:
+            top_k (int): Quantos ciclos devolver
+            min_profit_percent (float): Lucro líquido mínimo em %
+
+        Returns:
+            list: [(lucro %, ciclo)] do maior para o menor lucro
+        """
+        min_factor = 1 + min_profit_percent / 100
+
+        for conn in self.connections:
+            conn.send(('scan', top_k, min_factor))
+
+        merged = []
+        for conn in self.connections:
+            _, best = conn.recv()
+            merged.extend(best)
+
+        return [
+            ((factor - 1) * 100, self.cycles[cycle_id])
+            for factor, cycle_id in heapq.nlargest(top_k, merged)
+        ]
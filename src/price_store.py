@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Armazém de preços com horário e sequência de atualização por par
+
+Funciona como o antigo dicionário {símbolo: preço} (acesso por [], in,
+len, items), mas guarda em arrays compactos quando e em qual rodada
+cada preço foi observado, para que os avaliadores descartem ou
+penalizem triângulos montados com preços velhos. O log de cada preço é
+mantido junto para o pré-filtro de lucro do analisador.
+"""
+
+import math
+import time
+from array import array
+from collections.abc import Mapping
+
+
+class PriceStore(Mapping):
+    """Preço, bid/ask, horário e sequência de cada par em arrays paralelos"""
+
+    def __init__(self, prices=None, timestamp=None):
+        """
+        Inicializa o armazém
+
+        Args:
+            prices (dict): Preços iniciais {símbolo: preço}
+            timestamp (float): Horário dos preços iniciais (padrão: agora)
+        """
+        self.index = {}
+        self.symbols = []
+        self.prices = array('d')
+        self.log_prices = array('d')
+        self.bids = array('d')
+        self.asks = array('d')
+        self.bid_qtys = array('d')
+        self.ask_qtys = array('d')
+        self.updated_at = array('d')
+        self.seqs = array('Q')
+        self.seq = 0
+
+        if prices:
+            self.update(prices, timestamp=timestamp)
+
+    def _slot(self, symbol):
+        i = self.index.get(symbol)
+        if i is None:
+            i = len(self.symbols)
+            self.index[symbol] = i
+            self.symbols.append(symbol)
+            self.prices.append(0.0)
+            self.log_prices.append(math.nan)
+            self.bids.append(0.0)
+            self.asks.append(0.0)
+            self.bid_qtys.append(0.0)
+            self.ask_qtys.append(0.0)
+            self.updated_at.append(0.0)
+            self.seqs.append(0)
+        return i
+
+    def update(self, prices, timestamps=None, timestamp=None):
+        """
+        Registra uma rodada de preços
+
+        Pares ausentes da rodada mantêm o preço e o horário anteriores.
+
+        Args:
+            prices (dict): {símbolo: preço}
+            timestamps (dict): Horário de observação por símbolo (ex: tabela compartilhada)
+            timestamp (float): Horário dos demais símbolos (padrão: agora)
+
+        Returns:
+            int: Sequência da rodada
+        """
+        self.seq += 1
+        seq = self.seq
+        default = time.time() if timestamp is None else timestamp
+        timestamps = timestamps or {}
+
+        log = math.log
+        for symbol, price in prices.items():
+            i = self._slot(symbol)
+            self.prices[i] = price
+            # nan faz qualquer comparação falhar (preço zerado nunca passa no filtro)
+            self.log_prices[i] = log(price) if price > 0 else math.nan
+            self.updated_at[i] = timestamps.get(symbol, default)
+            self.seqs[i] = seq
+
+        return seq
+
+    def update_books(self, books, timestamp=None):
+        """
+        Registra bid/ask do livro de ofertas
+
+        Args:
+            books (dict): {símbolo: {'bid', 'ask'}} com 'bid_qty'/'ask_qty'
+                opcionais (0 = quantidade desconhecida)
+            timestamp (float): Horário de observação (padrão: agora)
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+
+        for symbol, book in books.items():
+            i = self._slot(symbol)
+            self.bids[i] = book['bid']
+            self.asks[i] = book['ask']
+            self.bid_qtys[i] = book.get('bid_qty', 0.0)
+            self.ask_qtys[i] = book.get('ask_qty', 0.0)
+            self.updated_at[i] = max(self.updated_at[i], timestamp)
+
+    def __getitem__(self, symbol):
+        return self.prices[self.index[symbol]]
+
+    def __contains__(self, symbol):
+        return symbol in self.index
+
+    def __iter__(self):
+        return iter(self.symbols)
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def read_books(self, symbols):
+        """
+        Bid/ask e horário de alguns pares (mesma interface da SharedPriceTable)
+
+        Args:
+            symbols (iterable): Símbolos
+
+        Returns:
+            dict: {símbolo: (bid, ask, atualizado_em)} dos símbolos conhecidos
+        """
+        index = self.index
+        return {
+            symbol: (self.bids[index[symbol]], self.asks[index[symbol]], self.updated_at[index[symbol]])
+            for symbol in symbols if symbol in index
+        }
+
+    def timestamp(self, symbol):
+        """Horário (epoch) da última atualização do par"""
+        return self.updated_at[self.index[symbol]]
+
+    def sequence(self, symbol):
+        """Rodada em que o par foi atualizado pela última vez"""
+        return self.seqs[self.index[symbol]]
+
+    def age(self, symbol, now=None):
+        """
+        Idade do preço de um par
+
+        Args:
+            symbol (str): Par
+            now (float): Horário de referência (padrão: agora)
+
+        Returns:
+            float: Segundos desde a última atualização
+        """
+        now = time.time() if now is None else now
+        return now - self.updated_at[self.index[symbol]]
+
+    def max_age(self, symbols, now=None):
+        """Idade do preço mais velho entre os pares (ex: pernas de um triângulo)"""
+        now = time.time() if now is None else now
+        index = self.index
+        updated_at = self.updated_at
+        return now - min(updated_at[index[s]] for s in symbols)
+
+    def is_stale(self, symbol, max_age, now=None):
+        """Indica se o preço do par tem mais de max_age segundos"""
+        return self.age(symbol, now) > max_age
+
+    def stale_symbols(self, max_age, now=None):
+        """
+        Pares com preço mais velho que max_age
+
+        Args:
+            max_age (float): Idade máxima em segundos
+            now (float): Horário de referência (padrão: agora)
+
+        Returns:
+            list: Símbolos velhos
+        """
+        limit = (time.time() if now is None else now) - max_age
+        return [s for s, t in zip(self.symbols, self.updated_at) if t < limit]
+
+    def stale_count(self, max_age, now=None):
+        """Quantidade de pares com preço mais velho que max_age"""
+        limit = (time.time() if now is None else now) - max_age
+        return sum(1 for t in self.updated_at if t < limit)
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Ranking limitado (top-K) de oportunidades de arbitragem
+
+Mantém só as K melhores oportunidades em um heap de mínimo, com custo
+O(n log K) e sem lista intermediária com todos os resultados.
+"""
+
+import heapq
+import itertools
+
+
+def size_adjusted_profit(opportunity):
+    """
+    Lucro esperado no tamanho executável da oportunidade
+
+    Usa 'capacity' (valor em moeda base que o topo do livro comporta)
+    quando conhecido; senão, o valor simulado ('initial').
+    """
+    amount = opportunity.capacity if opportunity.capacity is not None else opportunity.initial
+    return opportunity.profit_percent / 100 * amount
+
+
+RANK_KEYS = {
+    'profit': lambda o: o.profit,
+    'profit_percent': lambda o: o.profit_percent,
+    'size_adjusted': size_adjusted_profit
+}
+
+
+def rank_key(key):
+    """
+    Resolve a chave de ordenação
+
+    Args:
+        key (str | callable): Nome em RANK_KEYS ou função oportunidade -> número
+
+    Returns:
+        callable: Função de pontuação
+    """
+    if callable(key):
+        return key
+    if key not in RANK_KEYS:
+        raise ValueError(f"Chave de ranking desconhecida: {key} (use {', '.join(RANK_KEYS)})")
+    return RANK_KEYS[key]
+
+
+def top_k(opportunities, k, key='profit'):
+    """
+    K melhores oportunidades, da maior para a menor pontuação
+
+    Args:
+        opportunities (iterable): Oportunidades (pode ser um gerador)
+        k (int): Quantas manter
+        key (str | callable): Chave de ordenação
+
+    Returns:
+        list: Até k oportunidades
+    """
+    return heapq.nlargest(k, opportunities, key=rank_key(key))
+
+
+class TopK:
+    """Top-K incremental: recebe oportunidades uma a uma"""
+
+    def __init__(self, k, key='profit'):
+        """
+        Args:
+            k (int): Quantas manter
+            key (str | callable): Chave de ordenação
+        """
+        self.k = k
+        self.score = rank_key(key)
+        self.heap = []
+        self.counter = itertools.count()
+
+    def push(self, opportunity):
+        """
+        Oferece uma oportunidade ao ranking
+
+        Returns:
+            bool: True se entrou no top-K
+        """
+        entry = (self.score(opportunity), next(self.counter), opportunity)
+
+        if len(self.heap) < self.k:
+            heapq.heappush(self.heap, entry)
+            return True
+        if self.heap and entry[0] > self.heap[0][0]:
+            heapq.heapreplace(self.heap, entry)
+            return True
+        return False
+
+    def floor(self):
+        """Pontuação mínima para entrar no ranking (None se ainda não está cheio)"""
+        return self.heap[0][0] if len(self.heap) >= self.k else None
+
+    def items(self):
+        """Oportunidades do ranking, da maior para a menor pontuação"""
+        return [entry[2] for entry in sorted(self.heap, key=lambda e: (e[0], -e[1]), reverse=True)]
+
+    def __len__(self):
+        return len(self.heap)
+
+
+class StreamingTopK:
+    """
+    Top-K atualizado a cada preço que chega (ex: stream de bookTicker)
+
+    Só os triângulos que usam os pares alterados são recalculados. A última
+    pontuação de cada triângulo acima do lucro mínimo fica guardada: quando
+    um membro sai ou piora, o ranking é refeito a partir dessas pontuações,
+    então um candidato melhor que estava fora do top-K volta a entrar.
+    """
+
+    def __init__(self, analyzer, triangles, k=10, key='profit', amount=100, min_profit=0):
+        """
+        Args:
+            analyzer (ArbitrageAnalyzer): Analisador com os preços carregados
+            triangles (list): Triângulos a acompanhar
+            k (int): Tamanho do ranking
+            key (str | callable): Chave de ordenação
+            amount (float): Valor simulado
+            min_profit (float): Lucro mínimo em $
+        """
+        self.analyzer = analyzer
+        self.k = k
+        self.score = rank_key(key)
+        self.amount = amount
+        self.min_profit = min_profit
+
+        self.triangles = {t.pairs: t for t in triangles}
+        self.by_symbol = {}
+        for pairs in self.triangles:
+            for symbol in pairs:
+                self.by_symbol.setdefault(symbol, []).append(pairs)
+
+        # Última pontuação de cada triângulo viável: {pares: (pontuação, oportunidade)}
+        self.candidates = {}
+        # Membros atuais (subconjunto de candidates)
+        self.members = {}
+        self.rescore(self.triangles)
+
+    def _floor(self):
+        if len(self.members) < self.k:
+            return None
+        return min(self.members.items(), key=lambda item: item[1][0])
+
+    def _select(self):
+        """Refaz o ranking a partir das pontuações guardadas"""
+        best = heapq.nlargest(self.k, self.candidates.items(), key=lambda item: item[1][0])
+        self.members = dict(best)
+
+    def _offer(self, pairs):
+        """
+        Recalcula um triângulo
+
+        Returns:
+            bool: True se um membro saiu ou piorou (ranking precisa ser refeito)
+        """
+        result = self.analyzer.calculate_with_fees(self.triangles[pairs], self.amount)
+
+        if not result or result.profit <= self.min_profit:
+            self.candidates.pop(pairs, None)
+            return self.members.pop(pairs, None) is not None
+
+        score = self.score(result)
+        self.candidates[pairs] = (score, result)
+        if pairs in self.members:
+            previous = self.members[pairs][0]
+            self.members[pairs] = (score, result)
+            return score < previous
+
+        floor = self._floor()
+        if floor is None:
+            self.members[pairs] = (score, result)
+        elif score > floor[1][0]:
+            del self.members[floor[0]]
+            self.members[pairs] = (score, result)
+        return False
+
+    def rescore(self, pairs_list):
+        """Recalcula os triângulos indicados"""
+        dropped = False
+        for pairs in pairs_list:
+            dropped = self._offer(pairs) or dropped
+        if dropped:
+            self._select()
+
+    def on_prices(self, prices, timestamp=None):
+        """
+        Aplica novos preços e atualiza o ranking
+
+        Args:
+            prices (dict): {símbolo: preço} alterados
+            timestamp (float): Horário da observação (padrão: agora)
+
+        Returns:
+            list: Ranking atualizado
+        """
+        self.analyzer.finder.prices.update(prices, timestamp=timestamp)
+
+        affected = set()
+        for symbol in prices:
+            affected.update(self.by_symbol.get(symbol, ()))
+        self.rescore(affected)
+
+        return self.items()
+
+    def items(self):
+        """Oportunidades do ranking, da maior para a menor pontuação"""
+        ranked = sorted(self.members.values(), key=lambda member: member[0], reverse=True)
+        return [opportunity for _, opportunity in ranked]
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Governador de peso de REST compartilhado por todas as chamadas à Binance
+"""
+
+import threading
+import time
+
+import metrics
+
+# Prioridades: ordens nunca esperam pela reserva; dados só usam o excedente
+PRIORITY_ORDER = 0
+PRIORITY_DATA = 1
+
+# Peso de cada método do cliente (valores da documentação da Binance)
+ENDPOINT_WEIGHTS = {
+    'ping': 1,
+    'get_server_time': 1,
+    'get_exchange_info': 20,
+    'get_symbol_info': 20,          # o python-binance baixa o exchange info inteiro
+    'get_all_tickers': 4,
+    'get_symbol_ticker': 2,
+    'get_orderbook_tickers': 4,
+    'get_orderbook_ticker': 2,
+    'get_ticker': 80,
+    'get_account': 20,
+    'get_trade_fee': 1,
+    'create_order': 1,
+    'order_market': 1,
+    'order_limit': 1,
+    'get_order': 4,
+    'cancel_order': 1,
+    'stream_get_listen_key': 2,
+    'stream_keepalive': 2,
+    'stream_close': 2
+}
+
+ORDER_METHODS = {'create_order', 'order_market', 'order_limit', 'cancel_order'}
+
+
+class RateLimitDeferred(Exception):
+    """Chamada de baixa prioridade adiada para não estourar o limite"""
+
+
+class RateLimitGovernor:
+    """
+    Token bucket de peso de REST
+
+    O balde reabastece continuamente até o limite por minuto. Chamadas de
+    dados só consomem acima da reserva, que fica para as ordens. O uso
+    informado pelo servidor (X-MBX-USED-WEIGHT-1M) corrige a estimativa local.
+    """
+
+    def __init__(self, weight_limit=6000, reserve_percent=20, max_wait=5.0):
+        """
+        Inicializa o governador
+
+        Args:
+            weight_limit (int): Peso máximo por minuto (limite de IP da Binance)
+            reserve_percent (float): Parte do limite reservada para ordens
+            max_wait (float): Espera máxima por peso antes de adiar a chamada (s)
+        """
+        self.weight_limit = weight_limit
+        self.refill_rate = weight_limit / 60
+        self.reserve = weight_limit * reserve_percent / 100
+        self.max_wait = max_wait
+
+        self.tokens = float(weight_limit)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.server_used = 0
+        self.deferred = 0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        elapsed = now - self.updated
+        if elapsed > 0:
+            self.tokens = min(self.weight_limit, self.tokens + elapsed * self.refill_rate)
+            self.updated = now
+
+    def _wait_time(self, weight, priority, now):
+        if now < self.blocked_until:
+            return self.blocked_until - now
+
+        floor = self.reserve if priority == PRIORITY_DATA else 0
+        missing = weight + floor - self.tokens
+        if missing <= 0:
+            return 0.0
+        return missing / self.refill_rate
+
+    def acquire(self, weight, priority=PRIORITY_DATA, block=True):
+        """
+        Reserva peso para uma chamada
+
+        Args:
+            weight (int): Peso da chamada
+            priority (int): PRIORITY_ORDER ou PRIORITY_DATA
+            block (bool): Se True, espera até max_wait pelo peso
+
+        Raises:
+            RateLimitDeferred: Se não houver peso disponível a tempo
+        """
+        deadline = time.monotonic() + (self.max_wait if block else 0)
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                wait = self._wait_time(weight, priority, now)
+
+                if wait == 0:
+                    self.tokens -= weight
+                    return
+
+                if now + wait > deadline:
+                    self.deferred += 1
+                    metrics.REST_DEFERRED.inc()
+                    raise RateLimitDeferred(
+                        f"Peso de REST insuficiente ({self.tokens:.0f} disponível, {weight} pedido)"
+                    )
+
+            time.sleep(wait)
+
+    def update_from_headers(self, headers):
+        """
+        Sincroniza com o uso informado pelo servidor
+
+        Args:
+            headers (Mapping): Headers da última resposta
+        """
+        used = headers.get('x-mbx-used-weight-1m') if headers is not None else None
+        if used is None:
+            return
+
+        with self._lock:
+            self.server_used = int(used)
+            self._refill(time.monotonic())
+            self.tokens = min(self.tokens, self.weight_limit - self.server_used)
+
+    def penalize(self, retry_after):
+        """
+        Bloqueia as chamadas após um 429/418 do servidor
+
+        Args:
+            retry_after (float): Segundos indicados no header Retry-After
+        """
+        with self._lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + retry_after)
+            self.tokens = 0.0
+
+    def status(self):
+        """
+        Estado atual do governador
+
+        Returns:
+            dict: tokens disponíveis, uso informado pelo servidor e chamadas adiadas
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            return {
+                'available': self.tokens,
+                'server_used': self.server_used,
+                'deferred': self.deferred,
+                'blocked_for': max(0.0, self.blocked_until - time.monotonic())
+            }
+
+
+class GovernedClient:
+    """Proxy do cliente da Binance que passa cada chamada pelo governador"""
+
+    def __init__(self, client, governor):
+        """
+        Args:
+            client (Client): Cliente da Binance
+            governor (RateLimitGovernor): Governador compartilhado
+        """
+        self._client = client
+        self._governor = governor
+
+    def __getattr__(self, name):
+        attr = getattr(self._client, name)
+        if name not in ENDPOINT_WEIGHTS or not callable(attr):
+            return attr
+
+        weight = ENDPOINT_WEIGHTS[name]
+        priority = PRIORITY_ORDER if name in ORDER_METHODS else PRIORITY_DATA
+        governor = self._governor
+        client = self._client
+
+        def governed(*args, **kwargs):
+            # Consultas com symbol custam menos que as de todos os pares
+            call_weight = weight
+            if name in ('get_orderbook_tickers', 'get_ticker') and 'symbol' in kwargs:
+                call_weight = 2
+
+            governor.acquire(call_weight, priority)
+            try:
+                return attr(*args, **kwargs)
+            except Exception as e:
+                status_code = getattr(e, 'status_code', None)
+                if status_code in (418, 429):
+                    response = getattr(e, 'response', None)
+                    retry_after = response.headers.get('Retry-After') if response is not None else None
+                    governor.penalize(float(retry_after or 60))
+                raise
+            finally:
+                response = getattr(client, 'response', None)
+                if response is not None:
+                    governor.update_from_headers(response.headers)
+
+        return governed
+
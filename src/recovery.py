@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Recuperação de triângulos incompletos
+
+Quando a perna 2 ou 3 falha, ou uma ordem a mercado expira com
+preenchimento parcial, o executor fica com uma moeda intermediária. O
+RecoveryEngine escolhe com o livro atual a rota mais barata de volta à
+moeda base (direta ou passando por outra moeda), envia as ordens pelo
+próprio executor e informa quanto foi recuperado.
+"""
+
+from latency import tracker
+from models import Unwind
+import metrics
+
+SIDE_BUY = 'BUY'
+SIDE_SELL = 'SELL'
+
+
+class RecoveryEngine:
+    """Converte posições presas de volta à moeda base pela melhor rota"""
+
+    def __init__(self, executor, fee_percent=0.1, fee_schedule=None, max_hops=2, max_attempts=3):
+        """
+        Inicializa o motor de recuperação
+
+        Args:
+            executor (OrderExecutor): Executor usado para enviar as ordens
+            fee_percent (float): Taxa em % por ordem quando não há tabela
+            fee_schedule (FeeSchedule): Taxas por par (opcional)
+            max_hops (int): Máximo de ordens por rota (1 = só par direto)
+            max_attempts (int): Rotas tentadas antes de desistir
+        """
+        self.executor = executor
+        self.fee_percent = fee_percent
+        self.fee_schedule = fee_schedule
+        self.max_hops = max_hops
+        self.max_attempts = max_attempts
+
+        # {ativo: [(símbolo, lado, ativo recebido)]}
+        self.edges = None
+
+    def load_symbols(self, symbols=None):
+        """
+        Monta o grafo de conversões
+
+        Args:
+            symbols (list): Pares [{'symbol', 'base', 'quote'}] (None = busca o exchange info)
+
+        Returns:
+            int: Quantidade de pares
+        """
+        if symbols is None:
+            with tracker.span('recovery.get_exchange_info'):
+                info = self.executor.client.get_exchange_info()
+            symbols = [
+                {'symbol': s['symbol'], 'base': s['baseAsset'], 'quote': s['quoteAsset']}
+                for s in info['symbols'] if s.get('status', 'TRADING') == 'TRADING'
+            ]
+
+        edges = {}
+        for s in symbols:
+            edges.setdefault(s['base'], []).append((s['symbol'], SIDE_SELL, s['quote']))
+            edges.setdefault(s['quote'], []).append((s['symbol'], SIDE_BUY, s['base']))
+        self.edges = edges
+        return len(symbols)
+
+    def books(self):
+        """
+        Bid/ask atuais de todos os pares (uma chamada de REST)
+
+        Returns:
+            dict: {símbolo: (bid, ask)}
+        """
+        client = self.executor.client
+        with tracker.span('recovery.get_orderbook_tickers'):
+            tickers = client.get_orderbook_tickers()
+        metrics.update_rest_weight(client)
+        return {t['symbol']: (float(t['bidPrice']), float(t['askPrice'])) for t in tickers}
+
+    def _multiplier(self, symbol):
+        if self.fee_schedule is not None:
+            return self.fee_schedule.multiplier(symbol)
+        return 1 - self.fee_percent / 100
+
+    def _convert(self, symbol, side, amount, books):
+        book = books.get(symbol)
+        if not book:
+            return 0.0
+        bid, ask = book
+        if side == SIDE_SELL:
+            value = amount * bid
+        else:
+            value = amount / ask if ask > 0 else 0.0
+        return value * self._multiplier(symbol)
+
+    def routes(self, asset, quantity, target, books, exclude=()):
+        """
+        Rotas de asset até target, da que recupera mais para a que recupera menos
+
+        Args:
+            asset (str): Ativo preso
+            quantity (float): Quantidade do ativo
+            target (str): Moeda base
+            books (dict): {símbolo: (bid, ask)}
+            exclude (set): Símbolos a evitar (ex: já falharam)
+
+        Returns:
+            list: [(valor esperado em target, ((símbolo, lado, gasto, recebido), ...))]
+        """
+        found = []
+
+        def walk(current, amount, steps, visited):
+            for symbol, side, received in self.edges.get(current, ()):
+                if symbol in exclude or received in visited:
+                    continue
+                value = self._convert(symbol, side, amount, books)
+                if value <= 0:
+                    continue
+                path = steps + ((symbol, side, current, received),)
+                if received == target:
+                    found.append((value, path))
+                elif len(path) < self.max_hops:
+                    walk(received, value, path, visited | {received})
+
+        walk(asset, quantity, (), {asset})
+        found.sort(key=lambda route: route[0], reverse=True)
+        return found
+
+    @tracker.timed('recovery.unwind')
+    def unwind(self, asset, quantity, target):
+        """
+        Converte uma posição de volta à moeda base
+
+        Sobras de ordens parciais e pernas que falham voltam para a fila e
+        são tentadas por outra rota, até max_attempts rotas.
+
+        Args:
+            asset (str): Ativo preso
+            quantity (float): Quantidade do ativo
+            target (str): Moeda base
+
+        Returns:
+            Unwind: Ordens enviadas e valor recuperado em target
+        """
+        result = Unwind(asset=asset, quantity=quantity, target=target)
+        pending = [(asset, quantity)]
+        exclude = set()
+        attempts = 0
+
+        while pending and attempts < self.max_attempts:
+            holding, amount = pending.pop()
+            if holding == target:
+                result.recovered += amount
+                continue
+            attempts += 1
+
+            try:
+                if self.edges is None:
+                    self.load_symbols()
+                books = self.books()
+            except Exception as e:
+                result.error = f"Erro ao buscar o livro: {str(e)}"
+                pending.append((holding, amount))
+                break
+
+            routes = self.routes(holding, amount, target, books, exclude)
+            if not routes:
+                result.error = f"Sem rota de {holding} para {target}"
+                pending.append((holding, amount))
+                break
+
+            expected, steps = routes[0]
+            if not result.route:
+                result.route = tuple(step[0] for step in steps)
+                result.expected = expected
+
+            for symbol, side, spent, received in steps:
+                amount = self.executor.available_amount(spent, amount)
+                if side == SIDE_BUY:
+                    leg = self.executor._execute_order(symbol, side, quantity_quote=amount,
+                                                       current_asset=spent, spend_all=True)
+                else:
+                    leg = self.executor._execute_order(symbol, side, quantity_base=amount, current_asset=spent)
+                result.orders.append(leg)
+
+                if not leg.success:
+                    result.error = leg.error
+                    exclude.add(symbol)
+                    pending.append((spent, amount))
+                    break
+                if leg.leftover > 0:
+                    pending.append((spent, leg.leftover))
+                amount = leg.quantity_received
+            else:
+                result.recovered += amount
+
+        result.remaining = [(a, q) for a, q in pending if a != target]
+        result.recovered += sum(q for a, q in pending if a == target)
+        result.success = not result.remaining
+        if result.success:
+            result.error = None
+        elif result.error is None:
+            result.error = f"Tentativas esgotadas ({self.max_attempts} rotas)"
+
+        metrics.UNWINDS.inc()
+        return result
@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""
+Tabela de preços em memória compartilhada para vários processos
+
+Um único feed handler escreve preço/bid/ask de todos os pares em um
+segmento de shared memory protegido por seqlock; bots, monitores e
+scripts anexam o segmento e leem sem nova conexão com a exchange.
+
+Layout do segmento:
+    cabeçalho | símbolos (JSON) | preço[n] | bid[n] | ask[n] | atualizado_em[n]
+"""
+
+import argparse
+import json
+import struct
+import sys
+import time
+from multiprocessing import resource_tracker, shared_memory
+
+from market_data import MarketData
+
+MAGIC = b'ARBP'
+VERSION = 1
+
+# magic, versão, reservado, seq, quantidade de símbolos, tamanho do JSON
+_HEADER = struct.Struct('4sHHQII')
+_SEQ_OFFSET = 8
+_SEQ = struct.Struct('Q')
+
+DEFAULT_NAME = 'arb_prices'
+
+# Segmentos criados neste processo (o escritor já cuida da remoção)
+_created = set()
+
+
+def _attach(name, untrack):
+    """Anexa um segmento sem que este processo o remova ao sair"""
+    untrack = untrack and name not in _created
+    try:
+        return shared_memory.SharedMemory(name=name, track=not untrack)
+    except TypeError:
+        # Python < 3.13: o resource tracker removeria o segmento do escritor
+        shm = shared_memory.SharedMemory(name=name)
+        if untrack:
+            resource_tracker.unregister(shm._name, 'shared_memory')
+        return shm
+
+
+class SharedPriceTable:
+    """Tabela de preços/bid/ask por símbolo com seqlock"""
+
+    def __init__(self, shm, owner):
+        self.shm = shm
+        self.owner = owner
+        self.name = shm.name
+
+        magic, version, _, _, count, names_len = _HEADER.unpack_from(shm.buf, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Segmento {shm.name} não é uma tabela de preços compatível")
+
+        names_start = _HEADER.size
+        self.symbols = json.loads(bytes(shm.buf[names_start:names_start + names_len]).decode('utf-8'))
+        self.index = {s['symbol']: i for i, s in enumerate(self.symbols)}
+        self.count = count
+
+        # Visões diretas sobre o segmento (sem cópia)
+        offset = names_start + (names_len + 7) // 8 * 8
+        size = 8 * count
+        self.prices = shm.buf[offset:offset + size].cast('d')
+        self.bids = shm.buf[offset + size:offset + 2 * size].cast('d')
+        self.asks = shm.buf[offset + 2 * size:offset + 3 * size].cast('d')
+        self.updated_at = shm.buf[offset + 3 * size:offset + 4 * size].cast('d')
+
+    @classmethod
+    def create(cls, symbols, name=None):
+        """
+        Cria um segmento novo (processo escritor)
+
+        Args:
+            symbols (list): Pares [{'symbol', 'base', 'quote'}]
+            name (str): Nome do segmento (None = nome aleatório)
+
+        Returns:
+            SharedPriceTable: Tabela pronta para escrita
+        """
+        names = json.dumps(symbols, separators=(',', ':')).encode('utf-8')
+        count = len(symbols)
+        size = _HEADER.size + (len(names) + 7) // 8 * 8 + 4 * 8 * max(count, 1)
+
+        shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        _HEADER.pack_into(shm.buf, 0, MAGIC, VERSION, 0, 0, count, len(names))
+        shm.buf[_HEADER.size:_HEADER.size + len(names)] = names
+        _created.add(shm.name)
+
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name=DEFAULT_NAME, untrack=True):
+        """
+        Anexa um segmento existente (processo leitor)
+
+        Args:
+            name (str): Nome do segmento
+            untrack (bool): Não remover o segmento ao sair (processos independentes)
+
+        Returns:
+            SharedPriceTable: Tabela para leitura
+        """
+        return cls(_attach(name, untrack), owner=False)
+
+    @property
+    def seq(self):
+        return _SEQ.unpack_from(self.shm.buf, _SEQ_OFFSET)[0]
+
+    def write(self, prices=None, books=None, timestamp=None):
+        """
+        Publica preços (seq fica ímpar durante a escrita)
+
+        Args:
+            prices (dict): {símbolo: preço}
+            books (dict): {símbolo: {'bid', 'ask'}}
+            timestamp (float): Momento da observação (padrão: agora)
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        index = self.index
+        seq = self.seq
+        _SEQ.pack_into(self.shm.buf, _SEQ_OFFSET, seq + 1)
+
+        try:
+            for symbol, price in (prices or {}).items():
+                i = index.get(symbol)
+                if i is not None:
+                    self.prices[i] = price
+                    self.updated_at[i] = timestamp
+
+            for symbol, book in (books or {}).items():
+                i = index.get(symbol)
+                if i is not None:
+                    self.bids[i] = book['bid']
+                    self.asks[i] = book['ask']
+                    self.updated_at[i] = timestamp
+        finally:
+            _SEQ.pack_into(self.shm.buf, _SEQ_OFFSET, seq + 2)
+
+    def read_prices(self):
+        """
+        Lê um snapshot consistente só dos preços
+
+        Returns:
+            tuple: (seq, lista de preços por índice)
+        """
+        while True:
+            before = self.seq
+            if before & 1:
+                continue
+            values = self.prices.tolist()
+            if self.seq == before:
+                return before, values
+
+    def read_books(self, symbols):
+        """
+        Lê bid/ask de poucos pares de forma consistente (sem copiar a tabela)
+
+        Args:
+            symbols (iterable): Símbolos
+
+        Returns:
+            dict: {símbolo: (bid, ask, atualizado_em)} dos símbolos conhecidos
+        """
+        slots = [(symbol, self.index[symbol]) for symbol in symbols if symbol in self.index]
+        bids, asks, updated_at = self.bids, self.asks, self.updated_at
+        while True:
+            before = self.seq
+            if before & 1:
+                continue
+            books = {symbol: (bids[i], asks[i], updated_at[i]) for symbol, i in slots}
+            if self.seq == before:
+                return books
+
+    def snapshot(self):
+        """
+        Lê um snapshot consistente de toda a tabela
+
+        Returns:
+            tuple: (seq, preços, bids, asks, atualizado_em) como listas por índice
+        """
+        while True:
+            before = self.seq
+            if before & 1:
+                continue
+            values = (
+                self.prices.tolist(),
+                self.bids.tolist(),
+                self.asks.tolist(),
+                self.updated_at.tolist()
+            )
+            if self.seq == before:
+                return (before,) + values
+
+    def close(self):
+        """Libera as visões e o segmento (remove se for o escritor)"""
+        for view in (self.prices, self.bids, self.asks, self.updated_at):
+            view.release()
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+            _created.discard(self.name)
+
+
+class FeedHandler:
+    """Processo único que busca o mercado e escreve na tabela compartilhada"""
+
+    def __init__(self, market, name=DEFAULT_NAME, interval=1.0, universe=None):
+        """
+        Inicializa o feed
+
+        Args:
+            market (MarketData): Fonte dos dados (conexão com a exchange)
+            name (str): Nome do segmento de shared memory
+            interval (float): Intervalo entre atualizações em segundos
+            universe (SymbolUniverse): Filtro de liquidez dos pares publicados (opcional)
+        """
+        self.market = market
+        self.name = name
+        self.interval = interval
+        self.universe = universe
+        self.table = None
+        self.running = False
+
+    def start(self):
+        """Cria a tabela com os pares ativos do mercado"""
+        symbols = [
+            {'symbol': s['symbol'], 'base': s['base'], 'quote': s['quote']}
+            for s in self.market.get_spot_symbols()
+        ]
+        if self.universe is not None:
+            symbols = self.universe.prune(symbols)
+        self.table = SharedPriceTable.create(symbols, self.name)
+        return self.table
+
+    def update(self):
+        """Busca preços e livro e publica na tabela"""
+        prices = self.market.get_prices()
+        books = self.market.get_book_tickers()
+        self.table.write(prices, books)
+        return len(prices)
+
+    def run(self, cycles=None):
+        """
+        Atualiza a tabela em loop
+
+        Args:
+            cycles (int): Quantidade de atualizações (None = até parar)
+        """
+        self.running = True
+        done = 0
+
+        try:
+            while self.running and (cycles is None or done < cycles):
+                start = time.time()
+                self.update()
+                done += 1
+                time.sleep(max(0, self.interval - (time.time() - start)))
+        finally:
+            self.running = False
+
+    def stop(self):
+        self.running = False
+        if self.table:
+            self.table.close()
+            self.table = None
+
+
+class SharedMemoryMarketData(MarketData):
+    """MarketData que lê a tabela compartilhada em vez de chamar a exchange"""
+
+    def __init__(self, name=DEFAULT_NAME):
+        """
+        Anexa a tabela publicada pelo feed handler
+
+        Args:
+            name (str): Nome do segmento de shared memory
+        """
+        # Sem cliente: todas as leituras vêm do segmento
+        self.client = None
+        self.symbol_infos = {}
+        self.table = SharedPriceTable.attach(name)
+        self.timestamps = {}
+
+    def get_spot_symbols(self):
+        return [dict(s, active=True) for s in self.table.symbols]
+
+    def get_prices(self, symbols=None):
+        _, prices, _, _, updated_at = self.table.snapshot()
+        names = self.table.symbols
+
+        result = {names[i]['symbol']: p for i, p in enumerate(prices) if p > 0}
+        self.timestamps = {names[i]['symbol']: updated_at[i] for i, p in enumerate(prices) if p > 0}
+        if symbols:
+            result = {s: result.get(s, 0) for s in symbols}
+        return result
+
+    def get_price_timestamps(self):
+        return self.timestamps
+
+    def get_book_tickers(self, symbols=None):
+        _, _, bids, asks, _ = self.table.snapshot()
+        names = self.table.symbols
+
+        books = {
+            names[i]['symbol']: {'bid': bids[i], 'bid_qty': 0.0, 'ask': asks[i], 'ask_qty': 0.0}
+            for i in range(len(names)) if bids[i] > 0 and asks[i] > 0
+        }
+        if symbols:
+            books = {s: books[s] for s in symbols if s in books}
+        return books
+
+    def close(self):
+        self.table.close()
+
+
+if __name__ == "__main__":
+    """Executa o feed handler"""
+
+    parser = argparse.ArgumentParser(description="Feed handler da tabela de preços compartilhada")
+    parser.add_argument('--name', default=DEFAULT_NAME)
+    parser.add_argument('--interval', type=float, default=1.0)
+    parser.add_argument('--min-quote-volume', type=float, default=0, help="Volume mínimo de 24h em USDT")
+    parser.add_argument('--min-trades', type=int, default=0, help="Negócios mínimos em 24h")
+    parser.add_argument('--max-spread-percent', type=float, default=0, help="Spread máximo em %%")
+    args = parser.parse_args()
+
+    from universe import SymbolUniverse
+
+    market = MarketData()
+    universe = SymbolUniverse(
+        market.client,
+        min_quote_volume=args.min_quote_volume,
+        min_trades=args.min_trades,
+        max_spread_percent=args.max_spread_percent
+    )
+    if universe.enabled:
+        universe.load()
+    feed = FeedHandler(market, args.name, args.interval, universe=universe)
+
+    try:
+        table = feed.start()
+        print(f"✅ Tabela '{table.name}' criada com {table.count} pares")
+        print("(Pressione Ctrl+C para parar)")
+        feed.run()
+    except KeyboardInterrupt:
+        pass
+    except Exception as e:
+        print(f"\n❌ ERRO: {str(e)}")
+        sys.exit(1)
+    finally:
+        feed.stop()
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Geração de mercados sintéticos (topologia e preços) para benchmarks e testes
+"""
+
+import math
+import random
+
+# Moedas de cotação na ordem aproximada de liquidez da Binance
+QUOTE_ASSETS = ('USDT', 'BTC', 'ETH', 'BNB', 'FDUSD', 'EUR', 'TRY', 'BRL',
+                'USDC', 'TUSD', 'JPY', 'DAI')
+
+# Tamanhos pré-definidos: realista (spot da Binance) e de estresse
+SIZES = {
+    'small': {'n_assets': 40, 'n_symbols': 150},
+    'realistic': {'n_assets': 400, 'n_symbols': 2500},
+    'stress': {'n_assets': 2000, 'n_symbols': 12000}
+}
+
+
+def _lot_filters(price):
+    # Passo de quantidade proporcional ao preço (ativos caros aceitam frações menores)
+    step = 10 ** -max(0, min(8, int(math.log10(max(price, 1e-8))) + 4))
+    return [
+        {'filterType': 'PRICE_FILTER', 'minPrice': '0.00000001', 'maxPrice': '1000000', 'tickSize': '0.00000001'},
+        {'filterType': 'LOT_SIZE', 'minQty': f"{step:.8f}", 'maxQty': '90000000', 'stepSize': f"{step:.8f}"}
+    ]
+
+
+def generate_market(n_assets=400, n_symbols=2500, n_quotes=None, noise=0.002, seed=0):
+    """
+    Gera uma topologia de exchange com preços consistentes
+
+    Cada ativo tem um valor "justo" em USD; o preço de cada par é a razão
+    entre os valores com um ruído multiplicativo, o que cria algumas
+    (poucas) oportunidades de arbitragem.
+
+    Args:
+        n_assets (int): Quantidade de ativos
+        n_symbols (int): Quantidade de pares
+        n_quotes (int): Moedas de cotação usadas (padrão: proporcional ao tamanho)
+        noise (float): Desvio padrão relativo do ruído de preço
+        seed (int): Semente do gerador (resultados determinísticos)
+
+    Returns:
+        tuple: (lista de símbolos no formato do exchange info, {símbolo: preço})
+    """
+    rng = random.Random(seed)
+
+    if n_quotes is None:
+        n_quotes = max(2, min(len(QUOTE_ASSETS), n_symbols // max(n_assets, 1) + 2))
+    quotes = list(QUOTE_ASSETS[:n_quotes])
+    assets = quotes + [f"C{i:04d}" for i in range(max(0, n_assets - len(quotes)))]
+
+    # Valor justo em USD (log-normal, como a distribuição real de preços)
+    value = {asset: math.exp(rng.gauss(0, 3)) for asset in assets}
+    value['USDT'] = 1.0
+
+    pairs = []
+    seen = set()
+
+    def add(base, quote):
+        if base == quote or (base, quote) in seen or (quote, base) in seen:
+            return False
+        seen.add((base, quote))
+        pairs.append((base, quote))
+        return True
+
+    # Todo ativo negocia contra USDT; moedas de cotação entre si
+    for asset in assets[1:]:
+        add(asset, 'USDT')
+    for i, quote in enumerate(quotes[1:], start=1):
+        for other in quotes[1:i]:
+            add(quote, other)
+
+    # Restante distribuído entre ativos e moedas de cotação (mais líquidas primeiro)
+    weights = [1 / (i + 1) for i in range(len(quotes))]
+    attempts = 0
+    while len(pairs) < n_symbols and attempts < n_symbols * 20:
+        attempts += 1
+        base = assets[rng.randrange(len(quotes), len(assets))] if len(assets) > len(quotes) else rng.choice(assets)
+        quote = rng.choices(quotes, weights)[0]
+        add(base, quote)
+
+    symbols = []
+    prices = {}
+
+    for base, quote in pairs:
+        symbol = base + quote
+        price = value[base] / value[quote] * (1 + rng.gauss(0, noise))
+        prices[symbol] = price
+        symbols.append({
+            'symbol': symbol,
+            'status': 'TRADING',
+            'baseAsset': base,
+            'quoteAsset': quote,
+            'isSpotTradingAllowed': True,
+            'filters': _lot_filters(price)
+        })
+
+    return symbols, prices
+
+
+class RandomWalk:
+    """Processo de preços: passeio aleatório geométrico por símbolo"""
+
+    def __init__(self, prices, volatility=0.0005, seed=0):
+        """
+        Inicializa o processo
+
+        Args:
+            prices (dict): Preços iniciais {símbolo: preço}
+            volatility (float): Desvio padrão do retorno por passo
+            seed (int): Semente do gerador
+        """
+        self.prices = dict(prices)
+        self.volatility = volatility
+        self.rng = random.Random(seed)
+        self.symbols = list(self.prices)
+
+    def step(self, count=None):
+        """
+        Move os preços de alguns símbolos
+
+        Args:
+            count (int): Quantos símbolos atualizar (padrão: todos)
+
+        Returns:
+            dict: Preços atualizados neste passo {símbolo: preço}
+        """
+        if count is None or count >= len(self.symbols):
+            chosen = self.symbols
+        else:
+            chosen = self.rng.sample(self.symbols, count)
+
+        updated = {}
+        for symbol in chosen:
+            price = self.prices[symbol] * math.exp(self.rng.gauss(0, self.volatility))
+            self.prices[symbol] = price
+            updated[symbol] = price
+        return updated
+
+
+class SyntheticClient:
+    """Cliente em memória com a interface do binance.client.Client usada pelo projeto"""
+
+    def __init__(self, symbols, prices, spread=0.0005):
+        """
+        Inicializa o cliente
+
+        Args:
+            symbols (list): Símbolos no formato do exchange info
+            prices (dict): Preços {símbolo: preço}
+            spread (float): Spread relativo entre bid e ask
+        """
+        self.symbols = symbols
+        self.symbol_info = {s['symbol']: s for s in symbols}
+        self.prices = prices
+        self.spread = spread
+        self.response = None
+
+    def ping(self):
+        return {}
+
+    def get_exchange_info(self):
+        return {'symbols': self.symbols}
+
+    def get_symbol_info(self, symbol):
+        return self.symbol_info.get(symbol)
+
+    def get_all_tickers(self):
+        return [{'symbol': s, 'price': f"{p:.8f}"} for s, p in self.prices.items()]
+
+    def get_symbol_ticker(self, symbol):
+        return {'symbol': symbol, 'price': f"{self.prices[symbol]:.8f}"}
+
+    def get_orderbook_tickers(self, **params):
+        half = self.spread / 2
+        return [
+            {
+                'symbol': s,
+                'bidPrice': f"{p * (1 - half):.8f}",
+                'bidQty': '1000',
+                'askPrice': f"{p * (1 + half):.8f}",
+                'askQty': '1000'
+            }
+            for s, p in self.prices.items()
+        ]
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Snapshot da topologia do mercado para partida rápida
+
+Pares, filtros (entrada do exchange info de cada par) e o índice de
+triângulos da moeda base ficam num arquivo binário versionado
+(cache/topology.bin), identificado pelo hash do exchange info. Na
+partida o snapshot é lido no primeiro uso, sem esperar o exchange info
+(peso 20, alguns MB); a validação contra a exchange roda em segundo
+plano e, se a topologia mudou, o índice é recompilado e regravado.
+
+Formato: cabeçalho fixo (HEADER) seguido do payload em marshal. Arquivos
+de outra versão do formato ou de outra versão do marshal são ignorados.
+"""
+
+import hashlib
+import json
+import marshal
+import struct
+import threading
+import time
+from pathlib import Path
+
+from cycle_graph import ConversionGraph
+from latency import tracker
+from models import Triangle
+
+root_dir = Path(__file__).parent.parent
+DEFAULT_CACHE_PATH = root_dir / 'cache' / 'topology.bin'
+
+MAGIC = b'ARBTOPO\0'
+FORMAT_VERSION = 1
+# magic, versão do formato, versão do marshal, sha256 da topologia, horário da compilação
+HEADER = struct.Struct('<8sHH32sd')
+
+
+def topology_hash(symbols, symbol_infos=None):
+    """
+    Hash da topologia: pares e filtros, independente da ordem
+
+    Args:
+        symbols (list): Pares no formato do MarketData ({'symbol', 'base', 'quote'})
+        symbol_infos (dict): {símbolo: entrada do exchange info} (opcional)
+
+    Returns:
+        bytes: sha256 (32 bytes)
+    """
+    pairs = sorted((s['symbol'], s['base'], s['quote']) for s in symbols)
+    infos = sorted((symbol_infos or {}).items())
+    return hashlib.sha256(json.dumps([pairs, infos], sort_keys=True).encode()).digest()
+
+
+class TopologyCache:
+    """Pares, filtros e triângulos compilados, persistidos entre execuções"""
+
+    def __init__(self, base_currency='USDT', cache_path=DEFAULT_CACHE_PATH,
+                 validate_interval=3600, on_change=None):
+        """
+        Inicializa o cache (nada é lido do disco até o primeiro uso)
+
+        Args:
+            base_currency (str): Moeda base dos triângulos indexados
+            cache_path (str | Path): Arquivo do snapshot (None = só em memória)
+            validate_interval (float): Segundos entre validações contra a exchange
+            on_change (callable): Chamado com o cache quando a topologia muda
+        """
+        self.base_currency = base_currency
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.validate_interval = validate_interval
+        self.on_change = on_change
+
+        self.digest = b''
+        self.built_at = 0.0
+        self.symbols = []
+        self.filters = {}
+        # Triângulos como (A, B, par1, par2, par3); objetos Triangle só no primeiro uso
+        self.raw_triangles = []
+        self._triangles = None
+
+        self.loaded = False
+        self.validated_at = 0.0
+        self.validator = None
+        self.lock = threading.Lock()
+
+    def load(self):
+        """
+        Lê o snapshot do disco (uma vez só)
+
+        Returns:
+            bool: True se há topologia em memória
+        """
+        with self.lock:
+            if self.loaded or self.cache_path is None or not self.cache_path.exists():
+                self.loaded = True
+                return bool(self.symbols)
+            self.loaded = True
+
+            try:
+                with tracker.span('topology.load'):
+                    data = self.cache_path.read_bytes()
+                    magic, version, marshal_version, digest, built_at = HEADER.unpack_from(data)
+                    if magic != MAGIC or version != FORMAT_VERSION or marshal_version != marshal.version:
+                        print("Snapshot de topologia de outra versão: será recompilado")
+                        return False
+
+                    payload = marshal.loads(data[HEADER.size:])
+                    if payload['base'] != self.base_currency:
+                        return False
+
+                    self.symbols = [
+                        {'symbol': symbol, 'base': base, 'quote': quote, 'active': True}
+                        for symbol, base, quote in payload['symbols']
+                    ]
+                    self.filters = payload['filters']
+                    self.raw_triangles = payload['triangles']
+                    self._triangles = None
+                    self.digest = digest
+                    self.built_at = built_at
+            except (OSError, ValueError, EOFError, TypeError, KeyError, struct.error) as e:
+                print(f"Snapshot de topologia inválido: {str(e)}")
+                return False
+
+            return bool(self.symbols)
+
+    def save(self):
+        """Grava o snapshot atual no disco"""
+        if self.cache_path is None:
+            return
+
+        with self.lock:
+            header = HEADER.pack(MAGIC, FORMAT_VERSION, marshal.version, self.digest, self.built_at)
+            payload = marshal.dumps({
+                'base': self.base_currency,
+                'symbols': [(s['symbol'], s['base'], s['quote']) for s in self.symbols],
+                'filters': self.filters,
+                'triangles': self.raw_triangles
+            })
+
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        # Escreve ao lado e troca: outro processo nunca lê um arquivo pela metade
+        tmp_path = self.cache_path.with_suffix('.tmp')
+        tmp_path.write_bytes(header + payload)
+        tmp_path.replace(self.cache_path)
+
+    @property
+    def triangles(self):
+        """Triângulos indexados (models.Triangle)"""
+        with self.lock:
+            if self._triangles is None:
+                base = self.base_currency
+                self._triangles = [
+                    Triangle(path=(base, coin_a, coin_b, base), pairs=(pair1, pair2, pair3))
+                    for coin_a, coin_b, pair1, pair2, pair3 in self.raw_triangles
+                ]
+            return self._triangles
+
+    def view(self):
+        """
+        Pares e triângulos da mesma versão da topologia
+
+        Returns:
+            tuple: (pares, triângulos)
+        """
+        triangles = self.triangles
+        with self.lock:
+            # Recompilação no meio: pega a versão nova inteira
+            if self._triangles is not triangles:
+                return self.view()
+            return self.symbols, triangles
+
+    def compile(self, symbols, symbol_infos=None):
+        """
+        Monta o índice de triângulos se a topologia mudou
+
+        Args:
+            symbols (list): Pares no formato do MarketData
+            symbol_infos (dict): {símbolo: entrada do exchange info} (opcional;
+                vazio mantém os filtros já conhecidos dos pares que continuam)
+
+        Returns:
+            bool: True se a topologia mudou (e foi regravada)
+        """
+        if not symbol_infos:
+            # Fonte sem exchange info (ex: memória compartilhada): não apaga os filtros
+            present = {s['symbol'] for s in symbols}
+            symbol_infos = {symbol: info for symbol, info in self.filters.items() if symbol in present}
+
+        digest = topology_hash(symbols, symbol_infos)
+        self.validated_at = time.time()
+        if digest == self.digest:
+            return False
+
+        with tracker.span('topology.compile'):
+            base = self.base_currency
+            raw_triangles = [
+                (t.path[1], t.path[2]) + t.pairs
+                for t in ConversionGraph(symbols).triangles(base)
+            ]
+
+        with self.lock:
+            self.symbols = symbols
+            self.filters = dict(symbol_infos or {})
+            self.raw_triangles = raw_triangles
+            self._triangles = None
+            self.digest = digest
+            self.built_at = time.time()
+            self.loaded = True
+
+        self.save()
+        if self.on_change is not None:
+            self.on_change(self)
+        return True
+
+    def validate(self, market):
+        """
+        Confere o snapshot contra o exchange info atual
+
+        Args:
+            market (MarketData): Fonte dos pares
+
+        Returns:
+            bool: True se a topologia mudou; None se não conseguiu buscar
+        """
+        symbols = market.get_spot_symbols()
+        if not symbols:
+            # Erro de rede: mantém o snapshot e tenta no próximo intervalo
+            self.validated_at = time.time()
+            return None
+
+        changed = self.compile(symbols, getattr(market, 'symbol_infos', None))
+        if changed:
+            print(f"✓ Topologia atualizada: {len(self.symbols)} pares, {len(self.raw_triangles)} triângulos")
+        return changed
+
+    def maybe_validate(self, market):
+        """
+        Valida em segundo plano se o intervalo expirou
+
+        Args:
+            market (MarketData): Fonte dos pares
+
+        Returns:
+            bool: True se iniciou uma validação
+        """
+        if time.time() - self.validated_at < self.validate_interval:
+            return False
+        if self.validator is not None and self.validator.is_alive():
+            return False
+
+        self.validator = threading.Thread(target=self.validate, args=(market,), name='topology-validate', daemon=True)
+        self.validator.start()
+        return True
+
+    def wait(self, timeout=None):
+        """Espera a validação em andamento (testes e encerramento)"""
+        if self.validator is not None:
+            self.validator.join(timeout)
@@ -7,32 +7,75 @@ import os
 import sys
 from pathlib import Path
 from market_data import MarketData
+from latency import tracker
+from price_store import PriceStore
+from cycle_graph import ConversionGraph
 
 class TriangleFinder:
     """Classe para encontrar triângulos de arbitragem"""
     
-    def __init__(self, base_currency='USDT'):
+    def __init__(self, base_currency='USDT', market=None, universe=None, topology=None):
         """
         Inicializa o buscador de triângulos
         
         Args:
             base_currency (str): Moeda base para começar e terminar (ex: USDT)
+            market (MarketData): Fonte de dados do mercado. Se None, usa a Binance
+            universe (SymbolUniverse): Filtro de liquidez aplicado aos pares (opcional)
+            topology (TopologyCache): Snapshot de pares e triângulos (opcional)
         """
         self.base_currency = base_currency
-        self.market = MarketData()
+        self.market = market if market is not None else MarketData()
+        self.universe = universe
+        self.topology = topology
         self.symbols = []
-        self.prices = {}
+        self.prices = PriceStore()
+        self._graph = None
+        self._graph_symbols = None
+        # Pares após o filtro de liquidez e o índice do snapshot restrito a eles
+        self._pruned = None
+        self._pruned_index = None
         
     def load_market_data(self):
-        """Carrega dados do mercado"""
+        """
+        Carrega dados do mercado
+        
+        Returns:
+            bool: False se a busca de preços falhou (os preços guardados são da rodada anterior)
+        """
         print(f"⏳ Carregando pares do mercado...")
-        self.symbols = self.market.get_spot_symbols()
-        print(f"✓ {len(self.symbols)} pares carregados")
+        if self.topology is not None and self.topology.load():
+            # Snapshot em disco; a conferência com a exchange roda em segundo plano
+            self.symbols = self.topology.symbols
+            print(f"✓ {len(self.symbols)} pares carregados (snapshot de topologia)")
+            self.topology.maybe_validate(self.market)
+        else:
+            self.symbols = self.market.get_spot_symbols()
+            print(f"✓ {len(self.symbols)} pares carregados")
+            if self.topology is not None and self.symbols:
+                self.topology.compile(self.symbols, getattr(self.market, 'symbol_infos', None))
+                self.symbols = self.topology.symbols
+        
+        # Pares sem liquidez não entram nos triângulos
+        if self.universe is not None and self.universe.enabled:
+            pruned = self.universe.prune(self.symbols)
+            # Mesmos pares da rodada anterior: mantém a lista, e com ela o grafo e o índice
+            if self._pruned is None or [s['symbol'] for s in pruned] != [s['symbol'] for s in self._pruned]:
+                self._pruned = pruned
+            self.symbols = self._pruned
+            print(f"✓ {len(self.symbols)} pares após o filtro de liquidez ({self.universe.pruned} removidos)")
         
         print(f"⏳ Carregando preços...")
-        self.prices = self.market.get_prices()
-        print(f"✓ {len(self.prices)} preços carregados")
+        prices = self.market.get_prices()
+        if not prices:
+            # Erro ou rate limit: não reaproveita a rodada anterior como se fosse atual
+            print(f"⚠️  Nenhum preço carregado")
+            return False
+        self.prices.update(prices, self.market.get_price_timestamps())
+        print(f"✓ {len(prices)} preços carregados")
+        return True
     
+    @tracker.timed('finder.find_triangles')
     def find_triangles(self):
         """
         Encontra todos os triângulos possíveis começando com a moeda base
@@ -40,69 +83,63 @@ class TriangleFinder:
         Returns:
             list: Lista de triângulos encontrados
         """
-        triangles = []
-        
-        # Cria índice de pares por moeda
-        pairs_by_base = {}
-        pairs_by_quote = {}
+        # Busca triângulos começando com base_currency
+        print(f"\n⏳ Buscando triângulos começando com {self.base_currency}...")
         
-        for symbol_info in self.symbols:
-            base = symbol_info['base']
-            quote = symbol_info['quote']
-            symbol = symbol_info['symbol']
-            
-            if base not in pairs_by_base:
-                pairs_by_base[base] = []
-            pairs_by_base[base].append(symbol_info)
+        # Índice pronto do snapshot; com filtro de liquidez, só os triângulos cujos pares ficaram
+        if self.topology is not None:
+            symbols, triangles = self.topology.view()
+            if self.symbols is symbols:
+                return list(triangles)
             
-            if quote not in pairs_by_quote:
-                pairs_by_quote[quote] = []
-            pairs_by_quote[quote].append(symbol_info)
+            cached = self._pruned_index
+            if cached is None or cached[0] is not self.symbols or cached[1] is not triangles:
+                kept = {s['symbol'] for s in self.symbols}
+                index = [t for t in triangles if all(pair in kept for pair in t.pairs)]
+                cached = self._pruned_index = (self.symbols, triangles, index)
+            return list(cached[2])
+        
+        return self.graph().triangles(self.base_currency)
+    
+    def graph(self):
+        """
+        Grafo de conversões dos pares carregados (refeito quando os pares mudam)
         
-        # Busca triângulos começando com base_currency
-        print(f"\n⏳ Buscando triângulos começando com {self.base_currency}...")
+        Returns:
+            ConversionGraph: Matriz de adjacência em bitsets
+        """
+        if self._graph is None or self._graph_symbols is not self.symbols:
+            self._graph = ConversionGraph(self.symbols)
+            self._graph_symbols = self.symbols
+        return self._graph
+    
+    @tracker.timed('finder.find_cycles')
+    def find_cycles(self, roots=None, length=3):
+        """
+        Encontra ciclos de 3 ou 4 pernas em qualquer direção, a partir de várias moedas
         
-        # Passo 1: base_currency -> moeda A
-        if self.base_currency in pairs_by_quote:
-            for pair1 in pairs_by_quote[self.base_currency]:
-                coin_a = pair1['base']  # Primeira moeda
-                
-                # Passo 2: moeda A -> moeda B
-                if coin_a in pairs_by_base:
-                    for pair2 in pairs_by_base[coin_a]:
-                        coin_b = pair2['quote']  # Segunda moeda
-                        
-                        # Passo 3: moeda B -> base_currency (volta para o início)
-                        if coin_b in pairs_by_base:
-                            for pair3 in pairs_by_base[coin_b]:
-                                if pair3['quote'] == self.base_currency:
-                                    # Encontrou um triângulo!
-                                    triangle = {
-                                        'path': [self.base_currency, coin_a, coin_b, self.base_currency],
-                                        'pairs': [pair1['symbol'], pair2['symbol'], pair3['symbol']],
-                                        'operations': [
-                                            f"Comprar {coin_a} com {self.base_currency}",
-                                            f"Trocar {coin_a} por {coin_b}",
-                                            f"Vender {coin_b} por {self.base_currency}"
-                                        ]
-                                    }
-                                    triangles.append(triangle)
-        
-        return triangles
+        Args:
+            roots (list): Moedas de partida/chegada (None = todas)
+            length (int): Quantidade de pernas (3 ou 4)
+            
+        Returns:
+            list: Ciclos como tuplas de (símbolo, lado), prontos para o ParallelScanner
+        """
+        return self.graph().cycles(roots, length)
     
     def calculate_profit(self, triangle, amount=100):
         """
         Calcula o lucro potencial de um triângulo
         
         Args:
-            triangle (dict): Informações do triângulo
+            triangle (Triangle): Triângulo
             amount (float): Valor inicial em base_currency
             
         Returns:
             dict: Resultado com lucro e percentual
         """
         try:
-            pair1, pair2, pair3 = triangle['pairs']
+            pair1, pair2, pair3 = triangle.pairs
             
             # Verifica se temos os preços
             if pair1 not in self.prices or pair2 not in self.prices or pair3 not in self.prices:
@@ -163,8 +200,8 @@ if __name__ == "__main__":
         print(f"\n📊 Exemplos de triângulos (primeiros 5):")
         for i, triangle in enumerate(triangles[:5]):
             print(f"\n  Triângulo {i+1}:")
-            print(f"    Caminho: {' → '.join(triangle['path'])}")
-            print(f"    Pares: {', '.join(triangle['pairs'])}")
+            print(f"    Caminho: {triangle.route}")
+            print(f"    Pares: {', '.join(triangle.pairs)}")
             
             # Calcula lucro potencial
             result = finder.calculate_profit(triangle, amount=100)
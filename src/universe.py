@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Seleção do universo de pares por liquidez
+
+Pares parados (sem negócios há horas, spread largo) geram triângulos com
+preço velho que não executam. As estatísticas de 24h (get_ticker, peso
+80) ficam em cache local (cache/ticker_24h.json), renovadas uma vez por
+dia, e os pares abaixo dos limites saem antes da montagem dos triângulos.
+
+O volume é comparado em moeda base (ex: USDT): o volume em moeda de
+cotação de cada par é convertido pelo último preço da cotação contra a
+moeda base. Pares sem estatística ou sem conversão conhecida ficam.
+"""
+
+import json
+import time
+from pathlib import Path
+
+root_dir = Path(__file__).parent.parent
+DEFAULT_CACHE_PATH = root_dir / 'cache' / 'ticker_24h.json'
+
+
+class SymbolUniverse:
+    """Filtro de pares por volume, número de negócios e spread de 24h"""
+
+    def __init__(self, client=None, base_currency='USDT', cache_path=DEFAULT_CACHE_PATH,
+                 refresh_interval=24 * 3600, min_quote_volume=0, min_trades=0, max_spread_percent=0):
+        """
+        Inicializa o filtro
+
+        Args:
+            client (Client): Cliente da Binance (None = só cache)
+            base_currency (str): Moeda em que min_quote_volume é expresso
+            cache_path (str | Path): Arquivo de cache (None = sem cache)
+            refresh_interval (float): Validade do cache em segundos
+            min_quote_volume (float): Volume mínimo de 24h em base_currency (0 = sem limite)
+            min_trades (int): Negócios mínimos em 24h (0 = sem limite)
+            max_spread_percent (float): Spread máximo em % do preço médio (0 = sem limite)
+        """
+        self.client = client
+        self.base_currency = base_currency
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.refresh_interval = refresh_interval
+        self.min_quote_volume = min_quote_volume
+        self.min_trades = min_trades
+        self.max_spread_percent = max_spread_percent
+
+        # {símbolo: (último preço, volume em cotação, negócios, spread %)}
+        self.stats = {}
+        self.fetched_at = 0.0
+        self.pruned = 0
+
+    @property
+    def enabled(self):
+        return self.min_quote_volume > 0 or self.min_trades > 0 or self.max_spread_percent > 0
+
+    def load(self):
+        """
+        Carrega do cache se estiver válido; senão busca na exchange
+
+        Returns:
+            int: Quantidade de pares com estatística
+        """
+        if self.cache_path and self.cache_path.exists():
+            try:
+                with open(self.cache_path) as f:
+                    data = json.load(f)
+                self.stats = {s: tuple(v) for s, v in data['stats'].items()}
+                self.fetched_at = data['fetched_at']
+            except (OSError, ValueError, KeyError) as e:
+                print(f"Cache de estatísticas de 24h inválido: {str(e)}")
+
+        if time.time() - self.fetched_at > self.refresh_interval:
+            self.refresh()
+
+        return len(self.stats)
+
+    def refresh(self):
+        """
+        Busca as estatísticas de 24h de todos os pares e atualiza o cache
+
+        Returns:
+            bool: True se conseguiu atualizar
+        """
+        if self.client is None:
+            return False
+
+        try:
+            tickers = self.client.get_ticker()
+        except Exception as e:
+            # Mantém o que já tinha (cache antigo ou sem filtro)
+            print(f"Erro ao buscar estatísticas de 24h: {str(e)}")
+            return False
+
+        stats = {}
+        for t in tickers:
+            bid, ask = float(t.get('bidPrice') or 0), float(t.get('askPrice') or 0)
+            mid = (bid + ask) / 2
+            spread = (ask - bid) / mid * 100 if bid > 0 and ask > 0 else None
+            stats[t['symbol']] = (float(t['lastPrice']), float(t['quoteVolume']), int(t.get('count', 0)), spread)
+
+        self.stats = stats
+        self.fetched_at = time.time()
+
+        if self.cache_path:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.cache_path, 'w') as f:
+                json.dump({'fetched_at': self.fetched_at, 'stats': stats}, f)
+
+        return True
+
+    def maybe_refresh(self):
+        """Renova as estatísticas se o intervalo expirou"""
+        if time.time() - self.fetched_at > self.refresh_interval:
+            return self.refresh()
+        return False
+
+    def base_volume(self, symbol, quote):
+        """
+        Volume de 24h do par em base_currency
+
+        Args:
+            symbol (str): Par
+            quote (str): Moeda de cotação do par
+
+        Returns:
+            float: Volume convertido (None se não houver conversão)
+        """
+        stat = self.stats.get(symbol)
+        if stat is None:
+            return None
+        quote_volume = stat[1]
+        if quote == self.base_currency:
+            return quote_volume
+
+        direct = self.stats.get(f"{quote}{self.base_currency}")
+        if direct and direct[0] > 0:
+            return quote_volume * direct[0]
+        inverse = self.stats.get(f"{self.base_currency}{quote}")
+        if inverse and inverse[0] > 0:
+            return quote_volume / inverse[0]
+        return None
+
+    def allows(self, symbol_info):
+        """
+        Diz se o par passa nos limites de liquidez
+
+        Args:
+            symbol_info (dict): Par no formato do MarketData ({'symbol', 'base', 'quote'})
+
+        Returns:
+            bool: False se estiver abaixo de algum limite
+        """
+        stat = self.stats.get(symbol_info['symbol'])
+        if stat is None:
+            return True
+        _, _, trades, spread = stat
+
+        if self.min_trades > 0 and trades < self.min_trades:
+            return False
+        if self.max_spread_percent > 0 and spread is not None and spread > self.max_spread_percent:
+            return False
+        if self.min_quote_volume > 0:
+            volume = self.base_volume(symbol_info['symbol'], symbol_info['quote'])
+            if volume is not None and volume < self.min_quote_volume:
+                return False
+        return True
+
+    def prune(self, symbols):
+        """
+        Remove os pares sem liquidez
+
+        Args:
+            symbols (list): Pares no formato do MarketData
+
+        Returns:
+            list: Pares que passam nos limites
+        """
+        if not self.enabled:
+            return symbols
+
+        self.maybe_refresh()
+        kept = [s for s in symbols if self.allows(s)]
+        self.pruned = len(symbols) - len(kept)
+        return kept
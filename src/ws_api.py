@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Envio de ordens pela WebSocket API da Binance
+
+Mantém uma conexão persistente com a WebSocket API e envia order.place
+pelo mesmo socket, com as respostas correlacionadas por id. Evita o
+handshake HTTP/TLS e o enquadramento de cada create_order por REST.
+
+Chaves HMAC não permitem session.logon (só Ed25519), então cada
+requisição é assinada localmente; o custo é um HMAC, sem ida à rede.
+"""
+
+import hashlib
+import hmac
+import itertools
+import json
+import os
+import threading
+import time
+
+from websockets.exceptions import ConnectionClosed, InvalidHandshake
+from websockets.sync.client import connect
+
+from binance_client import ws_api_url
+
+
+class WebSocketAPIError(Exception):
+    """Requisição rejeitada pela exchange (mesmo formato do APIError do REST)"""
+
+    def __init__(self, code, msg, status=400):
+        super().__init__(f"APIError(code={code}): {msg}")
+        self.code = code
+        self.msg = msg
+        self.status = status
+
+
+class WebSocketAPIUnavailable(Exception):
+    """Sem conexão: a requisição não foi enviada (seguro repetir por REST)"""
+
+
+class WebSocketAPITimeout(Exception):
+    """Requisição enviada sem resposta: o estado da ordem é desconhecido"""
+
+
+def _format(value):
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, float):
+        return f"{value:.8f}".rstrip('0').rstrip('.')
+    return str(value)
+
+
+class WebSocketAPIClient:
+    """Sessão persistente com a WebSocket API"""
+
+    def __init__(self, api_key=None, api_secret=None, url=None, timeout=10, recv_window=None):
+        """
+        Inicializa o cliente (a conexão abre em connect() ou na primeira ordem)
+
+        Args:
+            api_key (str): Chave da API (padrão: BINANCE_API_KEY)
+            api_secret (str): Segredo da API (padrão: BINANCE_API_SECRET)
+            url (str): Endpoint (padrão: BINANCE_WS_API_URL)
+            timeout (float): Espera máxima por conexão e resposta em segundos
+            recv_window (int): recvWindow em ms das requisições assinadas
+        """
+        self.api_key = api_key or os.getenv('BINANCE_API_KEY')
+        self.api_secret = api_secret or os.getenv('BINANCE_API_SECRET')
+        if not self.api_key or not self.api_secret:
+            raise ValueError("Chaves da Binance não encontradas")
+
+        self.url = url or ws_api_url()
+        self.timeout = timeout
+        self.recv_window = recv_window
+
+        self.ids = itertools.count(1)
+        # {id: [evento, resposta]} das requisições aguardando resposta
+        self.pending = {}
+        self.lock = threading.Lock()
+        self.ws = None
+        self.reader = None
+        # Último uso de peso informado em rateLimits
+        self.weight_used = None
+
+    @property
+    def connected(self):
+        return self.ws is not None
+
+    def connect(self):
+        """
+        Abre a conexão (se ainda não estiver aberta)
+
+        Returns:
+            WebSocketAPIClient: O próprio cliente
+        """
+        with self.lock:
+            if self.ws is not None:
+                return self
+
+            ready = threading.Event()
+            failure = []
+            self.reader = threading.Thread(target=self._run, args=(ready, failure), name='ws-api', daemon=True)
+            self.reader.start()
+
+            if not ready.wait(self.timeout + 1) or failure:
+                reason = str(failure[0]) if failure else 'tempo esgotado'
+                raise WebSocketAPIUnavailable(f"Falha ao conectar em {self.url}: {reason}")
+        return self
+
+    def _run(self, ready, failure):
+        """Thread de leitura: dona da conexão enquanto ela estiver aberta"""
+        try:
+            with connect(self.url, open_timeout=self.timeout, compression=None) as ws:
+                self.ws = ws
+                ready.set()
+                self._read(ws)
+        except (OSError, InvalidHandshake, TimeoutError) as e:
+            failure.append(e)
+            ready.set()
+
+    def _read(self, ws):
+        try:
+            for message in ws:
+                data = json.loads(message)
+                for limit in data.get('rateLimits') or ():
+                    if limit.get('rateLimitType') == 'REQUEST_WEIGHT':
+                        self.weight_used = limit.get('count')
+                waiter = self.pending.pop(data.get('id'), None)
+                if waiter:
+                    waiter[1] = data
+                    waiter[0].set()
+        except ConnectionClosed:
+            pass
+        finally:
+            with self.lock:
+                if self.ws is ws:
+                    self.ws = None
+            # Quem ainda espera recebe None (conexão caiu antes da resposta)
+            for request_id in list(self.pending):
+                waiter = self.pending.pop(request_id, None)
+                if waiter:
+                    waiter[0].set()
+
+    def _sign(self, params):
+        payload = '&'.join(f"{k}={v}" for k, v in sorted(params.items()))
+        return hmac.new(self.api_secret.encode('utf-8'), payload.encode('utf-8'), hashlib.sha256).hexdigest()
+
+    def request(self, method, params=None, signed=False):
+        """
+        Envia uma requisição e espera a resposta com o mesmo id
+
+        Args:
+            method (str): Método da WebSocket API (ex: order.place)
+            params (dict): Parâmetros
+            signed (bool): Adiciona apiKey, timestamp e assinatura
+
+        Returns:
+            dict: Campo 'result' da resposta
+
+        Raises:
+            WebSocketAPIUnavailable: Sem conexão; nada foi enviado
+            WebSocketAPITimeout: Enviado, mas sem resposta
+            WebSocketAPIError: Rejeitado pela exchange
+        """
+        params = {k: _format(v) for k, v in (params or {}).items() if v is not None}
+        if signed:
+            params['apiKey'] = self.api_key
+            params['timestamp'] = str(int(time.time() * 1000))
+            if self.recv_window:
+                params['recvWindow'] = str(self.recv_window)
+            params['signature'] = self._sign(params)
+
+        self.connect()
+
+        request_id = str(next(self.ids))
+        waiter = [threading.Event(), None]
+        self.pending[request_id] = waiter
+
+        try:
+            with self.lock:
+                ws = self.ws
+                if ws is None:
+                    raise WebSocketAPIUnavailable("Conexão com a WebSocket API fechada")
+                ws.send(json.dumps({'id': request_id, 'method': method, 'params': params}))
+        except (ConnectionClosed, OSError) as e:
+            self.pending.pop(request_id, None)
+            raise WebSocketAPIUnavailable(f"Falha ao enviar {method}: {str(e)}") from e
+        except WebSocketAPIUnavailable:
+            self.pending.pop(request_id, None)
+            raise
+
+        if not waiter[0].wait(self.timeout):
+            self.pending.pop(request_id, None)
+            raise WebSocketAPITimeout(f"Sem resposta para {method} (id {request_id})")
+
+        response = waiter[1]
+        if response is None:
+            raise WebSocketAPITimeout(f"Conexão caiu antes da resposta de {method} (id {request_id})")
+
+        if response.get('status') != 200:
+            error = response.get('error') or {}
+            raise WebSocketAPIError(error.get('code'), error.get('msg'), response.get('status'))
+
+        return response.get('result')
+
+    def ping(self):
+        """Testa a conexão (peso 1)"""
+        return self.request('ping')
+
+    def create_order(self, **params):
+        """
+        Envia uma ordem (order.place) com os mesmos parâmetros do create_order do REST
+
+        Returns:
+            dict: Resposta da ordem
+        """
+        return self.request('order.place', params, signed=True)
+
+    def close(self):
+        """Fecha a conexão"""
+        with self.lock:
+            ws, self.ws = self.ws, None
+        if ws is not None:
+            ws.close()
+        if self.reader:
+            self.reader.join(timeout=5)
+            self.reader = None
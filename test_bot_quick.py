@@ -33,24 +33,21 @@ if __name__ == "__main__":
         bot.log(f"Ciclo #{bot.stats['cycles']} - Buscando oportunidades...", "INFO")
         
         try:
-            opportunities = bot.analyzer.find_profitable_opportunities(
+            profitable = bot.analyzer.find_profitable_opportunities(
                 min_amount=bot.trade_amount,
-                min_profit=0
+                min_profit=bot.trade_amount * bot.min_profit_percent / 100,
+                top=5
             )
-            
-            profitable = [
-                opp for opp in opportunities
-                if opp['profit_percent'] >= bot.min_profit_percent
-            ]
+            scan = bot.analyzer.last_scan
             
             if profitable:
-                bot.stats['opportunities_found'] += len(profitable)
+                bot.stats['opportunities_found'] += scan['profitable']
                 best = profitable[0]
                 
                 bot.log(
                     f"🎯 Oportunidade encontrada! " +
-                    f"{' → '.join(best['triangle']['path'])} " +
-                    f"({best['profit_percent']:.2f}%)",
+                    f"{best.triangle.route} " +
+                    f"({best.profit_percent:.2f}%)",
                     "SUCCESS"
                 )
                 
@@ -59,28 +56,28 @@ if __name__ == "__main__":
                 
                 bot.stats['trades_executed'] += 1
                 
-                if result['success']:
+                if result.success:
                     bot.stats['trades_successful'] += 1
-                    bot.stats['total_invested'] += result['initial_amount']
-                    bot.stats['total_profit'] += result['profit']
+                    bot.stats['total_invested'] += result.initial_amount
+                    bot.stats['total_profit'] += result.profit
                     
                     bot.log(
-                        f"✅ Trade executado! Lucro: ${result['profit']:.2f} ({result['profit_percent']:.2f}%)",
+                        f"✅ Trade executado! Lucro: ${result.profit:.2f} ({result.profit_percent:.2f}%)",
                         "SUCCESS"
                     )
                 else:
                     bot.stats['trades_failed'] += 1
-                    bot.log(f"❌ Trade falhou: {result['errors']}", "ERROR")
+                    bot.log(f"❌ Trade falhou: {result.errors}", "ERROR")
             else:
                 bot.log(
                     f"Nenhuma oportunidade acima de {bot.min_profit_percent}%",
                     "INFO"
                 )
-                if opportunities:
-                    best = opportunities[0]
+                best = scan.get('best')
+                if best:
                     bot.log(
-                        f"Melhor disponível: {best['profit_percent']:.2f}% - " +
-                        f"{' → '.join(best['triangle']['path'])}",
+                        f"Melhor disponível: {best.profit_percent:.2f}% - " +
+                        f"{best.triangle.route}",
                         "INFO"
                     )
         
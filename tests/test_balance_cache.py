@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Teste do cache de saldos do user data stream (não precisa da Binance)
+"""
+
+import contextlib
+import io
+import sys
+import time
+from pathlib import Path
+
+# Adiciona o diretório src ao path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir / 'src'))
+
+from balance_cache import BalanceCache
+from fake_exchange import FakeExchange
+from models import Opportunity, Triangle
+from order_executor import OrderExecutor
+from test_fake_exchange import fake_env
+
+
+class AccountClient:
+    """Cliente mínimo que só responde get_account"""
+
+    def __init__(self, balances, update_time=0):
+        self.balances = balances
+        self.update_time = update_time
+
+    def get_account(self):
+        return {
+            'updateTime': self.update_time,
+            'balances': [
+                {'asset': a, 'free': str(f), 'locked': '0'} for a, f in self.balances.items()
+            ]
+        }
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.time() + timeout
+    while not condition():
+        if time.time() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def test_apply_events():
+    """Eventos de posição, depósito e ordem atualizam o cache"""
+    cache = BalanceCache(client=None)
+
+    cache.apply_event({'e': 'outboundAccountPosition', 'E': 10, 'u': 10, 'B': [
+        {'a': 'USDT', 'f': '900.5', 'l': '99.5'},
+        {'a': 'BTC', 'f': '0.002', 'l': '0'}
+    ]})
+    assert cache.free('USDT') == 900.5
+    assert cache.locked('USDT') == 99.5
+    assert cache.free('ETH') == 0.0
+
+    cache.apply_event({'e': 'balanceUpdate', 'E': 11, 'a': 'USDT', 'd': '100', 'T': 11})
+    assert cache.free('USDT') == 1000.5
+
+    cache.apply_event({'e': 'executionReport', 'i': 7, 'X': 'FILLED', 'z': '0.001', 'Z': '60'})
+    assert cache.order_status(7) == 'FILLED'
+    assert not cache.apply_event({'e': 'listStatus'})
+    assert cache.events == 3
+
+
+def test_apply_fill_and_stream_order():
+    """Resultado local de uma ordem só vale se o stream ainda não a refletiu"""
+    cache = BalanceCache(client=None)
+    cache.apply_event({'e': 'outboundAccountPosition', 'u': 100, 'B': [{'a': 'USDT', 'f': '1000', 'l': '0'}]})
+
+    # Ordem mais nova que o último evento: aplica
+    assert cache.apply_fill('USDT', 100, 'BTC', 0.002, transact_time=200)
+    assert cache.free('USDT') == 900
+    assert cache.free('BTC') == 0.002
+
+    # O evento absoluto chega depois e prevalece
+    cache.apply_event({'e': 'outboundAccountPosition', 'u': 200, 'B': [
+        {'a': 'USDT', 'f': '900', 'l': '0'}, {'a': 'BTC', 'f': '0.001998', 'l': '0'}
+    ]})
+    assert cache.free('BTC') == 0.001998
+
+    # Ordem que o stream já refletiu não é descontada de novo
+    assert not cache.apply_fill('USDT', 100, 'BTC', 0.002, transact_time=200)
+    assert cache.free('USDT') == 900
+
+
+def test_reconcile():
+    """Reconciliação corrige o cache, exceto com snapshot mais velho que o stream"""
+    client = AccountClient({'USDT': 1000.0, 'BTC': 0.5}, update_time=50)
+    cache = BalanceCache(client)
+
+    assert cache.reconcile() == {'USDT': -1000.0, 'BTC': -0.5}
+    assert cache.free('BTC') == 0.5
+
+    cache.apply_event({'e': 'outboundAccountPosition', 'u': 80, 'B': [{'a': 'BTC', 'f': '0.4', 'l': '0'}]})
+    assert cache.reconcile() == {}
+    assert cache.free('BTC') == 0.4
+
+    client.update_time = 90
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert cache.reconcile() == {'BTC': 0.4 - 0.5}
+    assert cache.free('BTC') == 0.5
+
+
+def test_stream_against_fake_exchange():
+    """Ordens na exchange falsa chegam ao cache pelo user data stream"""
+    exchange = FakeExchange(size='small', balances={'USDT': 1000.0}).start()
+    try:
+        with fake_env(exchange):
+            executor = OrderExecutor(simulation_mode=False, log_file=Path('/tmp/fake_trades.log'))
+            cache = BalanceCache(executor.client).start()
+            executor.balance_cache = cache
+            try:
+                assert cache.free('USDT') == 1000.0
+                assert cache.connected.wait(5)
+                assert wait_for(lambda: exchange.subscribers)
+
+                with contextlib.redirect_stdout(io.StringIO()):
+                    order = executor._execute_order('BTCUSDT', 'BUY', quantity_quote=100)
+                assert order.success
+
+                # O saldo absoluto do stream já desconta a taxa paga em BTC
+                assert wait_for(lambda: abs(cache.free('BTC') - exchange.balances['BTC']) < 1e-8)
+                assert abs(cache.free('USDT') - exchange.balances['USDT']) < 1e-8
+                assert cache.order_status(order.order_id) == 'FILLED'
+            finally:
+                cache.stop()
+    finally:
+        exchange.stop()
+
+    assert cache.events >= 2
+    assert not exchange.listen_keys
+
+
+def test_executor_precheck():
+    """Sem saldo para a primeira perna o executor não envia nenhuma ordem"""
+    exchange = FakeExchange(size='small', balances={'USDT': 50.0}).start()
+    try:
+        with fake_env(exchange):
+            executor = OrderExecutor(simulation_mode=False, log_file=Path('/tmp/fake_trades.log'))
+            cache = BalanceCache(executor.client)
+            cache.reconcile()
+            executor.balance_cache = cache
+
+            opportunity = Opportunity(
+                triangle=Triangle(path=('USDT', 'BTC', 'ETH', 'USDT'), pairs=('BTCUSDT', 'ETHBTC', 'ETHUSDT')),
+                initial=100, final=101, profit=1.0, profit_percent=1.0, total_fees=0.3, prices=()
+            )
+            with contextlib.redirect_stdout(io.StringIO()):
+                result = executor.execute_arbitrage(opportunity, amount=100)
+    finally:
+        exchange.stop()
+
+    assert not result.success
+    assert 'Saldo insuficiente' in result.errors[0]
+    assert not exchange.orders
+
+
+if __name__ == "__main__":
+    test_apply_events()
+    test_apply_fill_and_stream_order()
+    test_reconcile()
+    test_stream_against_fake_exchange()
+    test_executor_precheck()
+    print("✅ TESTES DO CACHE DE SALDOS PASSARAM!")
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Teste rápido do benchmark de triângulos com mercado sintético pequeno
+"""
+
+import sys
+from pathlib import Path
+
+# Adiciona o diretório raiz ao path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir / 'benchmarks'))
+
+from bench_triangles import compare, run_benchmarks
+
+
+def test_run_and_compare():
+    """Benchmark roda offline e detecta regressões"""
+    report = run_benchmarks('small', repeat=1)
+
+    assert report['symbols'] == 150
+    assert report['triangles'] > 0
+    assert set(report['benchmarks']) == {
+        'find_triangles', 'calculate_with_fees_all', 'prefilter', 'rank',
+        'find_profitable_opportunities'
+    }
+
+    assert compare(report, report) == []
+
+    faster = {'size': 'small', 'benchmarks': {
+        name: {'median_ms': stats['median_ms'] / 10}
+        for name, stats in report['benchmarks'].items()
+    }}
+    assert len(compare(report, faster, tolerance=0.25)) == 5
+
+
+if __name__ == "__main__":
+    test_run_and_compare()
+    print("✅ TESTE DE BENCHMARK PASSOU!")
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Teste do cooldown de oportunidades já executadas
+"""
+
+import sys
+from pathlib import Path
+
+# Adiciona o diretório src ao path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir / 'src'))
+
+from cooldown import OpportunityCooldown, price_signature
+from models import Opportunity, OrderResult, Triangle
+import metrics
+
+PATH = ('USDT', 'BTC', 'ETH', 'USDT')
+PAIRS = ('BTCUSDT', 'ETHBTC', 'ETHUSDT')
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def opportunity(prices=(33000.0, 0.06, 1900.0)):
+    return Opportunity(
+        triangle=Triangle(path=PATH, pairs=PAIRS),
+        initial=100, final=101, profit=1.0, profit_percent=1.0, total_fees=0.3, prices=prices
+    )
+
+
+def result(success=True, profit=0.5):
+    return OrderResult(mode='REAL', path=PATH, pairs=PAIRS, initial_amount=100, success=success, profit=profit)
+
+
+def test_same_prices_are_suppressed():
+    """Mesmos preços ficam bloqueados até o cooldown expirar; preços novos liberam"""
+    clock = Clock()
+    cooldown = OpportunityCooldown(cooldown_seconds=30, clock=clock)
+    assert cooldown.allow(opportunity())
+
+    cooldown.record_attempt(opportunity())
+    cooldown.record_result(result())
+    skips = metrics.COOLDOWN_SKIPS.value
+    assert cooldown.filter([opportunity()]) == []
+    assert metrics.COOLDOWN_SKIPS.value == skips + 1
+
+    assert cooldown.allow(opportunity((33001.0, 0.06, 1900.0)))
+
+    clock.now += 30
+    assert cooldown.allow(opportunity())
+
+
+def test_backoff_after_losses():
+    """Prejuízo dobra a espera, mesmo com preços novos; lucro zera o backoff"""
+    clock = Clock()
+    cooldown = OpportunityCooldown(cooldown_seconds=10, max_backoff_seconds=35, clock=clock)
+    moved = opportunity((33100.0, 0.061, 1890.0))
+
+    cooldown.record_attempt(opportunity())
+    cooldown.record_result(result(profit=-0.4))
+    assert not cooldown.allow(moved)
+    clock.now += 19
+    assert not cooldown.allow(moved)
+    clock.now += 1
+    assert cooldown.allow(moved)
+
+    # Falha seguida: 40s, limitado a 35s
+    cooldown.record_attempt(moved)
+    cooldown.record_result(result(success=False, profit=0.0))
+    clock.now += 34
+    assert not cooldown.allow(opportunity())
+    clock.now += 1
+    assert cooldown.allow(opportunity())
+
+    cooldown.record_attempt(opportunity())
+    cooldown.record_result(result())
+    assert cooldown.entries[PAIRS]['losses'] == 0
+    assert cooldown.allow(moved)
+
+
+def test_signature_and_disabled():
+    """Assinatura ignora ruído além dos dígitos; cooldown 0 não bloqueia nada"""
+    assert price_signature(opportunity((1.0000000001, 2.0, 3.0))) == price_signature(opportunity((1.0, 2.0, 3.0)))
+    assert price_signature(opportunity((1.0001, 2.0, 3.0))) != price_signature(opportunity((1.0, 2.0, 3.0)))
+
+    cooldown = OpportunityCooldown(cooldown_seconds=0)
+    cooldown.record_attempt(opportunity())
+    cooldown.record_result(result(profit=-1.0))
+    assert cooldown.allow(opportunity())
+    assert not cooldown.entries
+
+
+if __name__ == "__main__":
+    test_same_prices_are_suppressed()
+    test_backoff_after_losses()
+    test_signature_and_disabled()
+    print("✅ TESTES DO COOLDOWN PASSARAM!")
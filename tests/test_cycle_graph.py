@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Teste da descoberta de ciclos pela matriz de adjacência em bitsets (não precisa da Binance)
+"""
+
+import contextlib
+import io
+import sys
+import time
+from pathlib import Path
+
+# Adiciona o diretório src ao path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir / 'src'))
+
+from cycle_graph import ConversionGraph
+from market_data import MarketData
+from models import Triangle
+from parallel_scanner import enumerate_cycles
+from synthetic_market import SIZES, SyntheticClient, generate_market
+from triangle_finder import TriangleFinder
+
+
+def market_symbols(seed, size):
+    """Pares sintéticos no formato do MarketData"""
+    symbols, prices = generate_market(seed=seed, **SIZES[size])
+    with contextlib.redirect_stdout(io.StringIO()):
+        return MarketData(client=SyntheticClient(symbols, prices)).get_spot_symbols()
+
+
+def nested_loop_triangles(symbols, root):
+    """Busca original do TriangleFinder (laços aninhados por moeda)"""
+    by_base, by_quote = {}, {}
+    for s in symbols:
+        by_base.setdefault(s['base'], []).append(s)
+        by_quote.setdefault(s['quote'], []).append(s)
+
+    triangles = []
+    for pair1 in by_quote.get(root, []):
+        for pair2 in by_base.get(pair1['base'], []):
+            for pair3 in by_base.get(pair2['quote'], []):
+                if pair3['quote'] == root:
+                    triangles.append(Triangle(
+                        path=(root, pair1['base'], pair2['quote'], root),
+                        pairs=(pair1['symbol'], pair2['symbol'], pair3['symbol'])
+                    ))
+    return triangles
+
+
+def test_same_triangles_as_nested_loops():
+    """Mesmo conjunto de triângulos da busca original, para várias raízes"""
+    symbols = market_symbols(3, 'small')
+    graph = ConversionGraph(symbols)
+
+    for root in ('USDT', 'BTC', 'ETH'):
+        expected = nested_loop_triangles(symbols, root)
+        found = graph.triangles(root)
+        assert len(found) == len(expected)
+        assert set(found) == set(expected)
+
+    assert graph.triangles('NAOEXISTE') == []
+
+
+def test_same_cycles_as_dfs():
+    """Ciclos de 3 e 4 pernas iguais aos do DFS genérico"""
+    symbols = market_symbols(5, 'small')
+    graph = ConversionGraph(symbols)
+    roots = ['USDT', 'BTC']
+
+    for length in (3, 4):
+        expected = enumerate_cycles(symbols, roots, length)
+        found = graph.cycles(roots, length)
+        assert len(found) == len(expected)
+        assert set(found) == set(expected)
+
+    try:
+        graph.cycles(roots, 5)
+        assert False, "Deveria recusar 5 pernas"
+    except ValueError:
+        pass
+
+
+def test_all_roots_realistic_market():
+    """Todas as raízes de um mercado do tamanho da Binance bem abaixo de 1 s"""
+    symbols, prices = generate_market(seed=0, **SIZES['realistic'])
+    finder = TriangleFinder('USDT', market=MarketData(client=SyntheticClient(symbols, prices)))
+    with contextlib.redirect_stdout(io.StringIO()):
+        finder.load_market_data()
+        assert set(finder.find_triangles()) == set(nested_loop_triangles(finder.symbols, 'USDT'))
+
+    start = time.perf_counter()
+    cycles = finder.find_cycles()
+    elapsed = time.perf_counter() - start
+
+    assert cycles
+    assert elapsed < 1.0, f"{elapsed:.3f}s"
+    # Grafo reaproveitado enquanto os pares não mudam
+    assert finder.graph() is finder.graph()
+
+
+if __name__ == "__main__":
+    test_same_triangles_as_nested_loops()
+    test_same_cycles_as_dfs()
+    test_all_roots_realistic_market()
+    print("✅ TESTES DO GRAFO DE CICLOS PASSARAM!")
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Teste do agendador de execução simultânea de triângulos
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Adiciona o diretório src ao path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir / 'src'))
+
+from execution_scheduler import ExecutionScheduler
+from models import Opportunity, OrderResult, Triangle
+
+
+def opportunity(path, profit):
+    pairs = tuple(f"{a}{b}" for a, b in zip(path, path[1:]))
+    return Opportunity(
+        triangle=Triangle(path=path, pairs=pairs),
+        initial=100, final=100 + profit, profit=profit, profit_percent=profit, total_fees=0.3, prices=()
+    )
+
+
+class SlowExecutor:
+    """Executor falso que demora e registra quantos rodam ao mesmo tempo"""
+
+    def __init__(self, delay=0.1):
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.active = set()
+        self.running = 0
+        self.max_running = 0
+        self.overlaps = []
+
+    def execute_arbitrage(self, opportunity, amount):
+        assets = set(opportunity.triangle.path[1:-1])
+        with self.lock:
+            if assets & self.active:
+                self.overlaps.append(opportunity.triangle.route)
+            self.active |= assets
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= assets
+            self.running -= 1
+        path = opportunity.triangle.path
+        return OrderResult(mode='SIMULAÇÃO', path=path, pairs=opportunity.triangle.pairs,
+                           initial_amount=amount, success=True)
+
+
+RANKED = [
+    opportunity(('USDT', 'BTC', 'ETH', 'USDT'), 3.0),
+    opportunity(('USDT', 'ETH', 'BNB', 'USDT'), 2.5),   # ETH em uso
+    opportunity(('USDT', 'SOL', 'BNB', 'USDT'), 2.0),
+    opportunity(('USDT', 'XRP', 'ADA', 'USDT'), 1.5),
+    opportunity(('USDT', 'DOT', 'LTC', 'USDT'), 1.0)
+]
+
+
+def test_greedy_selection():
+    """Do melhor para o pior, sem moeda intermediária repetida"""
+    scheduler = ExecutionScheduler(SlowExecutor(), max_concurrent=10)
+    routes = [o.triangle.path for o in scheduler.select(RANKED, 100)]
+    assert routes == [RANKED[0].triangle.path, RANKED[2].triangle.path,
+                      RANKED[3].triangle.path, RANKED[4].triangle.path]
+
+    # Limites de concorrência e de capital
+    assert len(ExecutionScheduler(SlowExecutor(), max_concurrent=2).select(RANKED, 100)) == 2
+    assert len(ExecutionScheduler(SlowExecutor(), max_concurrent=10, capital_budget=250).select(RANKED, 100)) == 2
+    assert ExecutionScheduler(SlowExecutor(), max_concurrent=3, capital_budget=50).select(RANKED, 100) == []
+
+
+def test_parallel_run():
+    """Os selecionados rodam em paralelo, sem sobreposição de moedas"""
+    executor = SlowExecutor(delay=0.2)
+    scheduler = ExecutionScheduler(executor, max_concurrent=4)
+    try:
+        start = time.perf_counter()
+        results, rejected = scheduler.run(RANKED, 100)
+        elapsed = time.perf_counter() - start
+    finally:
+        scheduler.close()
+
+    assert len(results) == 4 and all(r.success for r in results)
+    assert rejected == []
+    assert [r.path for r in results][0] == RANKED[0].triangle.path
+    assert elapsed < 0.2 * 4 * 0.75
+    assert executor.max_running >= 2
+    assert not executor.overlaps
+    assert scheduler.reserved == 0.0
+
+
+def test_locked_asset_is_skipped():
+    """Moeda já travada por outra execução: o triângulo não é enviado"""
+    executor = SlowExecutor(delay=0.3)
+    scheduler = ExecutionScheduler(executor, max_concurrent=2, capital_budget=1000)
+
+    worker = threading.Thread(target=scheduler.execute, args=(RANKED[0], 100))
+    worker.start()
+    time.sleep(0.1)
+    try:
+        assert scheduler.execute(RANKED[1], 100) == (None, None)
+        assert scheduler.reserved == 100
+    finally:
+        worker.join()
+
+    result, reason = scheduler.execute(RANKED[1], 100)
+    assert result.success and reason is None
+    assert not executor.overlaps
+
+
+if __name__ == "__main__":
+    test_greedy_selection()
+    test_parallel_run()
+    test_locked_asset_is_skipped()
+    print("✅ TESTES DO AGENDADOR DE EXECUÇÃO PASSARAM!")
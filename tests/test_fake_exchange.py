@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Teste da exchange falsa local (não precisa da Binance)
+"""
+
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+# Adiciona o diretório src ao path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir / 'src'))
+
+from binance.exceptions import BinanceAPIException
+from websockets.sync.client import connect
+
+from binance_client import create_client
+from fake_exchange import FakeExchange
+from market_data import MarketData
+from order_executor import OrderExecutor
+from rate_limiter import RateLimitGovernor
+
+
+class fake_env:
+    """Aponta os clientes para a exchange falsa durante o bloco"""
+
+    def __init__(self, exchange):
+        self.values = exchange.env()
+        self.saved = {}
+
+    def __enter__(self):
+        for key, value in self.values.items():
+            self.saved[key] = os.environ.get(key)
+            os.environ[key] = value
+
+    def __exit__(self, *exc):
+        for key, value in self.saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+def test_market_data_against_fake_exchange():
+    """MarketData busca pares, preços e livro na exchange falsa"""
+    exchange = FakeExchange(size='small').start()
+    try:
+        with fake_env(exchange):
+            market = MarketData()
+            symbols = market.get_spot_symbols()
+            prices = market.get_prices()
+            books = market.get_book_tickers()
+    finally:
+        exchange.stop()
+
+    assert len(symbols) == len(exchange.symbols)
+    assert prices['BTCUSDT'] > 0
+    assert books['BTCUSDT']['bid'] < books['BTCUSDT']['ask']
+
+
+def test_orders_and_user_data_stream():
+    """Ordens reais na exchange falsa geram eventos no user data stream"""
+    exchange = FakeExchange(size='small', balances={'USDT': 1000.0}).start()
+    try:
+        with fake_env(exchange):
+            executor = OrderExecutor(simulation_mode=False, log_file=Path('/tmp/fake_trades.log'))
+            listen_key = executor.client.stream_get_listen_key()
+
+            with connect(f"{exchange.stream_url}/ws/{listen_key}") as ws:
+                order = executor._execute_order('BTCUSDT', 'BUY', quantity_quote=100)
+                report = json.loads(ws.recv(timeout=5))
+                position = json.loads(ws.recv(timeout=5))
+    finally:
+        exchange.stop()
+
+    assert order.success
+    assert report['e'] == 'executionReport' and report['X'] == 'FILLED'
+    assert position['e'] == 'outboundAccountPosition'
+    assert exchange.balances['USDT'] < 1000.0
+    assert exchange.balances['BTC'] > 0
+
+
+def test_book_ticker_stream():
+    """Atualizações do processo de preços chegam pelo stream de bookTicker"""
+    exchange = FakeExchange(size='small').start()
+    try:
+        with connect(f"{exchange.stream_url}/ws/btcusdt@bookTicker") as ws:
+            # Garante que a assinatura foi registrada antes de publicar
+            while not exchange.subscribers:
+                time.sleep(0.01)
+            exchange.step_prices()
+            update = json.loads(ws.recv(timeout=5))
+    finally:
+        exchange.stop()
+
+    assert update['s'] == 'BTCUSDT'
+    assert float(update['b']) < float(update['a'])
+
+
+def test_weight_limit():
+    """Excesso de peso de REST retorna 429 com o peso usado no header"""
+    exchange = FakeExchange(size='small', weight_limit=30).start()
+    try:
+        with fake_env(exchange):
+            # Governador próprio: o 429 não deve bloquear os outros testes
+            client = create_client(rate_governor=RateLimitGovernor())   # ping: peso 1
+            client.get_exchange_info()        # peso 20
+            used = client.response.headers['X-MBX-USED-WEIGHT-1M']
+            try:
+                client.get_exchange_info()    # estoura o limite
+                raised = False
+            except BinanceAPIException as e:
+                raised = e.status_code == 429
+    finally:
+        exchange.stop()
+
+    assert used == '21'
+    assert raised
+
+
+if __name__ == "__main__":
+    test_market_data_against_fake_exchange()
+    test_orders_and_user_data_stream()
+    test_book_ticker_stream()
+    test_weight_limit()
+    print("✅ TESTES DA EXCHANGE FALSA PASSARAM!")
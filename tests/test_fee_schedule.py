@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Teste da tabela de taxas por par (não precisa da Binance)
+"""
+
+import contextlib
+import io
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Adiciona o diretório src ao path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir / 'src'))
+
+from arbitrage_analyzer import ArbitrageAnalyzer
+from binance_client import create_client
+from fake_exchange import FakeExchange
+from fee_schedule import FeeSchedule
+from market_data import MarketData
+from rate_limiter import RateLimitGovernor
+from synthetic_market import SyntheticClient, generate_market
+from test_fake_exchange import fake_env
+
+
+class FeeClient:
+    """Cliente mínimo que só responde get_trade_fee"""
+
+    def __init__(self, fees):
+        self.fees = fees
+        self.calls = 0
+
+    def get_trade_fee(self):
+        self.calls += 1
+        return [
+            {'symbol': s, 'makerCommission': str(f / 100), 'takerCommission': str(f / 100)}
+            for s, f in self.fees.items()
+        ]
+
+
+def test_cache_and_refresh():
+    """Taxas buscadas uma vez, reaproveitadas do cache e renovadas ao expirar"""
+    client = FeeClient({'BTCUSDT': 0.0, 'ETHBTC': 0.075})
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = Path(tmp) / 'trade_fees.json'
+
+        schedule = FeeSchedule(client, default_percent=0.1, cache_path=cache)
+        assert schedule.load() == 2
+        assert client.calls == 1
+        assert json.loads(cache.read_text())['fees']['ETHBTC'] == [0.075, 0.075]
+
+        cached = FeeSchedule(client, default_percent=0.1, cache_path=cache)
+        cached.load()
+        assert client.calls == 1
+        assert cached.taker_percent('ETHBTC') == 0.075
+
+        cached.fetched_at = time.time() - 2 * cached.refresh_interval
+        assert cached.maybe_refresh()
+        assert client.calls == 2
+
+
+def test_fees_and_discount():
+    """Taxa por par, padrão para os desconhecidos e desconto de BNB"""
+    schedule = FeeSchedule(FeeClient({'BTCUSDT': 0.0, 'ETHBTC': 0.1}), default_percent=0.2,
+                           cache_path=None, pay_with_bnb=True)
+    schedule.load()
+
+    assert schedule.multiplier('BTCUSDT') == 1.0
+    assert abs(schedule.taker_percent('ETHBTC') - 0.075) < 1e-12
+    assert abs(schedule.taker_percent('XYZUSDT') - 0.15) < 1e-12
+
+    # Falha na exchange mantém o que já havia
+    schedule.client = None
+    assert not schedule.refresh()
+    assert schedule.multiplier('BTCUSDT') == 1.0
+
+
+def test_zero_fee_pairs_in_analyzer():
+    """Pares com taxa zero aumentam o lucro e o pré-filtro acompanha"""
+    symbols, prices = generate_market(n_assets=30, n_symbols=100, noise=0.005, seed=6)
+    market = MarketData(client=SyntheticClient(symbols, prices))
+    zero_fee = {s['symbol']: 0.0 for s in symbols if s['quoteAsset'] == 'USDT'}
+
+    flat = ArbitrageAnalyzer('USDT', 0.1, market=market)
+    schedule = FeeSchedule(FeeClient(zero_fee), default_percent=0.1, cache_path=None)
+    schedule.load()
+    per_symbol = ArbitrageAnalyzer('USDT', 0.1, market=market, fee_schedule=schedule)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        flat_opps = flat.find_profitable_opportunities(min_amount=100, min_profit=0)
+        opps = per_symbol.find_profitable_opportunities(min_amount=100, min_profit=0)
+        everything = per_symbol.find_profitable_opportunities(min_amount=100, min_profit=-1000)
+
+    # Duas pernas em USDT sem taxa: sobra mais dinheiro em todo triângulo
+    assert len(opps) > len(flat_opps)
+    assert [o.triangle.pairs for o in opps] == [o.triangle.pairs for o in everything if o.profit > 0]
+
+    # Varredura paralela usa as mesmas taxas por par
+    parallel = ArbitrageAnalyzer('USDT', 0.1, market=market, fee_schedule=schedule, scan_workers=2)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            parallel_opps = parallel.find_profitable_opportunities(min_amount=100, min_profit=0)
+    finally:
+        parallel.close()
+    assert [o.triangle.pairs for o in parallel_opps] == [o.triangle.pairs for o in opps]
+
+
+def test_fake_exchange_trade_fee():
+    """get_trade_fee da exchange falsa devolve taxas por par"""
+    exchange = FakeExchange(size='small', symbol_fees={'BTCUSDT': 0.0}).start()
+    try:
+        with fake_env(exchange):
+            client = create_client(rate_governor=RateLimitGovernor())
+            schedule = FeeSchedule(client, default_percent=0.5, cache_path=None)
+            count = schedule.load()
+    finally:
+        exchange.stop()
+
+    assert count == len(exchange.symbols)
+    assert schedule.taker_percent('BTCUSDT') == 0.0
+    assert abs(schedule.taker_percent('ETHUSDT') - 0.1) < 1e-12
+
+
+if __name__ == "__main__":
+    test_cache_and_refresh()
+    test_fees_and_discount()
+    test_zero_fee_pairs_in_analyzer()
+    test_fake_exchange_trade_fee()
+    print("✅ TESTES DA TABELA DE TAXAS PASSARAM!")
@@ -38,8 +38,8 @@ def test_full_cycle():
     best = opportunities[0]
     
     print(f"\n✅ Melhor oportunidade encontrada:")
-    print(f"   Caminho: {' → '.join(best['triangle']['path'])}")
-    print(f"   Lucro esperado: ${best['profit']:.4f} ({best['profit_percent']:.4f}%)")
+    print(f"   Caminho: {best.triangle.route}")
+    print(f"   Lucro esperado: ${best.profit:.4f} ({best.profit_percent:.4f}%)")
     
     # 2. Executa em modo simulação
     print(f"\n🔄 Etapa 2: Executando em modo simulação...")
@@ -50,18 +50,18 @@ def test_full_cycle():
     # 3. Verifica resultado
     print(f"\n📈 Etapa 3: Verificando resultado...")
     
-    if result['success']:
+    if result.success:
         print(f"✅ Execução simulada concluída com sucesso!")
         print(f"\n   Resumo:")
-        print(f"   - Investido: ${result['initial_amount']:.2f}")
-        print(f"   - Retorno: ${result['final_amount']:.2f}")
-        print(f"   - Lucro: ${result['profit']:.4f} ({result['profit_percent']:.4f}%)")
-        print(f"   - Ordens executadas: {len(result['orders'])}")
+        print(f"   - Investido: ${result.initial_amount:.2f}")
+        print(f"   - Retorno: ${result.final_amount:.2f}")
+        print(f"   - Lucro: ${result.profit:.4f} ({result.profit_percent:.4f}%)")
+        print(f"   - Ordens executadas: {len(result.orders)}")
         
         return True
     else:
         print(f"❌ Execução falhou:")
-        for error in result['errors']:
+        for error in result.errors:
             print(f"   - {error}")
         return False
 
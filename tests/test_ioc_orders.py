@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Teste do modo de execução LIMIT IOC com preço máximo por perna (não precisa da Binance)
+"""
+
+import contextlib
+import io
+import sys
+from pathlib import Path
+
+# Adiciona o diretório src ao path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir / 'src'))
+
+from fake_exchange import FakeExchange
+from models import Opportunity, Triangle
+from order_executor import OrderExecutor
+from test_fake_exchange import fake_env
+import metrics
+
+PATH = ('USDT', 'ETH', 'BTC', 'USDT')
+PAIRS = ('ETHUSDT', 'ETHBTC', 'BTCUSDT')
+
+
+def opportunity(exchange, shift=0.0):
+    """Oportunidade com os preços do livro atual (shift desloca todos em %)"""
+    factor = 1 + shift / 100
+    prices = (
+        exchange.book('ETHUSDT')[1] * factor,
+        exchange.book('ETHBTC')[0] * factor,
+        exchange.book('BTCUSDT')[0] * factor
+    )
+    return Opportunity(
+        triangle=Triangle(path=PATH, pairs=PAIRS),
+        initial=100, final=101, profit=1.0, profit_percent=1.0, total_fees=0.3, prices=prices
+    )
+
+
+def run(exchange, opportunity, **options):
+    with fake_env(exchange):
+        executor = OrderExecutor(simulation_mode=False, log_file=Path('/tmp/fake_trades.log'),
+                                 order_type='ioc', **options)
+        with contextlib.redirect_stdout(io.StringIO()):
+            return executor.execute_arbitrage(opportunity, amount=100)
+
+
+def test_fills_within_tolerance():
+    """Livro igual ao avaliado: as três pernas saem como LIMIT IOC"""
+    exchange = FakeExchange(size='small', balances={'USDT': 1000.0}).start()
+    try:
+        result = run(exchange, opportunity(exchange))
+    finally:
+        exchange.stop()
+
+    assert result.success
+    assert [o['type'] for o in exchange.orders] == ['LIMIT'] * 3
+    assert all(o['timeInForce'] == 'IOC' and o['status'] == 'FILLED' for o in exchange.orders)
+    assert not result.unwinds
+
+
+def test_price_moved_on_first_leg():
+    """Preço avaliado abaixo do ask: a primeira perna expira sem gastar nada"""
+    exchange = FakeExchange(size='small', balances={'USDT': 1000.0}).start()
+    no_fills = metrics.IOC_NO_FILLS.value
+    try:
+        result = run(exchange, opportunity(exchange, shift=-1.0), limit_tolerance_percent=0.1)
+    finally:
+        exchange.stop()
+
+    assert not result.success
+    assert len(exchange.orders) == 1 and exchange.orders[0]['status'] == 'EXPIRED'
+    assert 'Sem execução dentro do limite' in result.errors[0]
+    assert metrics.IOC_NO_FILLS.value == no_fills + 1
+    assert exchange.balances['USDT'] == 1000.0
+    assert not result.unwinds
+
+
+def test_partial_fill_feeds_next_leg():
+    """Preenchimento parcial: a próxima perna usa só o executado e a sobra é desfeita"""
+    exchange = FakeExchange(size='small', balances={'USDT': 1000.0}, liquidity={'ETHBTC': 200}).start()
+    try:
+        result = run(exchange, opportunity(exchange))
+    finally:
+        exchange.stop()
+
+    leg2, leg3 = result.orders[1], result.orders[2]
+    assert result.success
+    assert leg2.status == 'EXPIRED' and leg2.leftover > 0
+    sent = float(exchange.orders[2]['origQty'])
+    assert 0.999 * leg2.quantity_received <= sent <= leg2.quantity_received
+    assert len(result.unwinds) == 1 and result.unwinds[0].asset == 'ETH'
+    assert exchange.balances.get('ETH', 0.0) < 1e-3
+
+
+def test_price_format_and_caps():
+    """Limite no tick do par, arredondado para o lado conservador"""
+    executor = OrderExecutor(simulation_mode=True, client=object(), order_type='ioc', limit_tolerance_percent=1.0)
+    executor.symbol_info_cache['XYZUSDT'] = {
+        'filters': [{'filterType': 'PRICE_FILTER', 'tickSize': '0.01000000'}]
+    }
+    assert executor.format_price('XYZUSDT', 10.057, 'BUY') == 10.05
+    assert executor.format_price('XYZUSDT', 10.051, 'SELL') == 10.06
+    assert executor.format_price('XYZUSDT', 10.05, 'SELL') == 10.05
+
+    caps = executor.price_caps(Opportunity(
+        triangle=Triangle(path=PATH, pairs=PAIRS),
+        initial=100, final=101, profit=1.0, profit_percent=1.0, total_fees=0.3, prices=(100.0, 2.0, 50.0)
+    ))
+    assert caps == (101.0, 1.98, 49.5)
+
+    # Preços do livro no last look têm prioridade sobre os da varredura
+    caps = executor.price_caps(Opportunity(
+        triangle=Triangle(path=PATH, pairs=PAIRS),
+        initial=100, final=101, profit=1.0, profit_percent=1.0, total_fees=0.3, prices=(100.0, 2.0, 50.0),
+        book_prices=(200.0, 4.0, 100.0)
+    ))
+    assert caps == (202.0, 3.96, 99.0)
+
+    executor.order_type = 'market'
+    assert executor.price_caps(Opportunity(
+        triangle=Triangle(path=PATH, pairs=PAIRS),
+        initial=100, final=101, profit=1.0, profit_percent=1.0, total_fees=0.3, prices=(100.0, 2.0, 50.0)
+    )) == (None, None, None)
+
+    try:
+        OrderExecutor(simulation_mode=True, client=object(), order_type='gtc')
+        assert False, "tipo de ordem inválido aceito"
+    except ValueError:
+        pass
+
+
+if __name__ == "__main__":
+    test_fills_within_tolerance()
+    test_price_moved_on_first_leg()
+    test_partial_fill_feeds_next_leg()
+    test_price_format_and_caps()
+    print("✅ TESTES DE ORDENS IOC PASSARAM!")
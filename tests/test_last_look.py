@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Teste da reavaliação do triângulo no livro atual antes da execução (não precisa da Binance)
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# Adiciona o diretório src ao path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir / 'src'))
+
+from cooldown import OpportunityCooldown
+from execution_scheduler import ExecutionScheduler
+from last_look import LastLook
+from latency import tracker
+from models import Opportunity, OrderResult, Triangle
+from price_store import PriceStore
+from shared_prices import SharedPriceTable
+import metrics
+
+SYMBOLS = [
+    {'symbol': 'BTCUSDT', 'base': 'BTC', 'quote': 'USDT'},
+    {'symbol': 'ETHBTC', 'base': 'ETH', 'quote': 'BTC'},
+    {'symbol': 'ETHUSDT', 'base': 'ETH', 'quote': 'USDT'}
+]
+
+# Pernas como no analisador: compra na primeira, vende nas outras duas
+PAIRS = ('BTCUSDT', 'ETHBTC', 'ETHUSDT')
+
+
+def opportunity():
+    return Opportunity(
+        triangle=Triangle(path=('USDT', 'BTC', 'ETH', 'USDT'), pairs=PAIRS),
+        initial=100, final=101, profit=1.0, profit_percent=1.0, total_fees=0.3, prices=(100.0, 2.0, 51.0)
+    )
+
+
+def books(edge_percent):
+    """Livro em que o triângulo rende edge_percent antes das taxas"""
+    return {
+        'BTCUSDT': {'bid': 99.9, 'ask': 100.0},
+        'ETHBTC': {'bid': 2.0, 'ask': 2.01},
+        'ETHUSDT': {'bid': 50.0 * (1 + edge_percent / 100), 'ask': 51.0}
+    }
+
+
+class RecordingExecutor:
+    def __init__(self):
+        self.executed = []
+
+    def execute_arbitrage(self, opportunity, amount):
+        self.executed.append(opportunity)
+        return OrderResult(mode='SIMULAÇÃO', path=opportunity.triangle.path, pairs=PAIRS,
+                           initial_amount=amount, success=True)
+
+
+def test_rescore_from_price_store():
+    """Lucro no livro atual: compra no ask, vendas no bid, com taxas"""
+    store = PriceStore()
+    store.update_books(books(1.0))
+    look = LastLook(store, fee_percent=0.1, min_profit_percent=0.5)
+
+    candidate = opportunity()
+    approved, profit_percent, reason = look.check(candidate)
+    assert approved and reason is None
+    assert abs(profit_percent - (1.01 * 0.999 ** 3 - 1) * 100) < 1e-9
+    assert candidate.book_prices == (100.0, 2.0, 50.5)
+    assert candidate.prices == (100.0, 2.0, 51.0)
+
+    # Borda sumiu: recusa e conta na métrica
+    store.update_books(books(0.2))
+    rejects = metrics.LAST_LOOK_REJECTS.value
+    approved, profit_percent, reason = look.check(opportunity())
+    assert not approved and profit_percent < 0.5
+    assert 'Lucro caiu' in reason
+    assert metrics.LAST_LOOK_REJECTS.value == rejects + 1
+
+
+def test_missing_and_old_books():
+    """Sem livro ou com livro mais velho que max_age não executa"""
+    assert LastLook(PriceStore()).check(opportunity())[2] == "Livro indisponível"
+
+    store = PriceStore()
+    store.update_books(books(1.0), timestamp=time.time() - 10)
+    approved, _, reason = LastLook(store, max_age=2).check(opportunity())
+    assert not approved and reason.startswith('Livro com')
+
+
+def test_shared_table_and_scheduler():
+    """Leitura de três pares da tabela compartilhada; recusa não chega ao executor"""
+    table = SharedPriceTable.create(SYMBOLS)
+    try:
+        table.write(books=books(1.0))
+        assert set(table.read_books(PAIRS)) == set(PAIRS)
+        assert table.read_books(['XYZUSDT']) == {}
+
+        executor = RecordingExecutor()
+        scheduler = ExecutionScheduler(executor, last_look=LastLook(table, min_profit_percent=0.5))
+        results, rejected = scheduler.run([opportunity()], 100)
+        assert len(results) == 1 and rejected == []
+
+        # Recusa volta para quem chamou, com o motivo
+        table.write(books=books(0.0))
+        results, rejected = scheduler.run([opportunity()], 100)
+        assert results == []
+        assert [(o.triangle.pairs, bool(reason)) for o, reason in rejected] == [(PAIRS, True)]
+        assert len(executor.executed) == 1
+        assert scheduler.reserved == 0.0
+    finally:
+        table.close()
+
+    # Medido no tracker: três leituras e contas, bem abaixo de 1 ms
+    stats = tracker.stages['last_look.check']
+    assert stats.count >= 2 and stats.total_ns / stats.count < 1_000_000
+
+
+def test_cooldown_after_last_look():
+    """Aprovação no livro não muda a assinatura: a mesma varredura fica em cooldown"""
+    store = PriceStore()
+    store.update_books(books(1.0))
+    cooldown = OpportunityCooldown(cooldown_seconds=30)
+    scheduler = ExecutionScheduler(RecordingExecutor(), last_look=LastLook(store, min_profit_percent=0.5))
+
+    for _ in range(3):
+        selected = scheduler.select(cooldown.filter([opportunity()]), 100)
+        results, rejected = scheduler.run(selected, 100)
+        sent = {tuple(result.pairs) for result in results}
+        for best in selected:
+            if best.triangle.pairs in sent:
+                cooldown.record_attempt(best)
+
+    assert len(scheduler.executor.executed) == 1
+    assert scheduler.executor.executed[0].book_prices == (100.0, 2.0, 50.5)
+
+
+if __name__ == "__main__":
+    test_rescore_from_price_store()
+    test_missing_and_old_books()
+    test_shared_table_and_scheduler()
+    test_cooldown_after_last_look()
+    print("✅ TESTES DO LAST LOOK PASSARAM!")
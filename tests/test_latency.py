@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Teste da instrumentação de latência (não precisa da Binance)
+"""
+
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+# Adiciona o diretório src ao path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir / 'src'))
+
+from latency import LatencyTracker
+
+
+def test_percentiles():
+    """Percentis e máximo calculados sobre as amostras"""
+    tracker = LatencyTracker()
+
+    for ms in range(1, 101):
+        tracker.record('etapa', ms * 1_000_000)
+
+    summary = tracker.summary()['etapa']
+    assert summary['count'] == 100
+    assert summary['p50_ms'] == 50
+    assert summary['p99_ms'] == 99
+    assert summary['max_ms'] == 100
+
+
+def test_span_and_timed():
+    """Span e decorator registram uma medição por uso"""
+    tracker = LatencyTracker()
+
+    with tracker.span('bloco'):
+        sum(range(1000))
+
+    @tracker.timed('funcao')
+    def funcao():
+        return 42
+
+    assert funcao() == 42
+    summary = tracker.summary()
+    assert summary['bloco']['count'] == 1
+    assert summary['funcao']['count'] == 1
+    assert len(tracker.report_lines()) == 3
+
+
+def test_export_json():
+    """Exportação gera JSON com as etapas"""
+    tracker = LatencyTracker()
+    tracker.record('etapa', 1_500_000)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'latency.json'
+        tracker.export_json(path)
+        data = json.loads(path.read_text())
+
+    assert data['stages']['etapa']['max_ms'] == 1.5
+
+
+if __name__ == "__main__":
+    test_percentiles()
+    test_span_and_timed()
+    test_export_json()
+    print("✅ TESTES DE LATÊNCIA PASSARAM!")
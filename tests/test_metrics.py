@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Teste do endpoint de métricas (não precisa da Binance)
+"""
+
+import sys
+import urllib.request
+from pathlib import Path
+
+# Adiciona o diretório src ao path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir / 'src'))
+
+from latency import LatencyTracker
+from metrics import MetricsRegistry, MetricsServer
+
+
+def test_render_prometheus_text():
+    """Contadores, gauges e histogramas no formato texto"""
+    latency = LatencyTracker()
+    latency.record('market.get_all_tickers', 2_000_000)
+
+    registry = MetricsRegistry(latency_tracker=latency)
+    cycles = registry.counter('arb_cycles_total', 'Ciclos')
+    depth = registry.gauge('arb_db_queue_depth', 'Fila')
+    fill = registry.histogram('arb_fill_latency_seconds', 'Latência', buckets=(0.1, 1.0))
+
+    cycles.inc()
+    cycles.inc(2)
+    depth.set(4)
+    fill.observe(0.05)
+    fill.observe(0.5)
+
+    text = registry.render()
+    assert '# TYPE arb_cycles_total counter' in text
+    assert 'arb_cycles_total 3' in text
+    assert 'arb_db_queue_depth 4' in text
+    assert 'arb_fill_latency_seconds_bucket{le="0.1"} 1' in text
+    assert 'arb_fill_latency_seconds_bucket{le="1.0"} 2' in text
+    assert 'arb_fill_latency_seconds_bucket{le="+Inf"} 2' in text
+    assert 'arb_fill_latency_seconds_count 2' in text
+    assert 'arb_stage_latency_seconds_count{stage="market.get_all_tickers"} 1' in text
+
+
+def test_http_endpoint():
+    """Servidor em thread de fundo responde em /metrics"""
+    registry = MetricsRegistry()
+    registry.counter('arb_orders_sent_total', 'Ordens').inc(7)
+
+    server = MetricsServer(registry, port=0)
+    port = server.start()
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=5) as response:
+            body = response.read().decode('utf-8')
+    finally:
+        server.stop()
+
+    assert 'arb_orders_sent_total 7' in body
+
+
+if __name__ == "__main__":
+    test_render_prometheus_text()
+    test_http_endpoint()
+    print("✅ TESTES DE MÉTRICAS PASSARAM!")
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Teste dos tipos de dados do bot (não precisa da Binance)
+"""
+
+import contextlib
+import io
+import sys
+from pathlib import Path
+
+# Adiciona o diretório src ao path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir / 'src'))
+
+from arbitrage_analyzer import ArbitrageAnalyzer
+from market_data import MarketData
+from models import Leg, Opportunity, OrderResult, Triangle
+from synthetic_market import SyntheticClient, generate_market
+
+
+def test_slots():
+    """Instâncias não têm __dict__ (memória fixa por objeto)"""
+    triangle = Triangle(path=('USDT', 'BTC', 'ETH', 'USDT'), pairs=('BTCUSDT', 'ETHBTC', 'ETHUSDT'))
+    opportunity = Opportunity(triangle, 100, 101, 1, 1, 0.3, (50000.0, 0.06, 3000.0))
+    result = OrderResult(mode='SIMULAÇÃO', path=triangle.path, pairs=triangle.pairs, initial_amount=100)
+
+    for obj in (triangle, opportunity, Leg('BTCUSDT', 'BUY'), result):
+        assert not hasattr(obj, '__dict__')
+
+    assert triangle.route == 'USDT → BTC → ETH → USDT'
+    assert triangle.operations[1] == 'Trocar BTC por ETH'
+    assert result.simulation_mode and result.orders == [] and result.errors == []
+    assert hash(triangle) == hash(Triangle(triangle.path, triangle.pairs))
+
+
+def test_analyzer_returns_models():
+    """Analisador devolve Opportunity com Triangle de ponta a ponta"""
+    symbols, prices = generate_market(n_assets=20, n_symbols=60, noise=0.01, seed=4)
+    analyzer = ArbitrageAnalyzer('USDT', 0.1, market=MarketData(client=SyntheticClient(symbols, prices)))
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        opportunities = analyzer.find_profitable_opportunities(min_amount=100, min_profit=-1000)
+
+    assert opportunities
+    assert all(isinstance(o, Opportunity) and isinstance(o.triangle, Triangle) for o in opportunities)
+    assert all(o.triangle.path[0] == 'USDT' and len(o.prices) == 3 for o in opportunities)
+
+
+if __name__ == "__main__":
+    test_slots()
+    test_analyzer_returns_models()
+    print("✅ TESTES DOS TIPOS DE DADOS PASSARAM!")
@@ -33,7 +33,7 @@ def test_single_scan():
     min_profit_percent = 0.5
     filtered = [
         opp for opp in opportunities 
-        if opp['profit_percent'] >= min_profit_percent
+        if opp.profit_percent >= min_profit_percent
     ]
     
     print(f"\n📊 RESULTADOS:")
@@ -43,15 +43,15 @@ def test_single_scan():
     if filtered:
         print(f"\n🎯 TOP 5 OPORTUNIDADES:")
         for i, opp in enumerate(filtered[:5]):
-            triangle = opp['triangle']
-            print(f"\n   #{i+1} - {' → '.join(triangle['path'])}")
-            print(f"        Pares: {', '.join(triangle['pairs'])}")
-            print(f"        💰 Lucro: ${opp['profit']:.4f} ({opp['profit_percent']:.4f}%)")
+            triangle = opp.triangle
+            print(f"\n   #{i+1} - {triangle.route}")
+            print(f"        Pares: {', '.join(triangle.pairs)}")
+            print(f"        💰 Lucro: ${opp.profit:.4f} ({opp.profit_percent:.4f}%)")
     else:
         print(f"\n⚠️  Nenhuma oportunidade acima de {min_profit_percent}%")
         if opportunities:
             best = opportunities[0]
-            print(f"   Melhor disponível: {best['profit_percent']:.4f}%")
+            print(f"   Melhor disponível: {best.profit_percent:.4f}%")
     
     print("\n" + "="*70)
     print("✅ TESTE CONCLUÍDO!")
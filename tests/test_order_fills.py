@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Teste da leitura de respostas FULL: fills, comissões e quantidades líquidas (não precisa da Binance)
+"""
+
+import contextlib
+import io
+import sys
+from pathlib import Path
+
+# Adiciona o diretório src ao path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir / 'src'))
+
+from balance_cache import BalanceCache
+from fake_exchange import FakeExchange
+from models import Opportunity, Triangle
+from order_executor import OrderExecutor, fill_summary
+from test_fake_exchange import fake_env
+
+
+class RecordingTransport:
+    """Transporte que guarda os parâmetros e repassa a ordem ao REST"""
+
+    def __init__(self, client):
+        self.client = client
+        self.sent = []
+
+    def create_order(self, **params):
+        self.sent.append(params)
+        return self.client.create_order(**params)
+
+
+def test_fill_summary():
+    """Vários fills: preço médio ponderado e comissões somadas por ativo"""
+    order = {
+        'executedQty': '3.00000000',
+        'cummulativeQuoteQty': '31.00000000',
+        'fills': [
+            {'price': '10.00000000', 'qty': '1.00000000', 'commission': '0.00100000', 'commissionAsset': 'ETH'},
+            {'price': '10.50000000', 'qty': '2.00000000', 'commission': '0.00200000', 'commissionAsset': 'ETH'},
+            {'price': '10.50000000', 'qty': '0.00000000', 'commission': '0.00005000', 'commissionAsset': 'BNB'}
+        ]
+    }
+    executed, quote, price, commissions = fill_summary(order)
+    assert (executed, quote) == (3.0, 31.0)
+    assert abs(price - 31.0 / 3) < 1e-12
+    assert abs(commissions['ETH'] - 0.003) < 1e-12
+    assert commissions['BNB'] == 0.00005
+
+    # Resposta sem fills (ACK/RESULT): só os totais, sem comissão
+    assert fill_summary({'executedQty': '2', 'cummulativeQuoteQty': '20'}) == (2.0, 20.0, 10.0, {})
+
+
+def test_net_quantities_across_legs():
+    """Com taxa no ativo recebido nenhuma perna é rejeitada e nada fica preso"""
+    exchange = FakeExchange(size='small', balances={'USDT': 1000.0}, fee_percent=0.1).start()
+    try:
+        with fake_env(exchange):
+            executor = OrderExecutor(simulation_mode=False, log_file=Path('/tmp/fake_trades.log'))
+            executor.order_transport = RecordingTransport(executor.client)
+            sent = executor.order_transport.sent
+            opportunity = Opportunity(
+                triangle=Triangle(path=('USDT', 'ETH', 'BTC', 'USDT'), pairs=('ETHUSDT', 'ETHBTC', 'BTCUSDT')),
+                initial=100, final=101, profit=1.0, profit_percent=1.0, total_fees=0.3, prices=()
+            )
+            with contextlib.redirect_stdout(io.StringIO()):
+                result = executor.execute_arbitrage(opportunity, amount=100)
+    finally:
+        exchange.stop()
+
+    assert result.success and not result.unwinds
+    assert [p['newOrderRespType'] for p in sent] == ['FULL'] * 3
+
+    # Cada perna recebeu o bruto menos a comissão cobrada no ativo recebido
+    for leg, order in zip(result.orders, exchange.orders):
+        fill = order['fills'][0]
+        gross = float(order['executedQty']) if leg.side == 'BUY' else float(order['cummulativeQuoteQty'])
+        assert abs(leg.quantity_received - (gross - float(fill['commission']))) < 1e-8
+        assert leg.fees == {fill['commissionAsset']: float(fill['commission'])}
+
+    # Investido = debitado na perna 1; lucro realizado = variação real do saldo em USDT
+    assert result.initial_amount == float(exchange.orders[0]['cummulativeQuoteQty'])
+    assert abs(result.profit - (exchange.balances['USDT'] - 1000.0)) < 1e-6
+    assert set(result.fees) == {'ETH', 'BTC', 'USDT'}
+    assert exchange.balances.get('ETH', 0.0) < 1e-4
+
+
+def test_bnb_commission_in_cache():
+    """Comissão em BNB não reduz a próxima perna, mas sai do saldo em cache"""
+    cache = BalanceCache(client=None)
+    cache.apply_event({'e': 'outboundAccountPosition', 'u': 1, 'B': [
+        {'a': 'USDT', 'f': '100', 'l': '0'}, {'a': 'BNB', 'f': '1', 'l': '0'}
+    ]})
+    assert cache.apply_fill('USDT', 50, 'ETH', 0.02, transact_time=2, fees={'BNB': 0.01})
+    assert cache.free('ETH') == 0.02
+    assert cache.free('BNB') == 0.99
+
+
+if __name__ == "__main__":
+    test_fill_summary()
+    test_net_quantities_across_legs()
+    test_bnb_commission_in_cache()
+    print("✅ TESTES DE FILLS E COMISSÕES PASSARAM!")
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Teste do pré-filtro de lucro por soma de logs (não precisa da Binance)
+"""
+
+import contextlib
+import io
+import sys
+from pathlib import Path
+
+# Adiciona o diretório src ao path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir / 'src'))
+
+from arbitrage_analyzer import ArbitrageAnalyzer
+from market_data import MarketData
+from models import Triangle
+from synthetic_market import SyntheticClient, generate_market
+
+
+def _analyzer():
+    symbols, prices = generate_market(n_assets=40, n_symbols=150, noise=0.01, seed=5)
+    analyzer = ArbitrageAnalyzer('USDT', 0.1, market=MarketData(client=SyntheticClient(symbols, prices)))
+    with contextlib.redirect_stdout(io.StringIO()):
+        analyzer.finder.load_market_data()
+        triangles = analyzer.finder.find_triangles()
+    return analyzer, triangles
+
+
+def test_prefilter_keeps_exactly_the_profitable():
+    """Sobreviventes do pré-filtro são os que passam no cálculo completo"""
+    analyzer, triangles = _analyzer()
+
+    for percent in (-1.0, 0.0, 0.3, 1.0):
+        min_profit = percent  # em $ sobre 100
+        expected = [
+            t.pairs for t in triangles
+            if (r := analyzer.calculate_with_fees(t, 100)) and r.profit > min_profit
+        ]
+        survivors = analyzer._prefilter(triangles, percent)
+        passed = [
+            t.pairs for t in survivors
+            if analyzer.calculate_with_fees(t, 100).profit > min_profit
+        ]
+
+        assert passed == expected
+        # O pré-filtro não deixa passar quase nada além do que o cálculo completo aceita
+        assert len(survivors) - len(expected) <= 1
+
+
+def test_prefilter_rejects_missing_and_zero_prices():
+    """Pares sem preço ou com preço zero nunca passam"""
+    analyzer, triangles = _analyzer()
+    pair = triangles[0].pairs[1]
+
+    analyzer.finder.prices.update({pair: 0.0})
+    survivors = analyzer._prefilter(triangles, -50)
+
+    assert survivors
+    assert all(pair not in t.pairs for t in survivors)
+    unknown = Triangle(path=('USDT', 'AAA', 'BBB', 'USDT'), pairs=('AAAUSDT', 'AAABBB', 'BBBUSDT'))
+    assert analyzer._prefilter([unknown], -50) == []
+
+
+def test_scan_results_unchanged():
+    """Varredura com pré-filtro devolve as mesmas oportunidades do cálculo completo"""
+    analyzer, triangles = _analyzer()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        opportunities = analyzer.find_profitable_opportunities(min_amount=100, min_profit=0)
+
+    expected = sorted(
+        (r for r in (analyzer.calculate_with_fees(t, 100) for t in triangles) if r and r.profit > 0),
+        key=lambda r: r.profit, reverse=True
+    )
+    assert opportunities
+    assert [o.triangle.pairs for o in opportunities] == [r.triangle.pairs for r in expected]
+    assert analyzer.prefilter_survivors < len(triangles)
+
+
+if __name__ == "__main__":
+    test_prefilter_keeps_exactly_the_profitable()
+    test_prefilter_rejects_missing_and_zero_prices()
+    test_scan_results_unchanged()
+    print("✅ TESTES DO PRÉ-FILTRO PASSARAM!")
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Teste do armazém de preços com idade por par (não precisa da Binance)
+"""
+
+import contextlib
+import io
+import sys
+import time
+from pathlib import Path
+
+# Adiciona o diretório src ao path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir / 'src'))
+
+from arbitrage_analyzer import ArbitrageAnalyzer
+from market_data import MarketData
+from price_store import PriceStore
+from synthetic_market import SyntheticClient, generate_market
+
+
+def test_mapping_interface():
+    """Armazém se comporta como o dicionário de preços"""
+    store = PriceStore({'BTCUSDT': 50000.0, 'ETHUSDT': 3000.0}, timestamp=100.0)
+
+    assert store['BTCUSDT'] == 50000.0
+    assert 'ETHUSDT' in store and 'ETHBTC' not in store
+    assert len(store) == 2
+    assert dict(store) == {'BTCUSDT': 50000.0, 'ETHUSDT': 3000.0}
+
+
+def test_staleness():
+    """Pares ausentes de uma rodada mantêm preço e envelhecem"""
+    store = PriceStore()
+    store.update({'BTCUSDT': 50000.0, 'ETHUSDT': 3000.0, 'ETHBTC': 0.06}, timestamp=100.0)
+    seq = store.update({'BTCUSDT': 50100.0, 'ETHUSDT': 3010.0}, timestamps={'ETHUSDT': 108.0}, timestamp=110.0)
+
+    assert store['ETHBTC'] == 0.06
+    assert store.sequence('BTCUSDT') == seq and store.sequence('ETHBTC') == seq - 1
+    assert store.age('ETHBTC', now=112.0) == 12.0
+    assert store.max_age(['BTCUSDT', 'ETHUSDT'], now=112.0) == 4.0
+    assert store.is_stale('ETHBTC', 5, now=112.0)
+    assert store.stale_symbols(5, now=112.0) == ['ETHBTC']
+    assert store.stale_count(3, now=112.0) == 2
+
+
+def _scan(market, **kwargs):
+    analyzer = ArbitrageAnalyzer('USDT', 0.1, market=market, **kwargs)
+    with contextlib.redirect_stdout(io.StringIO()):
+        opportunities = analyzer.find_profitable_opportunities(min_amount=100, min_profit=-1000)
+    return analyzer, {o.triangle.pairs: o for o in opportunities}
+
+
+def test_analyzer_stale_policies():
+    """Triângulos com perna velha são ignorados ou penalizados"""
+    symbols, prices = generate_market(n_assets=20, n_symbols=60, noise=0.01, seed=2)
+    lagging = 'ETHUSDT'
+
+    class LaggingMarket(MarketData):
+        def get_price_timestamps(self):
+            return {lagging: time.time() - 60}
+
+    market = LaggingMarket(client=SyntheticClient(symbols, prices))
+
+    _, fresh = _scan(market, max_price_age=0)
+    skip_analyzer, skipped = _scan(market, max_price_age=5)
+    _, penalized = _scan(market, max_price_age=5, stale_policy='penalize')
+
+    stale = [pairs for pairs in fresh if lagging in pairs]
+    assert stale
+    assert skip_analyzer.stale_symbols == 1
+    assert skip_analyzer.stale_triangles == len(stale)
+    assert set(skipped) == set(fresh) - set(stale)
+
+    for pairs in stale:
+        assert penalized[pairs].stale
+        assert penalized[pairs].profit < fresh[pairs].profit
+
+
+def test_failed_fetch_skips_scan():
+    """Busca de preços sem resposta não reaproveita a rodada anterior"""
+    symbols, prices = generate_market(n_assets=20, n_symbols=60, noise=0.01, seed=2)
+
+    class FlakyMarket(MarketData):
+        failing = False
+
+        def get_prices(self, symbols=None):
+            # MarketData devolve {} em qualquer erro (rede, rate limit)
+            return {} if self.failing else super().get_prices(symbols)
+
+    market = FlakyMarket(client=SyntheticClient(symbols, prices))
+    analyzer = ArbitrageAnalyzer('USDT', 0.1, market=market)
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert analyzer.find_profitable_opportunities(min_amount=100, min_profit=-1000)
+        market.failing = True
+        assert analyzer.find_profitable_opportunities(min_amount=100, min_profit=-1000) == []
+    assert analyzer.last_scan['triangles'] == 0 and analyzer.last_scan['best'] is None
+
+
+def test_default_max_age_skips_old_prices():
+    """Idade máxima padrão: preço parado há um minuto não vira oportunidade"""
+    symbols, prices = generate_market(n_assets=20, n_symbols=60, noise=0.01, seed=2)
+
+    class FrozenMarket(MarketData):
+        def get_price_timestamps(self):
+            return {s: time.time() - 60 for s in prices}
+
+    _, opportunities = _scan(FrozenMarket(client=SyntheticClient(symbols, prices)))
+    assert opportunities == {}
+
+
+if __name__ == "__main__":
+    test_mapping_interface()
+    test_staleness()
+    test_analyzer_stale_policies()
+    test_failed_fetch_skips_scan()
+    test_default_max_age_skips_old_prices()
+    print("✅ TESTES DO ARMAZÉM DE PREÇOS PASSARAM!")
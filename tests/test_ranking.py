@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Teste do ranking top-K de oportunidades (não precisa da Binance)
+"""
+
+import contextlib
+import io
+import random
+import sys
+from pathlib import Path
+
+# Adiciona o diretório src ao path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir / 'src'))
+
+from arbitrage_analyzer import ArbitrageAnalyzer
+from market_data import MarketData
+from models import Opportunity, Triangle
+from ranking import StreamingTopK, TopK, size_adjusted_profit, top_k
+from synthetic_market import SyntheticClient, generate_market
+
+
+TRIANGLE = Triangle(path=('USDT', 'BTC', 'ETH', 'USDT'), pairs=('BTCUSDT', 'ETHBTC', 'ETHUSDT'))
+
+
+def _opportunity(profit, initial=100, capacity=None):
+    return Opportunity(
+        triangle=TRIANGLE, initial=initial, final=initial + profit, profit=profit,
+        profit_percent=profit / initial * 100, total_fees=0.0, prices=(), capacity=capacity
+    )
+
+
+def test_top_k_keys():
+    """Heap limitado devolve o mesmo que a ordenação completa"""
+    rng = random.Random(1)
+    opportunities = [_opportunity(rng.uniform(-1, 1), initial=rng.choice([50, 100, 200])) for _ in range(500)]
+
+    for key in ('profit', 'profit_percent'):
+        expected = sorted(opportunities, key=lambda o: getattr(o, key), reverse=True)[:7]
+        assert top_k(opportunities, 7, key) == expected
+
+        ranking = TopK(7, key)
+        for opp in opportunities:
+            ranking.push(opp)
+        assert ranking.items() == expected
+
+    small = _opportunity(1.0, capacity=10)
+    large = _opportunity(0.5, capacity=1000)
+    assert top_k([small, large], 1, 'size_adjusted') == [large]
+
+
+def _analyzer():
+    symbols, prices = generate_market(n_assets=40, n_symbols=150, noise=0.01, seed=7)
+    return ArbitrageAnalyzer('USDT', 0.1, market=MarketData(client=SyntheticClient(symbols, prices)))
+
+
+def test_analyzer_top():
+    """top=N devolve o início da lista completa e conta todas as lucrativas"""
+    analyzer = _analyzer()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        everything = analyzer.find_profitable_opportunities(min_amount=100, min_profit=0)
+        best_three = analyzer.find_profitable_opportunities(min_amount=100, min_profit=0, top=3)
+        by_percent = analyzer.find_profitable_opportunities(min_amount=100, min_profit=0, top=3, rank_by='profit_percent')
+
+    assert len(everything) > 3
+    def pairs(opportunities):
+        return [o.triangle.pairs for o in opportunities]
+
+    assert pairs(best_three) == pairs(everything[:3])
+    assert pairs(by_percent) == pairs(everything[:3])
+    assert analyzer.last_scan['profitable'] == len(everything)
+    assert analyzer.last_scan['best'].profit == everything[0].profit
+
+    # Sem nenhuma acima do mínimo, a melhor disponível continua informada
+    with contextlib.redirect_stdout(io.StringIO()):
+        none = analyzer.find_profitable_opportunities(min_amount=100, min_profit=1000, top=3)
+    assert none == []
+    assert analyzer.last_scan['best'].profit == everything[0].profit
+
+
+def test_size_adjusted_uses_book_capacity():
+    """Ranking por tamanho usa as quantidades do topo do livro; sem elas, o valor simulado"""
+    analyzer = _analyzer()
+    with contextlib.redirect_stdout(io.StringIO()):
+        ranked = analyzer.find_profitable_opportunities(min_amount=100, min_profit=0, rank_by='size_adjusted')
+
+    assert ranked and all(o.capacity is not None for o in ranked)
+    scores = [o.profit_percent / 100 * o.capacity for o in ranked]
+    assert scores == sorted(scores, reverse=True)
+
+    # Capacidade é a perna mais rasa, em moeda base
+    best = ranked[0]
+    pair1, pair2, pair3 = best.triangle.pairs
+    price1, _, price3 = best.prices
+    analyzer.finder.prices.update_books({
+        pair1: {'bid': price1, 'ask': price1, 'bid_qty': 1.0, 'ask_qty': 5.0},
+        pair2: {'bid': 1.0, 'ask': 1.0, 'bid_qty': 2.0, 'ask_qty': 1.0},
+        pair3: {'bid': price3, 'ask': price3, 'bid_qty': 1.0, 'ask_qty': 1.0}
+    })
+    assert analyzer.calculate_with_fees(best.triangle, 100).capacity == min(5.0 * price1, 2.0 * price1, price3)
+
+    # Livro sem quantidades (ex: tabela compartilhada): volta ao valor simulado
+    analyzer.finder.prices.update_books({pair2: {'bid': 1.0, 'ask': 1.0, 'bid_qty': 0.0, 'ask_qty': 0.0}})
+    fallback = analyzer.calculate_with_fees(best.triangle, 100)
+    assert fallback.capacity is None
+    assert size_adjusted_profit(fallback) == fallback.profit_percent / 100 * 100
+
+
+def test_streaming_top_k():
+    """Ranking incremental acompanha a varredura completa após cada preço"""
+    analyzer = _analyzer()
+    with contextlib.redirect_stdout(io.StringIO()):
+        analyzer.finder.load_market_data()
+        triangles = analyzer.finder.find_triangles()
+
+    stream = StreamingTopK(analyzer, triangles, k=5)
+    rng = random.Random(3)
+    symbols = sorted({s for t in triangles for s in t.pairs})
+
+    for _ in range(50):
+        symbol = rng.choice(symbols)
+        ranked = stream.on_prices({symbol: analyzer.finder.prices[symbol] * rng.uniform(0.995, 1.005)})
+
+        full = [r for r in (analyzer.calculate_with_fees(t, 100) for t in triangles) if r and r.profit > 0]
+        best = sorted(full, key=lambda r: r.profit, reverse=True)[:5]
+        assert [r.profit for r in ranked] == [r.profit for r in best]
+        assert all(r.profit > 0 for r in ranked)
+
+
+def test_streaming_member_drops():
+    """Membro que some do ranking abre vaga para o melhor candidato de fora"""
+    analyzer = _analyzer()
+    with contextlib.redirect_stdout(io.StringIO()):
+        analyzer.finder.load_market_data()
+        triangles = analyzer.finder.find_triangles()
+
+    stream = StreamingTopK(analyzer, triangles, k=3)
+    assert len(stream.candidates) > 3
+
+    # Encarece a compra do líder: ele sai do ranking
+    leader = stream.items()[0]
+    symbol = leader.triangle.pairs[0]
+    ranked = stream.on_prices({symbol: analyzer.finder.prices[symbol] * 2})
+
+    full = [r for r in (analyzer.calculate_with_fees(t, 100) for t in triangles) if r and r.profit > 0]
+    best = sorted(full, key=lambda r: r.profit, reverse=True)[:3]
+    assert leader.triangle.pairs not in stream.members
+    assert len(ranked) == 3
+    assert [r.profit for r in ranked] == [r.profit for r in best]
+
+
+if __name__ == "__main__":
+    test_top_k_keys()
+    test_analyzer_top()
+    test_size_adjusted_uses_book_capacity()
+    test_streaming_top_k()
+    test_streaming_member_drops()
+    print("✅ TESTES DO RANKING PASSARAM!")
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Teste do governador de peso de REST (não precisa da Binance)
+"""
+
+import sys
+from pathlib import Path
+
+# Adiciona o diretório src ao path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir / 'src'))
+
+from rate_limiter import (PRIORITY_DATA, PRIORITY_ORDER, GovernedClient,
+                          RateLimitDeferred, RateLimitGovernor)
+
+
+class FakeResponse:
+    def __init__(self, used):
+        self.headers = {'x-mbx-used-weight-1m': str(used)}
+
+
+class FakeClient:
+    """Cliente que informa o peso usado como a Binance"""
+
+    def __init__(self):
+        self.used = 0
+        self.response = None
+        self.calls = []
+
+    def _call(self, name, weight):
+        self.used += weight
+        self.response = FakeResponse(self.used)
+        self.calls.append(name)
+        return name
+
+    def get_exchange_info(self):
+        return self._call('get_exchange_info', 20)
+
+    def create_order(self, **params):
+        return self._call('create_order', 1)
+
+
+def test_data_calls_keep_order_reserve():
+    """Dados são adiados ao atingir a reserva; ordens continuam passando"""
+    governor = RateLimitGovernor(weight_limit=100, reserve_percent=50, max_wait=0)
+
+    governor.acquire(40, PRIORITY_DATA)
+    try:
+        governor.acquire(20, PRIORITY_DATA)
+        deferred = False
+    except RateLimitDeferred:
+        deferred = True
+
+    assert deferred
+    governor.acquire(50, PRIORITY_ORDER)
+    assert governor.status()['deferred'] == 1
+
+
+def test_server_reported_usage():
+    """O uso informado pelo servidor corrige a estimativa local"""
+    governor = RateLimitGovernor(weight_limit=100, reserve_percent=0, max_wait=0)
+    client = GovernedClient(FakeClient(), governor)
+    client._client.used = 90      # outro processo já usou quase todo o limite
+
+    client.get_exchange_info()
+    assert governor.status()['server_used'] == 110
+
+    try:
+        client.get_exchange_info()
+        deferred = False
+    except RateLimitDeferred:
+        deferred = True
+
+    assert deferred
+    assert client.calls == ['get_exchange_info']
+
+
+def test_penalize_blocks_calls():
+    """Após um 429 nenhuma chamada sai até o Retry-After"""
+    governor = RateLimitGovernor(weight_limit=100, max_wait=0)
+    governor.penalize(30)
+
+    try:
+        governor.acquire(1, PRIORITY_ORDER)
+        blocked = False
+    except RateLimitDeferred:
+        blocked = True
+
+    assert blocked
+    assert governor.status()['blocked_for'] > 29
+
+
+if __name__ == "__main__":
+    test_data_calls_keep_order_reserve()
+    test_server_reported_usage()
+    test_penalize_blocks_calls()
+    print("✅ TESTES DO GOVERNADOR DE PESO PASSARAM!")
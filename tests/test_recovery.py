@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Teste do desfazimento de triângulos incompletos (não precisa da Binance)
+"""
+
+import contextlib
+import io
+import sys
+from pathlib import Path
+
+# Adiciona o diretório src ao path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir / 'src'))
+
+from fake_exchange import FakeExchange
+from models import Opportunity, Triangle
+from order_executor import OrderExecutor
+from recovery import RecoveryEngine
+from test_fake_exchange import fake_env
+
+SYMBOLS = [
+    {'symbol': 'BTCUSDT', 'base': 'BTC', 'quote': 'USDT'},
+    {'symbol': 'ETHUSDT', 'base': 'ETH', 'quote': 'USDT'},
+    {'symbol': 'ETHBTC', 'base': 'ETH', 'quote': 'BTC'},
+    {'symbol': 'BNBETH', 'base': 'BNB', 'quote': 'ETH'}
+]
+
+
+def opportunity(path, pairs):
+    return Opportunity(
+        triangle=Triangle(path=path, pairs=pairs),
+        initial=100, final=101, profit=1.0, profit_percent=1.0, total_fees=0.3, prices=()
+    )
+
+
+def test_cheapest_route():
+    """A rota escolhida é a que recupera mais após as taxas"""
+    engine = RecoveryEngine(executor=None, fee_percent=0.1)
+    engine.load_symbols(SYMBOLS)
+
+    books = {
+        'BTCUSDT': (33000.0, 33001.0),
+        'ETHUSDT': (1900.0, 1901.0),
+        'ETHBTC': (0.06, 0.0601),
+        'BNBETH': (0.15, 0.1501)
+    }
+
+    routes = engine.routes('ETH', 1.0, 'USDT', books)
+    value, steps = routes[0]
+    assert [s[0] for s in steps] == ['ETHBTC', 'BTCUSDT']
+    assert abs(value - 0.06 * 33000 * 0.999 ** 2) < 1e-9
+    assert [s[0] for s in routes[1][1]] == ['ETHUSDT']
+
+    # Par que falhou fica de fora; com max_hops=1 só vale a rota direta
+    assert [s[0] for s in engine.routes('ETH', 1.0, 'USDT', books, exclude={'ETHBTC'})[0][1]] == ['ETHUSDT']
+    engine.max_hops = 1
+    assert len(engine.routes('ETH', 1.0, 'USDT', books)) == 1
+    assert engine.routes('BNB', 1.0, 'USDT', books) == []
+
+
+def test_failed_leg_is_unwound():
+    """Perna 3 rejeitada: a moeda presa volta para USDT por outra rota"""
+    exchange = FakeExchange(size='small', balances={'USDT': 1000.0}, halted={'BTCUSDT'}).start()
+    try:
+        with fake_env(exchange):
+            executor = OrderExecutor(simulation_mode=False, log_file=Path('/tmp/fake_trades.log'))
+            with contextlib.redirect_stdout(io.StringIO()):
+                result = executor.execute_arbitrage(
+                    opportunity(('USDT', 'ETH', 'BTC', 'USDT'), ('ETHUSDT', 'ETHBTC', 'BTCUSDT')),
+                    amount=100
+                )
+    finally:
+        exchange.stop()
+
+    assert not result.success
+    assert 'Operação 3 falhou' in result.errors[0]
+    assert len(result.unwinds) == 1
+
+    unwind = result.unwinds[0]
+    assert unwind.success and unwind.asset == 'BTC'
+    assert 'BTCUSDT' not in [leg.symbol for leg in unwind.orders if leg.success]
+
+    # Resultado realizado = o que voltou para USDT (preços sintéticos: pode ser +/-)
+    assert result.final_amount == unwind.recovered
+    assert 90 < result.final_amount < 110
+    assert abs(result.profit - (result.final_amount - result.initial_amount)) < 1e-9
+    assert exchange.balances.get('BTC', 0.0) < 1e-4
+
+
+def test_partial_fill_leftover_is_unwound():
+    """Perna 2 expira em parte: a sobra é convertida e somada ao retorno"""
+    exchange = FakeExchange(size='small', balances={'USDT': 1000.0}, liquidity={'ETHBTC': 200}).start()
+    try:
+        with fake_env(exchange):
+            executor = OrderExecutor(simulation_mode=False, log_file=Path('/tmp/fake_trades.log'))
+            with contextlib.redirect_stdout(io.StringIO()):
+                result = executor.execute_arbitrage(
+                    opportunity(('USDT', 'ETH', 'BTC', 'USDT'), ('ETHUSDT', 'ETHBTC', 'BTCUSDT')),
+                    amount=100
+                )
+    finally:
+        exchange.stop()
+
+    assert result.success
+    assert result.orders[1].status == 'EXPIRED'
+    assert result.orders[1].leftover > 0
+    assert len(result.unwinds) == 1 and result.unwinds[0].asset == 'ETH'
+    assert abs(result.final_amount - result.orders[2].quantity_received - result.unwinds[0].recovered) < 1e-9
+    assert 90 < result.final_amount < 110
+    assert exchange.balances.get('ETH', 0.0) < 1e-3
+
+
+def test_partial_fill_without_unwind():
+    """Com auto_unwind=False a sobra parcial fica na conta e o trade conclui"""
+    exchange = FakeExchange(size='small', balances={'USDT': 1000.0}, liquidity={'ETHBTC': 200}).start()
+    try:
+        with fake_env(exchange):
+            executor = OrderExecutor(simulation_mode=False, log_file=Path('/tmp/fake_trades.log'),
+                                     auto_unwind=False)
+            with contextlib.redirect_stdout(io.StringIO()):
+                result = executor.execute_arbitrage(
+                    opportunity(('USDT', 'ETH', 'BTC', 'USDT'), ('ETHUSDT', 'ETHBTC', 'BTCUSDT')),
+                    amount=100
+                )
+    finally:
+        exchange.stop()
+
+    assert result.success, result.errors
+    assert result.orders[1].leftover > 0
+    assert not result.unwinds
+    assert result.final_amount == result.orders[2].quantity_received
+    assert abs(result.profit - (result.final_amount - result.initial_amount)) < 1e-9
+    assert exchange.balances['ETH'] > 0
+
+
+def test_no_unwind_when_disabled():
+    """Com auto_unwind=False o comportamento antigo é mantido"""
+    exchange = FakeExchange(size='small', balances={'USDT': 1000.0}, halted={'BTCUSDT'}).start()
+    try:
+        with fake_env(exchange):
+            executor = OrderExecutor(simulation_mode=False, log_file=Path('/tmp/fake_trades.log'),
+                                     auto_unwind=False)
+            with contextlib.redirect_stdout(io.StringIO()):
+                result = executor.execute_arbitrage(
+                    opportunity(('USDT', 'ETH', 'BTC', 'USDT'), ('ETHUSDT', 'ETHBTC', 'BTCUSDT')),
+                    amount=100
+                )
+    finally:
+        exchange.stop()
+
+    assert not result.success
+    assert not result.unwinds
+    assert exchange.balances['BTC'] > 0
+
+
+if __name__ == "__main__":
+    test_cheapest_route()
+    test_failed_leg_is_unwound()
+    test_partial_fill_leftover_is_unwound()
+    test_partial_fill_without_unwind()
+    test_no_unwind_when_disabled()
+    print("✅ TESTES DE RECUPERAÇÃO PASSARAM!")
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Teste da tabela de preços em memória compartilhada (não precisa da Binance)
+"""
+
+import sys
+from pathlib import Path
+
+# Adiciona o diretório src ao path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir / 'src'))
+
+from market_data import MarketData
+from shared_prices import FeedHandler, SharedMemoryMarketData, SharedPriceTable
+from synthetic_market import SyntheticClient, generate_market
+
+SYMBOLS = [
+    {'symbol': 'BTCUSDT', 'base': 'BTC', 'quote': 'USDT'},
+    {'symbol': 'ETHUSDT', 'base': 'ETH', 'quote': 'USDT'},
+    {'symbol': 'ETHBTC', 'base': 'ETH', 'quote': 'BTC'}
+]
+
+
+def test_write_and_attach():
+    """Leitor anexado vê o que o escritor publicou; seq avança de 2 em 2"""
+    table = SharedPriceTable.create(SYMBOLS)
+    try:
+        table.write({'BTCUSDT': 50000.0, 'ETHUSDT': 3000.0}, timestamp=10.0)
+        table.write(books={'ETHBTC': {'bid': 0.059, 'ask': 0.061}}, timestamp=11.0)
+
+        reader = SharedPriceTable.attach(table.name)
+        try:
+            seq, prices, bids, asks, updated_at = reader.snapshot()
+            assert reader.symbols == SYMBOLS
+        finally:
+            reader.close()
+    finally:
+        table.close()
+
+    assert seq == 4
+    assert prices == [50000.0, 3000.0, 0.0]
+    assert bids[2] == 0.059 and asks[2] == 0.061
+    assert updated_at == [10.0, 10.0, 11.0]
+
+
+def test_market_data_reader():
+    """SharedMemoryMarketData responde como o MarketData"""
+    table = SharedPriceTable.create(SYMBOLS)
+    try:
+        table.write(
+            {'BTCUSDT': 50000.0, 'ETHUSDT': 3000.0, 'ETHBTC': 0.06},
+            {'BTCUSDT': {'bid': 49999.0, 'ask': 50001.0}}
+        )
+
+        market = SharedMemoryMarketData(table.name)
+        try:
+            assert [s['symbol'] for s in market.get_spot_symbols()] == ['BTCUSDT', 'ETHUSDT', 'ETHBTC']
+            assert market.get_prices()['ETHBTC'] == 0.06
+            assert market.get_prices(['BTCUSDT']) == {'BTCUSDT': 50000.0}
+            assert market.get_book_tickers() == {
+                'BTCUSDT': {'bid': 49999.0, 'bid_qty': 0.0, 'ask': 50001.0, 'ask_qty': 0.0}
+            }
+        finally:
+            market.close()
+    finally:
+        table.close()
+
+
+def test_feed_handler():
+    """Feed handler publica o mercado inteiro para os leitores"""
+    symbols, prices = generate_market(n_assets=20, n_symbols=60, seed=1)
+    source = MarketData(client=SyntheticClient(symbols, prices))
+    feed = FeedHandler(source, name=None)
+
+    table = feed.start()
+    try:
+        feed.run(cycles=1)
+
+        market = SharedMemoryMarketData(table.name)
+        try:
+            published = market.get_prices()
+        finally:
+            market.close()
+    finally:
+        feed.stop()
+
+    assert published == source.get_prices()
+
+
+if __name__ == "__main__":
+    test_write_and_attach()
+    test_market_data_reader()
+    test_feed_handler()
+    print("✅ TESTES DA TABELA DE PREÇOS COMPARTILHADA PASSARAM!")
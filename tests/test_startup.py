@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Teste do orçamento de partida: imports leves e clientes criados no primeiro uso
+"""
+
+import contextlib
+import io
+import sys
+from pathlib import Path
+
+# Adiciona os diretórios src e benchmarks ao path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir / 'src'))
+sys.path.insert(0, str(root_dir / 'benchmarks'))
+
+from bench_startup import BUDGETS_MS, ENTRY_POINTS, check_budgets, run_benchmarks
+from binance_client import LazyClient
+from fake_exchange import FakeExchange
+from market_data import MarketData
+from rate_limiter import RateLimitGovernor
+from test_fake_exchange import fake_env
+
+
+def test_entry_points_within_budget():
+    """Varredura, monitor, replay e bot importam sem dependências pesadas, dentro do orçamento"""
+    report = run_benchmarks(repeat=1)
+
+    assert set(report['benchmarks']) == set(ENTRY_POINTS) == set(BUDGETS_MS)
+    assert check_budgets(report) == []
+
+    slow = {'benchmarks': {'bot': {'median_ms': BUDGETS_MS['bot'] * 2, 'heavy_modules': ['binance']}}}
+    assert len(check_budgets(slow)) == 2
+
+
+def test_lazy_client():
+    """Cliente só é construído (e só pinga) na primeira chamada"""
+    exchange = FakeExchange(size='small').start()
+    try:
+        with fake_env(exchange):
+            governor = RateLimitGovernor()
+            client = LazyClient(rate_governor=governor)
+            market = MarketData(client=client)
+            assert not client.created
+            assert governor.server_used == 0
+
+            with contextlib.redirect_stdout(io.StringIO()):
+                assert market.get_spot_symbols()
+            assert client.created
+            assert governor.server_used > 0
+    finally:
+        exchange.stop()
+
+
+if __name__ == "__main__":
+    test_entry_points_within_budget()
+    test_lazy_client()
+    print("✅ TESTES DE PARTIDA PASSARAM!")
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Teste do snapshot de topologia para partida rápida (não precisa da Binance)
+"""
+
+import contextlib
+import io
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Adiciona o diretório src ao path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir / 'src'))
+
+from cycle_graph import ConversionGraph
+from market_data import MarketData
+from synthetic_market import SIZES, SyntheticClient, generate_market
+from topology_cache import HEADER, TopologyCache
+from triangle_finder import TriangleFinder
+
+
+class BlockingClient(SyntheticClient):
+    """Exchange info só responde depois de liberado (validação presa em segundo plano)"""
+
+    def __init__(self, symbols, prices):
+        super().__init__(symbols, prices)
+        self.release = threading.Event()
+        self.release.set()
+        self.exchange_info_calls = 0
+
+    def get_exchange_info(self):
+        self.exchange_info_calls += 1
+        self.release.wait(5)
+        return super().get_exchange_info()
+
+
+class PairsOnlyMarket:
+    """Fonte só com pares, sem exchange info (como a memória compartilhada)"""
+
+    def __init__(self, symbols):
+        self.symbols = symbols
+        self.symbol_infos = {}
+
+    def get_spot_symbols(self):
+        return [dict(s) for s in self.symbols]
+
+
+class DropUniverse:
+    """Filtro de liquidez que remove pares fixos (nova lista a cada chamada)"""
+
+    enabled = True
+
+    def __init__(self, drop):
+        self.drop = set(drop)
+        self.pruned = 0
+
+    def prune(self, symbols):
+        kept = [s for s in symbols if s['symbol'] not in self.drop]
+        self.pruned = len(symbols) - len(kept)
+        return kept
+
+
+def scan(finder):
+    with contextlib.redirect_stdout(io.StringIO()):
+        finder.load_market_data()
+        return finder.find_triangles()
+
+
+def test_snapshot_round_trip():
+    """Pares, filtros e triângulos voltam iguais do arquivo; outra versão é ignorada"""
+    symbols, prices = generate_market(seed=1, **SIZES['small'])
+    market = MarketData(client=SyntheticClient(symbols, prices))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'topology.bin'
+        cold = TriangleFinder('USDT', market=market, topology=TopologyCache('USDT', cache_path=path))
+        expected = scan(cold)
+        assert expected and path.exists()
+
+        warm = TopologyCache('USDT', cache_path=path)
+        assert not warm.symbols
+        assert warm.load()
+        assert warm.symbols == cold.topology.symbols
+        assert warm.filters == market.symbol_infos
+        assert warm.triangles == expected
+        assert warm.digest == cold.topology.digest
+
+        # Snapshot de outra moeda base não serve
+        assert not TopologyCache('BTC', cache_path=path).load()
+
+        # Cabeçalho de outra versão do formato
+        data = bytearray(path.read_bytes())
+        data[8] = 99
+        path.write_bytes(bytes(data))
+        with contextlib.redirect_stdout(io.StringIO()):
+            assert not TopologyCache('USDT', cache_path=path).load()
+
+        path.write_bytes(b'lixo')
+        with contextlib.redirect_stdout(io.StringIO()):
+            assert not TopologyCache('USDT', cache_path=path).load()
+        assert len(b'lixo') < HEADER.size
+
+
+def test_warm_start_validates_in_background():
+    """Partida com snapshot não espera o exchange info; mudança na exchange recompila"""
+    symbols, prices = generate_market(seed=2, **SIZES['realistic'])
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'topology.bin'
+        cold = TriangleFinder('USDT', market=MarketData(client=SyntheticClient(symbols, prices)),
+                              topology=TopologyCache('USDT', cache_path=path))
+        expected = scan(cold)
+
+        # Exchange info "lento": a validação fica presa até liberar
+        client = BlockingClient(symbols, prices)
+        client.release.clear()
+        changes = []
+        topology = TopologyCache('USDT', cache_path=path, on_change=changes.append)
+        finder = TriangleFinder('USDT', market=MarketData(client=client), topology=topology)
+
+        start = time.perf_counter()
+        triangles = scan(finder)
+        elapsed = time.perf_counter() - start
+
+        assert set(triangles) == set(expected)
+        assert elapsed < 0.5, f"{elapsed:.3f}s"
+        assert topology.validator.is_alive()
+
+        # Mesma topologia: nada muda
+        client.release.set()
+        topology.wait(5)
+        assert client.exchange_info_calls == 1
+        assert changes == []
+
+        # Par removido da exchange: recompila, regrava e avisa
+        removed = expected[0].pairs[0]
+        client.symbols = [s for s in symbols if s['symbol'] != removed]
+        topology.validated_at = 0
+        with contextlib.redirect_stdout(io.StringIO()):
+            assert topology.maybe_validate(finder.market)
+            topology.wait(5)
+        assert changes == [topology]
+
+        after = scan(finder)
+        assert not any(removed in t.pairs for t in after)
+        reloaded = TopologyCache('USDT', cache_path=path)
+        assert reloaded.load() and len(reloaded.triangles) == len(after)
+
+
+def test_source_without_exchange_info_keeps_filters():
+    """Validação contra fonte sem exchange info não apaga os filtros do snapshot"""
+    symbols, prices = generate_market(seed=3, **SIZES['small'])
+    market = MarketData(client=SyntheticClient(symbols, prices))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'topology.bin'
+        cold = TriangleFinder('USDT', market=market, topology=TopologyCache('USDT', cache_path=path))
+        scan(cold)
+        saved = path.read_bytes()
+
+        topology = TopologyCache('USDT', cache_path=path)
+        assert topology.load()
+        pairs_only = PairsOnlyMarket(topology.symbols)
+        assert topology.validate(pairs_only) is False
+        assert topology.filters == market.symbol_infos
+        assert path.read_bytes() == saved
+
+        # Par removido: recompila sem ele, mantendo os filtros dos demais
+        removed = topology.symbols[0]['symbol']
+        pairs_only.symbols = topology.symbols[1:]
+        with contextlib.redirect_stdout(io.StringIO()):
+            assert topology.validate(pairs_only)
+        assert removed not in topology.filters
+        assert len(topology.filters) == len(market.symbol_infos) - 1
+
+        reloaded = TopologyCache('USDT', cache_path=path)
+        assert reloaded.load() and reloaded.filters == topology.filters
+
+
+def test_liquidity_filter_reuses_index():
+    """Com filtro de liquidez, o índice do snapshot é restrito aos pares que ficam e reaproveitado"""
+    symbols, prices = generate_market(seed=4, **SIZES['small'])
+    market = MarketData(client=SyntheticClient(symbols, prices))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'topology.bin'
+        full = scan(TriangleFinder('USDT', market=market, topology=TopologyCache('USDT', cache_path=path)))
+        dropped = full[0].pairs[1]
+
+        finder = TriangleFinder('USDT', market=market, universe=DropUniverse([dropped]),
+                                topology=TopologyCache('USDT', cache_path=path))
+        first = scan(finder)
+        pruned = finder.symbols
+        assert set(first) == set(ConversionGraph(pruned).triangles('USDT'))
+        assert not any(dropped in t.pairs for t in first)
+
+        # Próximo ciclo: mesma lista e mesmo índice, sem remontar o grafo
+        def rebuild():
+            raise AssertionError("grafo remontado")
+        finder.graph = rebuild
+        assert scan(finder) == first
+        assert finder.symbols is pruned
+
+
+if __name__ == "__main__":
+    test_snapshot_round_trip()
+    test_warm_start_validates_in_background()
+    test_source_without_exchange_info_keeps_filters()
+    test_liquidity_filter_reuses_index()
+    print("✅ TESTES DO SNAPSHOT DE TOPOLOGIA PASSARAM!")
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Teste do filtro de pares por liquidez de 24h (não precisa da Binance)
+"""
+
+import contextlib
+import io
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Adiciona o diretório src ao path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir / 'src'))
+
+from binance_client import create_client
+from fake_exchange import FakeExchange
+from market_data import MarketData
+from rate_limiter import RateLimitGovernor
+from test_fake_exchange import fake_env
+from triangle_finder import TriangleFinder
+from universe import SymbolUniverse
+
+SYMBOLS = [
+    {'symbol': 'BTCUSDT', 'base': 'BTC', 'quote': 'USDT'},
+    {'symbol': 'ETHBTC', 'base': 'ETH', 'quote': 'BTC'},
+    {'symbol': 'DOGEBTC', 'base': 'DOGE', 'quote': 'BTC'},
+    {'symbol': 'XYZUSDT', 'base': 'XYZ', 'quote': 'USDT'},
+    {'symbol': 'NEWUSDT', 'base': 'NEW', 'quote': 'USDT'}
+]
+
+
+class TickerClient:
+    """Cliente mínimo que só responde get_ticker (24h)"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def get_ticker(self):
+        self.calls += 1
+        return [
+            {'symbol': 'BTCUSDT', 'lastPrice': '30000', 'bidPrice': '29999', 'askPrice': '30001',
+             'quoteVolume': '500000000', 'count': 900000},
+            # 100 BTC = 3.000.000 USDT
+            {'symbol': 'ETHBTC', 'lastPrice': '0.06', 'bidPrice': '0.05999', 'askPrice': '0.06001',
+             'quoteVolume': '100', 'count': 50000},
+            # 1 BTC = 30.000 USDT
+            {'symbol': 'DOGEBTC', 'lastPrice': '0.000002', 'bidPrice': '0.0000019', 'askPrice': '0.0000021',
+             'quoteVolume': '1', 'count': 300},
+            # Par parado: nenhum negócio em 24h
+            {'symbol': 'XYZUSDT', 'lastPrice': '1.5', 'bidPrice': '1.4', 'askPrice': '1.6',
+             'quoteVolume': '0', 'count': 0}
+        ]
+
+
+def test_thresholds():
+    """Volume convertido para a moeda base, negócios e spread"""
+    universe = SymbolUniverse(TickerClient(), cache_path=None, min_quote_volume=100000)
+    universe.load()
+    assert universe.base_volume('ETHBTC', 'BTC') == 100 * 30000
+    assert [s['symbol'] for s in universe.prune(SYMBOLS)] == ['BTCUSDT', 'ETHBTC', 'NEWUSDT']
+    assert universe.pruned == 2
+
+    # Spread de DOGEBTC é 10%
+    universe.min_quote_volume = 0
+    universe.max_spread_percent = 1.0
+    assert [s['symbol'] for s in universe.prune(SYMBOLS)] == ['BTCUSDT', 'ETHBTC', 'NEWUSDT']
+
+    universe.max_spread_percent = 0
+    universe.min_trades = 1000
+    assert 'DOGEBTC' not in [s['symbol'] for s in universe.prune(SYMBOLS)]
+
+    # Sem limites configurados nada é removido (e nada é buscado)
+    assert SymbolUniverse(None, cache_path=None).prune(SYMBOLS) == SYMBOLS
+
+
+def test_daily_cache():
+    """Estatísticas buscadas uma vez por dia e reaproveitadas do arquivo"""
+    client = TickerClient()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = Path(tmp) / 'ticker_24h.json'
+
+        assert SymbolUniverse(client, cache_path=cache, min_trades=1).load() == 4
+        assert client.calls == 1
+        assert json.loads(cache.read_text())['stats']['XYZUSDT'][2] == 0
+
+        cached = SymbolUniverse(client, cache_path=cache, min_trades=1)
+        cached.load()
+        assert client.calls == 1
+        assert not cached.allows(SYMBOLS[3])
+
+        cached.fetched_at = time.time() - 2 * cached.refresh_interval
+        cached.prune(SYMBOLS)
+        assert client.calls == 2
+
+
+def test_triangles_skip_dead_pairs():
+    """Par sem negócios na exchange falsa some dos triângulos"""
+    exchange = FakeExchange(size='small', volumes={'ETHBTC': 0}).start()
+    try:
+        with fake_env(exchange):
+            client = create_client(rate_governor=RateLimitGovernor())
+            market = MarketData(client)
+            with contextlib.redirect_stdout(io.StringIO()):
+                all_triangles = TriangleFinder('USDT', market=market)
+                all_triangles.load_market_data()
+                before = all_triangles.find_triangles()
+
+                universe = SymbolUniverse(client, cache_path=None, min_trades=1)
+                universe.load()
+                pruned = TriangleFinder('USDT', market=market, universe=universe)
+                pruned.load_market_data()
+                after = pruned.find_triangles()
+    finally:
+        exchange.stop()
+
+    assert any('ETHBTC' in t.pairs for t in before)
+    assert not any('ETHBTC' in t.pairs for t in after)
+    assert 0 < len(after) < len(before)
+    assert universe.pruned == 1
+
+
+if __name__ == "__main__":
+    test_thresholds()
+    test_daily_cache()
+    test_triangles_skip_dead_pairs()
+    print("✅ TESTES DO UNIVERSO DE PARES PASSARAM!")
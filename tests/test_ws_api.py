@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Teste do envio de ordens pela WebSocket API (não precisa da Binance)
+"""
+
+import contextlib
+import io
+import socket
+import sys
+from pathlib import Path
+
+# Adiciona o diretório src ao path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir / 'src'))
+
+from fake_exchange import FakeExchange
+from order_executor import OrderExecutor
+from test_fake_exchange import fake_env
+from ws_api import WebSocketAPIClient, WebSocketAPIError, WebSocketAPIUnavailable
+import metrics
+
+
+def closed_port():
+    """Porta local sem ninguém escutando"""
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def test_order_place_over_one_socket():
+    """Várias ordens e pings no mesmo socket, respostas pelo id"""
+    exchange = FakeExchange(size='small', balances={'USDT': 1000.0}).start()
+    try:
+        with fake_env(exchange):
+            client = WebSocketAPIClient().connect()
+            try:
+                assert client.ping() == {}
+                first = client.create_order(symbol='BTCUSDT', side='BUY', type='MARKET', quoteOrderQty=50.0)
+                second = client.create_order(symbol='BTCUSDT', side='BUY', type='MARKET', quoteOrderQty=25.0)
+                ws = client.ws
+            finally:
+                client.close()
+    finally:
+        exchange.stop()
+
+    assert first['status'] == 'FILLED' and second['orderId'] == first['orderId'] + 1
+    assert ws is not None and exchange.ws_api_requests == 3
+    assert client.weight_used is not None
+    assert len(exchange.orders) == 2
+
+
+def test_rejections():
+    """Assinatura inválida e falta de saldo voltam como WebSocketAPIError"""
+    exchange = FakeExchange(size='small', balances={'USDT': 10.0}).start()
+    try:
+        with fake_env(exchange):
+            bad = WebSocketAPIClient(api_secret='wrong-secret')
+            good = WebSocketAPIClient()
+            try:
+                try:
+                    bad.create_order(symbol='BTCUSDT', side='BUY', type='MARKET', quoteOrderQty=5.0)
+                    assert False, "assinatura inválida aceita"
+                except WebSocketAPIError as e:
+                    assert e.code == -1022
+
+                try:
+                    good.create_order(symbol='BTCUSDT', side='BUY', type='MARKET', quoteOrderQty=500.0)
+                    assert False, "ordem sem saldo aceita"
+                except WebSocketAPIError as e:
+                    assert e.code == -2010
+                    assert 'insufficient balance' in str(e)
+            finally:
+                bad.close()
+                good.close()
+    finally:
+        exchange.stop()
+
+    assert not exchange.orders
+
+
+def test_executor_uses_ws_and_falls_back_to_rest():
+    """O executor envia pelo socket e, sem conexão, cai para o REST"""
+    exchange = FakeExchange(size='small', balances={'USDT': 1000.0}).start()
+    try:
+        with fake_env(exchange):
+            executor = OrderExecutor(simulation_mode=False, log_file=Path('/tmp/fake_trades.log'),
+                                     order_transport=WebSocketAPIClient())
+            with contextlib.redirect_stdout(io.StringIO()):
+                via_ws = executor._execute_order('BTCUSDT', 'BUY', quantity_quote=100)
+            ws_requests = exchange.ws_api_requests
+            executor.order_transport.close()
+
+            # Endpoint fora do ar: nada foi enviado, então o REST é seguro
+            executor.order_transport = WebSocketAPIClient(url=f"ws://127.0.0.1:{closed_port()}/ws-api/v3", timeout=1)
+            fallbacks = metrics.ORDER_TRANSPORT_FALLBACKS.value
+            with contextlib.redirect_stdout(io.StringIO()):
+                via_rest = executor._execute_order('BTCUSDT', 'BUY', quantity_quote=100)
+    finally:
+        exchange.stop()
+
+    assert via_ws.success and via_rest.success
+    assert ws_requests == 1
+    assert exchange.ws_api_requests == 1
+    assert metrics.ORDER_TRANSPORT_FALLBACKS.value == fallbacks + 1
+    assert len(exchange.orders) == 2
+
+
+def test_unavailable_without_server():
+    """Falha de conexão é WebSocketAPIUnavailable (ordem não enviada)"""
+    client = WebSocketAPIClient('key', 'secret', url=f"ws://127.0.0.1:{closed_port()}/ws-api/v3", timeout=1)
+    try:
+        client.create_order(symbol='BTCUSDT', side='BUY', type='MARKET', quantity=1.0)
+        assert False, "conexão inexistente aceita"
+    except WebSocketAPIUnavailable:
+        pass
+    assert not client.connected
+
+
+if __name__ == "__main__":
+    test_order_place_over_one_socket()
+    test_rejections()
+    test_executor_uses_ws_and_falls_back_to_rest()
+    test_unavailable_without_server()
+    print("✅ TESTES DA WEBSOCKET API PASSARAM!")